@@ -0,0 +1,91 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Dependency header parsing: whole-file regex versus the header reader.
+
+Run from the repository root:  python -m benchmarks.bench_dependency_parsing
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import time
+from src.utils.widget_index import parse_dependencies
+
+FILE_SIZES_KB = (10, 100, 1000)
+REPEATS = 50
+
+HEADER = '''"""
+Synthetic Widget
+
+Dependencies:
+PyQt5==5.15.6
+requests>=2.26
+pywin32; sys_platform == "win32"
+"""
+'''
+
+FUNCTION_TEMPLATE = '''
+def helper_{number}(values):
+    """Return the total of the values ({number})."""
+    return sum(value * {number} for value in values)
+'''
+
+
+def regex_parse_dependencies(file_path):
+    # De oude implementatie: hele bestand lezen en met een regex doorzoeken
+    with open(file_path, 'r', encoding='utf-8') as file:
+        content = file.read()
+    match = re.search(r'"""[\s\S]*?Dependencies:([\s\S]*?)"""', content)
+    if not match:
+        return []
+    return [dep.strip() for dep in match.group(1).strip().split('\n') if dep.strip()]
+
+
+def create_widget(path, size_kb):
+    chunks = [HEADER]
+    number = 0
+    while sum(len(chunk) for chunk in chunks) < size_kb * 1024:
+        chunks.append(FUNCTION_TEMPLATE.format(number=number))
+        number += 1
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(chunks))
+
+
+def measure(parse, path):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        parse(path)
+    return (time.perf_counter() - start) / REPEATS
+
+
+def main():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        print(f"{'size (KB)':>10} {'regex (ms)':>11} {'header (ms)':>12} {'speedup':>8}")
+        for size_kb in FILE_SIZES_KB:
+            path = os.path.join(temp_dir, f'widget_{size_kb}.py')
+            create_widget(path, size_kb)
+            assert regex_parse_dependencies(path) == parse_dependencies(path)
+            regex = measure(regex_parse_dependencies, path)
+            header = measure(parse_dependencies, path)
+            print(f"{size_kb:>10} {regex * 1000:>11.3f} {header * 1000:>12.3f} {regex / header:>7.1f}x")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    main()
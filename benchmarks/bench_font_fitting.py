@@ -0,0 +1,86 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Resize-driven text scaling: a new QFont per resize versus the font fitter.
+
+Resizes a clock-like widget (one label with a large time) step by step,
+as during an interactive resize, and times each step including the
+label relayout and repaint.
+
+Run from the repository root:  QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_font_fitting
+"""
+
+import time
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget
+from src.utils.font_fitting import FontFitter
+
+STEPS = 400
+TEXT = '23:58:58'
+
+
+class ClockLike(QWidget):
+    fitter = None
+
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.label = QLabel(TEXT)
+        self.label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.label)
+        self.set_font_calls = 0
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.fitter is None:
+            font = QFont('Arial')
+            font.setPixelSize(int(self.height() * 0.7))
+            self.label.setFont(font)
+            self.set_font_calls += 1
+        elif self.fitter.apply(self.label, self.fitter.fit(QFont('Arial'), TEXT, self.width(), self.height(),
+                                                           max_pixel_size=int(self.height() * 0.7))):
+            self.set_font_calls += 1
+
+
+def measure(fitter, app):
+    ClockLike.fitter = fitter
+    widget = ClockLike()
+    widget.resize(250, 100)
+    widget.show()
+    app.processEvents()
+    widget.set_font_calls = 0
+    start = time.perf_counter()
+    for step in range(STEPS):
+        widget.resize(250 + step * 2, 100 + step)
+        widget.repaint()
+    elapsed = (time.perf_counter() - start) * 1000 / STEPS
+    calls = widget.set_font_calls
+    widget.deleteLater()
+    app.processEvents()
+    return elapsed, calls
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    print(f"{'sizing':<12}  {'ms/step':>8}  {'setFont calls':>13}")
+    for name, fitter in (('new QFont', None), ('font fitter', FontFitter())):
+        elapsed, calls = measure(fitter, app)
+        print(f"{name:<12}  {elapsed:>8.3f}  {calls:>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compositing cost of a 4K overlay with three widgets in the full, mask and windows modes.
+
+Per mode it reports the area the compositor has to blend, the time to
+blend that surface onto a 4K desktop image (SourceOver, as a compositor
+does for a translucent window) and the cost of moving one widget a pixel,
+which in the mask mode includes updating the window mask. The offscreen
+platform ignores window masks, so the blended region is taken from
+mask() rather than from what the platform reports.
+
+Run from the repository root:  QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_overlay_compositing
+"""
+
+import time
+from PyQt5.QtCore import Qt, QPoint, QRect, qInstallMessageHandler
+from PyQt5.QtGui import QColor, QImage, QPainter, QRegion
+from PyQt5.QtWidgets import QApplication, QWidget
+from src.core.screen_overlay import ScreenOverlay, OVERLAY_MODES, WINDOWS
+
+SCREEN = QRect(0, 0, 3840, 2160)
+WIDGETS = [(40, 40, 300, 200), (3400, 60, 250, 150), (1800, 1700, 400, 300)]
+FRAMES = 50
+MOVES = 2000
+
+
+class BenchWidget(QWidget):
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(40, 40, 40, 200))
+
+
+def build(mode, app):
+    overlay = ScreenOverlay(QApplication.primaryScreen(), mode)
+    overlay.on_geometry_changed(SCREEN)
+    widgets = []
+    for number, (x, y, width, height) in enumerate(WIDGETS):
+        widget = BenchWidget()
+        overlay.adopt(widget)
+        widget.resize(width, height)
+        overlay.place(widget, QPoint(x, y))
+        overlay.track_widget(f'widget_{number}', widget)
+        widgets.append(widget)
+    overlay.show()
+    app.processEvents()
+    return overlay, widgets
+
+
+def surfaces(overlay, widgets):
+    """(surface image, top-left, region) for every window the compositor blends."""
+    if overlay.mode == WINDOWS:
+        windows = [(widget, QRegion(widget.rect())) for widget in widgets]
+        windows.append((overlay, overlay.mask()))
+    elif overlay.mask().isEmpty():
+        windows = [(overlay, QRegion(overlay.rect()))]
+    else:
+        windows = [(overlay, overlay.mask())]
+    result = []
+    for window, region in windows:
+        image = QImage(window.size(), QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        window.render(image, QPoint(), region)
+        result.append((image, window.mapToGlobal(QPoint()) if window.isWindow() else QPoint(), region))
+    return result
+
+
+def blend_ms(windows):
+    desktop = QImage(SCREEN.size(), QImage.Format_ARGB32_Premultiplied)
+    desktop.fill(QColor(20, 60, 120))
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        painter = QPainter(desktop)
+        for image, origin, region in windows:
+            painter.setClipRegion(region.translated(origin))
+            painter.drawImage(origin, image)
+        painter.end()
+    return (time.perf_counter() - start) * 1000 / FRAMES
+
+
+def move_us(overlay, widget):
+    start = time.perf_counter()
+    for step in range(MOVES):
+        overlay.place(widget, QPoint(40 + step % 200, 40))
+    return (time.perf_counter() - start) * 1e6 / MOVES
+
+
+def main():
+    # Het offscreen-platform kan geen vensters maskeren en meldt dat bij elke setMask()
+    qInstallMessageHandler(lambda mode, context, message: None)
+    app = QApplication.instance() or QApplication([])
+    total = SCREEN.width() * SCREEN.height()
+    print(f"{'mode':<8}  {'blended px':>11}  {'of 4K':>6}  {'blend (ms)':>10}  {'move (us)':>9}")
+    for mode in OVERLAY_MODES:
+        overlay, widgets = build(mode, app)
+        windows = surfaces(overlay, widgets)
+        area = sum(sum(rect.width() * rect.height() for rect in region.rects()) for _, _, region in windows)
+        blend = blend_ms(windows)
+        move = move_us(overlay, widgets[0])
+        print(f"{mode:<8}  {area:>11}  {area / total:>6.1%}  {blend:>10.2f}  {move:>9.1f}")
+        for widget in widgets:
+            widget.close()
+        overlay.close()
+
+
+if __name__ == '__main__':
+    main()
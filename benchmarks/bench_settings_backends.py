@@ -0,0 +1,85 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Settings storage: JSON file versus the SQLite backend.
+
+Write latency is one changed key followed by flush(); load time is
+constructing the store from an existing file/database.
+
+Run from the repository root:  python -m benchmarks.bench_settings_backends
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from src.utils.sqlite_store import SqliteBackend
+from src.utils.widget_config import WidgetConfigStore
+
+KEY_COUNTS = (10, 1000, 100000)
+WRITES = 20
+LOADS = 5
+
+
+def widget_config(number):
+    return {'position': [number, number], 'size': [250, 100], 'color': '#FFFFFF', 'font_size': 12}
+
+
+def open_store(temp_dir, backend_name):
+    path = os.path.join(temp_dir, 'widget_configs.json')
+    backend = SqliteBackend(os.path.join(temp_dir, 'settings.db'), 'widget_configs') if backend_name == 'sqlite' else None
+    return WidgetConfigStore(path, flush_delay=60, backend=backend)
+
+
+def close_store(store):
+    if store.backend is not None:
+        store.backend.close()
+
+
+def measure(backend_name, key_count):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        store = open_store(temp_dir, backend_name)
+        with store.batch():
+            for number in range(key_count):
+                store.save_widget_config(f'widget_{number}', widget_config(number))
+        store.flush()
+
+        start = time.perf_counter()
+        for number in range(WRITES):
+            store.save_widget_config('widget_0', widget_config(number + 1))
+            store.flush()
+        write_ms = (time.perf_counter() - start) * 1000 / WRITES
+        close_store(store)
+
+        start = time.perf_counter()
+        for _ in range(LOADS):
+            close_store(open_store(temp_dir, backend_name))
+        load_ms = (time.perf_counter() - start) * 1000 / LOADS
+        return write_ms, load_ms
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def main():
+    print(f"{'keys':>8}  {'backend':<7}  {'write (ms)':>10}  {'load (ms)':>10}")
+    for key_count in KEY_COUNTS:
+        for backend_name in ('json', 'sqlite'):
+            write_ms, load_ms = measure(backend_name, key_count)
+            print(f"{key_count:>8}  {backend_name:<7}  {write_ms:>10.2f}  {load_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Spatial index queries on a 4K overlay with hundreds of widgets.
+
+Times one drag frame (snap with alignment guides) and a neighbourhood
+query against a linear scan, on randomly scattered (overlapping) widgets.
+Placing a new widget is timed on a layout packed by find_free_slot itself;
+a 4K screen holds about 340 widgets of 200x100, so the last row measures a
+full screen (no free slot).
+
+Run from the repository root:  python -m benchmarks.bench_spatial_index
+"""
+
+import random
+import time
+from src.utils.spatial_index import SpatialIndex, intersects
+
+BOUNDS = (0, 0, 3840, 2160)
+WIDGET_COUNTS = (100, 300, 1000)
+REPEATS = 1000
+
+
+def populate(count):
+    rng = random.Random(count)
+    index = SpatialIndex()
+    for number in range(count):
+        width, height = rng.randrange(100, 300), rng.randrange(60, 200)
+        index.insert(number, (rng.randrange(0, BOUNDS[2] - width), rng.randrange(0, BOUNDS[3] - height),
+                              width, height))
+    return index, rng
+
+
+def packed(count):
+    index = SpatialIndex()
+    for number in range(count):
+        slot = index.find_free_slot(200, 100, BOUNDS)
+        if slot is None:
+            break
+        index.insert(number, (slot[0], slot[1], 200, 100))
+    return index
+
+
+def per_call_us(function, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        function(*args)
+    return (time.perf_counter() - start) * 1e6 / len(args_list)
+
+
+def main():
+    print(f"{'widgets':>7}  {'snap (us)':>9}  {'query (us)':>10}  {'linear (us)':>11}  {'free slot (us)':>14}")
+    for count in WIDGET_COUNTS:
+        index, rng = populate(count)
+        areas = [((rng.randrange(0, 3600), rng.randrange(0, 2000), 200, 100),) for _ in range(REPEATS)]
+        snap = per_call_us(lambda area: index.snap(area, bounds=BOUNDS, exclude=0), areas)
+        query = per_call_us(index.query, areas)
+        linear = per_call_us(lambda area: [key for key, rect in index.rects.items() if intersects(rect, area)], areas)
+        free_slot = per_call_us(packed(count).find_free_slot, [(200, 100, BOUNDS)] * 20)
+        print(f"{count:>7}  {snap:>9.1f}  {query:>10.1f}  {linear:>11.1f}  {free_slot:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Widget styling: a stylesheet f-string per updateStyle versus the theme engine.
+
+Uses a calculator-sized widget (a line edit and 16 buttons). Construction
+includes the first show, where Qt polishes the widget tree. A position-only
+restyle is what updateConfig() triggers after a move; a colour restyle
+switches between two colours.
+
+Run from the repository root:  QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_theme_engine
+"""
+
+import time
+from PyQt5.QtWidgets import QApplication, QGridLayout, QLineEdit, QPushButton, QWidget
+from src.utils.theme import ThemeEngine, lighten_color
+
+WIDGETS = 50
+RESTYLES = 20
+COLORS = ('#34495E', '#2980B9')
+
+TEMPLATE = """
+QWidget {{
+    background-color: {bg_color};
+    color: {text_color};
+    font-size: 18px;
+}}
+QPushButton {{
+    background-color: {button_color};
+    border: none;
+    padding: 15px;
+}}
+QPushButton:hover {{
+    background-color: {hover_color};
+}}
+QLineEdit {{
+    border: none;
+    padding: 10px;
+    font-size: 24px;
+}}
+"""
+
+
+class CalculatorLike(QWidget):
+    engine = None
+
+    def __init__(self):
+        super().__init__()
+        self.button_color = COLORS[0]
+        layout = QGridLayout(self)
+        layout.addWidget(QLineEdit(), 0, 0, 1, 4)
+        for number in range(16):
+            layout.addWidget(QPushButton(str(number)), 1 + number // 4, number % 4)
+        self.updateStyle()
+
+    def updateStyle(self):
+        if self.engine is not None:
+            self.engine.apply_stylesheet(self, TEMPLATE, bg_color='#2C3E50', text_color='#ECF0F1',
+                                         button_color=self.button_color, hover_color=lighten_color(self.button_color))
+            return
+        self.setStyleSheet(TEMPLATE.format(bg_color='#2C3E50', text_color='#ECF0F1', button_color=self.button_color,
+                                           hover_color=lighten_color(self.button_color)))
+
+
+def timed_ms(function, app):
+    start = time.perf_counter()
+    function()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def measure(engine, app):
+    CalculatorLike.engine = engine
+    widgets = []
+
+    def construct():
+        for _ in range(WIDGETS):
+            widget = CalculatorLike()
+            widget.show()
+            widgets.append(widget)
+
+    def restyle_unchanged():
+        for _ in range(RESTYLES):
+            for widget in widgets:
+                widget.updateStyle()
+
+    def restyle_colour():
+        for number in range(RESTYLES):
+            for widget in widgets:
+                widget.button_color = COLORS[(number + 1) % 2]
+                widget.updateStyle()
+
+    results = (timed_ms(construct, app) / WIDGETS,
+               timed_ms(restyle_unchanged, app) / (WIDGETS * RESTYLES),
+               timed_ms(restyle_colour, app) / (WIDGETS * RESTYLES))
+    for widget in widgets:
+        widget.deleteLater()
+    app.processEvents()
+    return results
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    print(f"{'styling':<14}  {'construct (ms)':>14}  {'restyle, same (ms)':>18}  {'restyle, colour (ms)':>20}")
+    for name, engine in (('f-string', None), ('theme engine', ThemeEngine())):
+        construct, unchanged, colour = measure(engine, app)
+        print(f"{name:<14}  {construct:>14.3f}  {unchanged:>18.3f}  {colour:>20.3f}")
+
+
+if __name__ == '__main__':
+    main()
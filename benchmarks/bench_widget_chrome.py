@@ -0,0 +1,91 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Widget chrome painting: drawing the decorations per frame versus the cached pixmaps.
+
+Times paintEvent alone (rendered into an offscreen pixmap) for a widget
+with only the resize handle and for one with a border as well.
+
+Run from the repository root:  QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_widget_chrome
+"""
+
+import time
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QPainter, QPen, QPixmap
+from PyQt5.QtWidgets import QApplication
+from src.utils.draggable_widget import DraggableWidget
+
+FRAMES = 2000
+SIZE = (300, 200)
+STYLES = {
+    'handle': {},
+    'border + handle': {'border_color': '#000000', 'handle_color': QColor(200, 200, 200)},
+}
+
+
+class BenchWidget(DraggableWidget):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        return {}
+
+    def save_config(self):
+        pass
+
+    def chrome_options(self):
+        return dict(self.options, handle_size=self.resize_handle_size)
+
+
+class DirectPaintWidget(BenchWidget):
+    # Hoe de widgets hun decoratie tekenden voordat ChromeRenderer bestond
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if 'border_color' in self.options:
+            painter.setPen(QPen(QColor(self.options['border_color']), 1, Qt.SolidLine))
+            painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(self.options.get('handle_color', QColor(200, 200, 200, 128))))
+        painter.drawRect(self.width() - self.resize_handle_size, self.height() - self.resize_handle_size,
+                         self.resize_handle_size, self.resize_handle_size)
+
+
+def paint_time_us(widget_class, options, app):
+    widget = widget_class(options)
+    widget.resize(*SIZE)
+    target = QPixmap(*SIZE)
+    target.fill(Qt.transparent)
+    widget.render(target)  # Eerste frame vult de cache
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        widget.render(target)
+    elapsed = (time.perf_counter() - start) * 1e6 / FRAMES
+    widget.deleteLater()
+    app.processEvents()
+    return elapsed
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    print(f"{'chrome':<16}  {'direct (us)':>11}  {'cached (us)':>11}")
+    for name, options in STYLES.items():
+        direct = paint_time_us(DirectPaintWidget, options, app)
+        cached = paint_time_us(BenchWidget, options, app)
+        print(f"{name:<16}  {direct:>11.1f}  {cached:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Wall-clock time of cold widget discovery and pre-compilation.
+
+Run from the repository root:  python -m benchmarks.bench_widget_discovery
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from src.utils import widget_loader
+from src.utils.bytecode_cache import BytecodeCache
+from src.utils.widget_index import WidgetIndex
+from src.utils.widget_loader import DISCOVERY_WORKERS, ModuleCache, load_widgets
+
+WIDGET_COUNTS = (10, 50, 200)
+
+WIDGET_TEMPLATE = '''"""
+Synthetic Widget {number}
+
+Dependencies:
+PyQt5==5.15.6
+requests==2.26.0
+"""
+
+{body}
+
+Widget = Handler0
+'''
+
+METHOD_TEMPLATE = '''
+class Handler{number}:
+    def __init__(self):
+        self.values = [value * {number} for value in range(32)]
+
+    def total(self):
+        return sum(value for value in self.values if value % 3)
+'''
+
+
+def create_widgets(widget_dir, count):
+    body = ''.join(METHOD_TEMPLATE.format(number=n) for n in range(60))
+    for number in range(count):
+        package_dir = os.path.join(widget_dir, f'widget_{number}')
+        os.makedirs(package_dir)
+        with open(os.path.join(package_dir, f'widget_{number}.py'), 'w') as f:
+            f.write(WIDGET_TEMPLATE.format(number=number, body=body))
+
+
+def run(widget_dir, max_workers):
+    # Koude start: lege index en lege bytecode-cache
+    bytecode_dir = tempfile.mkdtemp()
+    widget_loader.bytecode_cache = BytecodeCache(bytecode_dir)
+    start = time.perf_counter()
+    widgets = load_widgets(widget_dir, WidgetIndex(), max_workers=max_workers)
+    ModuleCache().precompile([(info['path'], info['hash']) for info in widgets.values()],
+                             max_workers=max_workers)
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(bytecode_dir)
+    return elapsed
+
+
+def main():
+    print(f"{'widgets':>8} {'serial (ms)':>12} {'pool (ms)':>10} {'saved':>8}   workers={DISCOVERY_WORKERS}")
+    for count in WIDGET_COUNTS:
+        widget_dir = tempfile.mkdtemp()
+        try:
+            create_widgets(widget_dir, count)
+            serial = min(run(widget_dir, 1) for _ in range(3))
+            pooled = min(run(widget_dir, DISCOVERY_WORKERS) for _ in range(3))
+        finally:
+            shutil.rmtree(widget_dir)
+        saved = (serial - pooled) / serial * 100
+        print(f"{count:>8} {serial * 1000:>12.1f} {pooled * 1000:>10.1f} {saved:>7.1f}%")
+
+
+if __name__ == '__main__':
+    main()
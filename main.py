@@ -15,6 +15,7 @@
 
 import sys
 import os
+import time
 from pathlib import Path
 
 # Add the path to the widget_venv to sys.path
@@ -31,10 +32,14 @@ from src.core.overlay import Overlay
 from src.config import APP_NAME
 from src.core.tray_icon import SystemTrayIcon
 from src.utils.settings import Settings
+from src.utils.sqlite_store import open_backend
+from src.utils.widget_config import flush_widget_configs
 from src.utils.logger import setup_logger
 from src.utils.widget_loader import WidgetManager
 
 def main():
+    start_time = time.perf_counter()
+
     # Initialize application
     app = QApplication(sys.argv)
     app.setApplicationName(APP_NAME)
@@ -46,10 +51,10 @@ def main():
     logger.info("Application starting")
 
     # Load settings (for application-wide settings, not widget-specific)
-    settings = Settings()
+    settings = Settings(backend=open_backend('settings'))
 
-    # Create and show overlay
-    overlay = Overlay(settings)
+    # Create and show overlay; widgets are activated after the first paint
+    overlay = Overlay(settings, start_time)
     overlay.initUI()
     overlay.show()  # Make the overlay visible by default
 
@@ -58,6 +63,11 @@ def main():
     tray_icon = SystemTrayIcon(QIcon(icon_path), overlay, settings)
     tray_icon.show()
 
+    # Widget-posities en wachtende instellingen wegschrijven voordat de app stopt
+    app.aboutToQuit.connect(overlay.close)
+    app.aboutToQuit.connect(settings.flush)
+    app.aboutToQuit.connect(flush_widget_configs)
+
     # Start the application
     sys.exit(app.exec_())
 
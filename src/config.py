@@ -13,5 +13,29 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
+
 APP_NAME = "Imolia Desktop Customizer"
-WIDGETS_FOLDER_NAME = f"{APP_NAME} Widgets"
\ No newline at end of file
+WIDGETS_FOLDER_NAME = f"{APP_NAME} Widgets"
+
+# Per-user application data (logs, caches, indexes). Falls back to ~/.config
+# outside Windows so the application still starts during development.
+APP_DATA_DIR = os.path.join(os.getenv('APPDATA') or os.path.join(os.path.expanduser('~'), '.config'), APP_NAME)
+
+LOG_DIR = os.path.join(APP_DATA_DIR, 'logs')
+
+# Wheels used to build widget venvs without network access
+WHEELHOUSE_DIR = os.path.join(APP_DATA_DIR, 'wheelhouse')
+
+# Configuration of every widget (position, size, colours, ...) in one store
+WIDGET_CONFIG_PATH = os.path.join(APP_DATA_DIR, 'widget_configs.json')
+
+# Storage of settings and widget configs: 'json' (default) or 'sqlite'
+SETTINGS_BACKEND = os.getenv('IMOLIA_SETTINGS_BACKEND', 'json').lower()
+SETTINGS_DB_PATH = os.path.join(APP_DATA_DIR, 'settings.db')
+
+# Widget startup profiling (time and tracemalloc per phase, see WidgetProfiler); off unless set to 1
+PROFILE_STARTUP = os.getenv('IMOLIA_PROFILE_STARTUP', '0') == '1'
+
+# How the overlay hosts widgets: 'full' (default), 'mask' or 'windows'; see ScreenOverlay
+OVERLAY_MODE = os.getenv('IMOLIA_OVERLAY_MODE', 'full').lower()
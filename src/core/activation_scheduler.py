@@ -0,0 +1,76 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import time
+import logging
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+class ActivationScheduler(QObject):
+    """Activates queued widgets across event-loop turns.
+
+    Each turn activates widgets in queue (priority) order until the frame
+    budget is spent, always at least one, so the overlay keeps painting and
+    handling input while a slow widget starts up.
+    """
+
+    widgetActivated = pyqtSignal(str, object)
+    finished = pyqtSignal()
+
+    def __init__(self, activate, frame_budget_ms=12, parent=None):
+        super().__init__(parent)
+        self.activate = activate
+        self.frame_budget = frame_budget_ms / 1000
+        self.queue = []
+        self.running = False
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.run_frame)
+
+    def schedule(self, widget_names):
+        for widget_name in widget_names:
+            if widget_name not in self.queue:
+                self.queue.append(widget_name)
+        if self.running and self.queue:
+            self.timer.start()
+
+    def cancel(self, widget_name):
+        if widget_name in self.queue:
+            self.queue.remove(widget_name)
+
+    def is_pending(self, widget_name):
+        return widget_name in self.queue
+
+    def start(self):
+        self.running = True
+        if self.queue:
+            self.timer.start()
+        else:
+            self.finished.emit()
+
+    def run_frame(self):
+        frame_start = time.perf_counter()
+        while self.queue:
+            widget_name = self.queue.pop(0)
+            self.widgetActivated.emit(widget_name, self.activate(widget_name))
+            if time.perf_counter() - frame_start >= self.frame_budget:
+                break
+
+        elapsed = (time.perf_counter() - frame_start) * 1000
+        if elapsed > self.frame_budget * 1000:
+            logging.debug(f"Activatieframe duurde {elapsed:.1f} ms")
+        if not self.queue:
+            self.timer.stop()
+            self.finished.emit()
@@ -0,0 +1,272 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import time
+import uuid
+import logging
+from PyQt5.QtCore import Qt, QProcess, QProcessEnvironment, QTimer, QRect
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtNetwork import QLocalServer
+from PyQt5.QtWidgets import QApplication
+from src.utils.draggable_widget import DraggableWidget
+from src.utils.widget_ipc import MessageReader, encode_message
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CLOSE_TIMEOUT_MS = 2000
+
+# Processen van gesloten widgets die hun configuratie nog wegschrijven
+closing_processes = set()
+
+
+def stop_closing_process(process):
+    if process in closing_processes:
+        logging.warning("Widgetproces reageert niet op sluiten, wordt gestopt")
+        process.kill()
+
+
+def forget_closing_process(process):
+    closing_processes.discard(process)
+    process.deleteLater()
+
+
+def wait_for_closing_widgets(timeout_ms=CLOSE_TIMEOUT_MS):
+    """Wait for the processes of closed widgets, at most timeout_ms for all of them together."""
+    deadline = time.monotonic() + timeout_ms / 1000
+    for process in list(closing_processes):
+        remaining = max(0, int((deadline - time.monotonic()) * 1000))
+        if process.state() != QProcess.NotRunning and not process.waitForFinished(remaining):
+            process.kill()
+            process.waitForFinished(100)
+        closing_processes.discard(process)
+
+
+class IsolatedWidget(DraggableWidget):
+    """Overlay-side proxy for a widget running in its own process.
+
+    The child (src.core.widget_host) runs with the widget's venv interpreter
+    and streams rendered frames over a local socket. Clicks on the child's
+    interactive controls, wheel and key events are forwarded; everything
+    else drags and resizes the proxy as with any DraggableWidget. A crashed
+    child is restarted with exponential backoff. Closing does not wait for
+    the child; see wait_for_closing_widgets.
+    """
+
+    INITIAL_BACKOFF_MS = 1000
+    MAX_BACKOFF_MS = 60000
+    STABLE_RUN_SECONDS = 30
+
+    def __init__(self, widget_name, module_path, python_executable, parent=None):
+        super().__init__(parent)
+        self.widget_name = widget_name
+        self.module_path = module_path
+        self.python_executable = python_executable
+        self.frame = None
+        self.interactive = []
+        self.forwarding = False
+        self.closing = False
+        self.backoff_ms = self.INITIAL_BACKOFF_MS
+        self.started_at = 0
+        self.socket = None
+        self.reader = MessageReader()
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.resize(200, 100)
+
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self.on_new_connection)
+        self.server.listen(f"imolia-{os.getpid()}-{uuid.uuid4().hex}")
+
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        self.process.readyReadStandardOutput.connect(self.on_process_output)
+        self.process.finished.connect(self.on_process_finished)
+        self.process.errorOccurred.connect(self.on_process_error)
+        self.start_process()
+
+    def load_config(self):
+        # Het widgetproces bewaart de configuratie zelf
+        return {}
+
+    def save_config(self):
+        pass
+
+    def start_process(self):
+        env = QProcessEnvironment.systemEnvironment()
+        python_path = env.value('PYTHONPATH')
+        env.insert('PYTHONPATH', os.pathsep.join(filter(None, [APP_ROOT, python_path])))
+        self.process.setProcessEnvironment(env)
+        self.process.setWorkingDirectory(APP_ROOT)
+        self.reader = MessageReader()
+        self.started_at = time.monotonic()
+        logging.debug(f"Geïsoleerde widget {self.widget_name} starten met {self.python_executable}")
+        self.process.start(self.python_executable, ['-m', 'src.core.widget_host', self.server.fullServerName(),
+                                                    self.widget_name, self.module_path])
+
+    def on_new_connection(self):
+        socket = self.server.nextPendingConnection()
+        if self.socket is not None:
+            self.socket.deleteLater()
+        self.socket = socket
+        self.socket.readyRead.connect(self.on_ready_read)
+
+    def on_process_output(self):
+        output = bytes(self.process.readAllStandardOutput()).decode('utf-8', errors='replace')
+        for line in output.splitlines():
+            logging.debug(f"[{self.widget_name}] {line}")
+
+    def on_process_error(self, error):
+        if error == QProcess.FailedToStart:
+            logging.error(f"Geïsoleerde widget {self.widget_name} kon niet starten: {self.process.errorString()}")
+            self.schedule_restart()
+
+    def on_process_finished(self, exit_code, exit_status):
+        if self.closing:
+            return
+        logging.warning(f"Geïsoleerde widget {self.widget_name} gestopt (code {exit_code}), herstart gepland")
+        self.schedule_restart()
+
+    def schedule_restart(self):
+        if self.closing:
+            return
+        if time.monotonic() - self.started_at > self.STABLE_RUN_SECONDS:
+            self.backoff_ms = self.INITIAL_BACKOFF_MS
+        QTimer.singleShot(self.backoff_ms, self.restart_process)
+        self.backoff_ms = min(self.backoff_ms * 2, self.MAX_BACKOFF_MS)
+
+    def restart_process(self):
+        if not self.closing and self.process.state() == QProcess.NotRunning:
+            self.start_process()
+
+    def send(self, kind, payload=None):
+        if self.socket is not None and self.socket.state() == self.socket.ConnectedState:
+            self.socket.write(encode_message(kind, payload))
+
+    def on_ready_read(self):
+        try:
+            messages = self.reader.feed(bytes(self.socket.readAll()))
+        except ValueError as e:
+            logging.error(f"Ongeldige data van widget {self.widget_name}: {str(e)}")
+            self.process.kill()
+            return
+        for kind, payload, data in messages:
+            if kind == 'hello':
+                self.on_hello(payload)
+            elif kind == 'frame':
+                self.on_frame(payload, data)
+
+    def on_hello(self, payload):
+        self.setMinimumSize(*payload['minimum_size'])
+        self.config['position'] = tuple(payload['position'])
+        self.config['size'] = tuple(payload['size'])
+        self.resize(*payload['size'])
+        self.move_to_screen_position(*payload['position'])
+
+    def on_frame(self, payload, data):
+        image = QImage(data, payload['width'], payload['height'], payload['width'] * 4,
+                       QImage.Format_ARGB32_Premultiplied).copy()
+        image.setDevicePixelRatio(payload['dpr'])
+        self.frame = image
+        self.interactive = [QRect(*rect) for rect in payload['interactive']]
+        self.update()
+
+    def paintEvent(self, event):
+        if self.frame is not None:
+            painter = QPainter(self)
+            painter.drawImage(0, 0, self.frame)
+            painter.end()
+        super().paintEvent(event)
+
+    def is_interactive(self, pos):
+        return any(rect.contains(pos) for rect in self.interactive)
+
+    def send_mouse(self, event_type, event):
+        self.send('mouse', {
+            'type': event_type,
+            'x': event.pos().x(),
+            'y': event.pos().y(),
+            'button': int(event.button()),
+            'buttons': int(event.buttons()),
+            'modifiers': int(event.modifiers()),
+        })
+
+    def send_geometry(self):
+        x, y = self.screen_position()
+        self.send('geometry', {'x': x, 'y': y, 'width': self.width(), 'height': self.height()})
+
+    def mousePressEvent(self, event):
+        if not self.isInResizeArea(event.pos()) and self.is_interactive(event.pos()):
+            self.forwarding = True
+            self.send_mouse('press', event)
+        else:
+            super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.forwarding or not (self.dragging or self.resizing):
+            self.send_mouse('move', event)
+        if not self.forwarding:
+            super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self.forwarding:
+            self.send_mouse('release', event)
+            self.forwarding = event.buttons() != Qt.NoButton
+        else:
+            super().mouseReleaseEvent(event)
+            self.send_geometry()
+
+    def mouseDoubleClickEvent(self, event):
+        if self.is_interactive(event.pos()):
+            self.send_mouse('double', event)
+
+    def wheelEvent(self, event):
+        self.send('wheel', {
+            'x': event.pos().x(),
+            'y': event.pos().y(),
+            'dx': event.angleDelta().x(),
+            'dy': event.angleDelta().y(),
+            'buttons': int(event.buttons()),
+            'modifiers': int(event.modifiers()),
+        })
+
+    def keyPressEvent(self, event):
+        self.send('key', {'type': 'press', 'key': event.key(), 'modifiers': int(event.modifiers()),
+                          'text': event.text()})
+
+    def keyReleaseEvent(self, event):
+        self.send('key', {'type': 'release', 'key': event.key(), 'modifiers': int(event.modifiers()),
+                          'text': event.text()})
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.send_geometry()
+
+    def openSettings(self):
+        self.send('settings')
+
+    def closeEvent(self, event):
+        if not self.closing:
+            self.closing = True
+            self.send('close')
+            if self.socket is not None:
+                self.socket.flush()
+            if self.process.state() != QProcess.NotRunning:
+                # Niet wachten: het proces sluit zelf af en overleeft zo nodig deze widget
+                process = self.process
+                process.setParent(QApplication.instance())
+                closing_processes.add(process)
+                process.finished.connect(lambda *args: forget_closing_process(process))
+                QTimer.singleShot(CLOSE_TIMEOUT_MS, lambda: stop_closing_process(process))
+            self.server.close()
+        super().closeEvent(event)
@@ -13,17 +13,45 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from PyQt5.QtWidgets import QWidget, QDesktopWidget
-from PyQt5.QtCore import Qt
+import time
+import logging
+from PyQt5.QtWidgets import QApplication, QFrame
+from PyQt5.QtCore import QObject, QPoint
 from pathlib import Path
-from src.config import APP_NAME, WIDGETS_FOLDER_NAME
+from src.config import APP_NAME, WIDGETS_FOLDER_NAME, OVERLAY_MODE
+from src.core.activation_scheduler import ActivationScheduler
+from src.core.isolated_widget import wait_for_closing_widgets
+from src.core.screen_overlay import ScreenOverlay, FULL, OVERLAY_MODES
 from src.utils.widget_loader import WidgetManager
+from src.utils.widget_watcher import WidgetWatcher
 
-class Overlay(QWidget):
-    def __init__(self, settings):
+
+class Overlay(QObject):
+    """Owns the widgets and spreads them over one ScreenOverlay per screen.
+
+    Screen overlays are created and removed on the application's
+    screenAdded/screenRemoved signals. Widget positions are relative to
+    the screen a widget is on; which screen that is, is stored by screen
+    name in the 'widget_screens' setting. Widgets of an unknown or removed
+    screen go to the primary screen. mode selects how the screen overlays
+    host their widgets, see ScreenOverlay.
+    """
+
+    def __init__(self, settings, start_time=None, mode=OVERLAY_MODE):
         super().__init__()
         self.settings = settings
+        if mode not in OVERLAY_MODES:
+            logging.warning(f"Onbekende overlay-modus {mode}, {FULL} wordt gebruikt")
+            mode = FULL
+        self.mode = mode
         self.widgets = {}
+        self.placeholders = {}
+        self.screen_overlays = {}
+        self.visible = False
+        self.closed = False
+        self.start_time = start_time or time.perf_counter()
+        self.first_paint_time = None
+        self.prepare_after_paint = []
 
         user_documents = Path.home() / "Documents"
         default_widget_dir = user_documents / WIDGETS_FOLDER_NAME
@@ -33,57 +61,262 @@ class Overlay(QWidget):
         widget_dir = str(default_widget_dir)
         self.widget_manager = WidgetManager(widget_dir)
 
+        self.widget_watcher = WidgetWatcher(widget_dir, parent=self)
+        self.widget_watcher.widgetsChanged.connect(self.on_widget_files_changed)
+
+        # Widgets worden pas na de eerste paint geactiveerd, verspreid over event-loop-beurten
+        self.activation_scheduler = ActivationScheduler(self.widget_manager.activate_widget, parent=self)
+        self.activation_scheduler.widgetActivated.connect(self.on_widget_activated)
+        self.activation_scheduler.finished.connect(self.on_activation_finished)
+
+        installer = self.widget_manager.installer
+        installer.installFinished.connect(self.on_install_finished)
+        installer.installFailed.connect(self.on_install_failed)
+
     def initUI(self):
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setWindowFlags(
-            Qt.FramelessWindowHint | 
-            Qt.WindowStaysOnBottomHint |
-            Qt.Tool
-        )
-
-        desktop = QDesktopWidget()
-        primary_screen = desktop.screenNumber(desktop.cursor().pos())
-        desktop_rect = desktop.screenGeometry(primary_screen)
-        self.setGeometry(desktop_rect)
+        app = QApplication.instance()
+        for screen in app.screens():
+            self.add_screen(screen)
+        app.screenAdded.connect(self.add_screen)
+        app.screenRemoved.connect(self.remove_screen)
 
         self.load_active_widgets()
 
+    def add_screen(self, screen):
+        if screen in self.screen_overlays:
+            return
+        screen_overlay = ScreenOverlay(screen, self.mode)
+        screen_overlay.firstPaint.connect(self.on_first_paint)
+        screen_overlay.widgetLeft.connect(self.on_widget_left_screen)
+        self.screen_overlays[screen] = screen_overlay
+        if self.visible:
+            screen_overlay.show()
+
+    def remove_screen(self, screen):
+        screen_overlay = self.screen_overlays.pop(screen, None)
+        if screen_overlay is None:
+            return
+        target = self.primary_overlay()
+        for widget, widget_name in list(screen_overlay.tracked.items()):
+            if target is not None:
+                self.move_to_screen(widget_name, widget, target, screen_overlay.local_rect(widget).topLeft())
+            else:
+                screen_overlay.untrack_widget(widget_name, widget)
+                widget.setParent(None)
+        screen_overlay.deleteLater()
+        self.save_widget_geometries()
+
+    def primary_overlay(self):
+        primary = QApplication.primaryScreen()
+        if primary in self.screen_overlays:
+            return self.screen_overlays[primary]
+        return next(iter(self.screen_overlays.values()), None)
+
+    def overlay_for(self, widget_name):
+        screen_name = self.settings.get('widget_screens', {}).get(widget_name)
+        for screen_overlay in self.screen_overlays.values():
+            if screen_overlay.screen_name() == screen_name:
+                return screen_overlay
+        return self.primary_overlay()
+
+    def screen_overlay_of(self, widget):
+        for screen_overlay in self.screen_overlays.values():
+            if widget in screen_overlay.tracked:
+                return screen_overlay
+        return None
+
+    def overlay_at(self, global_pos):
+        for screen_overlay in self.screen_overlays.values():
+            if screen_overlay.screen_geometry.contains(global_pos):
+                return screen_overlay
+        return None
+
+    def move_to_screen(self, widget_name, widget, target, pos):
+        source = self.screen_overlay_of(widget)
+        if source is not None:
+            source.untrack_widget(widget_name, widget)
+        target.adopt(widget)
+        if hasattr(widget, 'snapper'):
+            widget.snapper = target
+        target.place(widget, pos)
+        target.keep_inside(widget)
+        target.show_widget(widget)
+        target.track_widget(widget_name, widget)
+
+    def on_widget_left_screen(self, widget):
+        source = self.screen_overlay_of(widget)
+        widget_name = source.tracked.get(widget)
+        global_pos = source.screen_geometry.topLeft() + source.local_rect(widget).topLeft()
+        target = self.overlay_at(global_pos + widget.rect().center())
+        if target is None or target is source:
+            source.keep_inside(widget)
+            return
+        self.move_to_screen(widget_name, widget, target, global_pos - target.screen_geometry.topLeft())
+        screens = dict(self.settings.get('widget_screens', {}))
+        screens[widget_name] = target.screen_name()
+        self.settings.set('widget_screens', screens)
+
     def load_active_widgets(self):
         active_widgets = self.settings.get('active_widgets', [])
         available_widgets = self.widget_manager.get_available_widgets()
+        changed_mode = self.widget_manager.set_isolated_widgets(self.settings.get('isolated_widgets', []))
         
-        # Verwijder inactieve widgets
+        # Verwijder inactieve widgets en widgets die van proces wisselen
         for widget_name in list(self.widgets.keys()):
-            if widget_name not in active_widgets:
+            if widget_name not in active_widgets or widget_name in changed_mode:
                 self.widget_manager.deactivate_widget(widget_name)
-                del self.widgets[widget_name]
+                self.untrack_widget(widget_name, self.widgets.pop(widget_name))
+        for widget_name in list(self.placeholders.keys()):
+            if widget_name not in active_widgets:
+                self.activation_scheduler.cancel(widget_name)
+                self.widget_manager.installer.cancel(widget_name)
+                self.remove_placeholder(widget_name)
         
-        # Laad actieve widgets
-        for widget_name in active_widgets:
-            if widget_name in available_widgets and widget_name not in self.widgets:
-                widget = self.widget_manager.activate_widget(widget_name)
-                if widget:
-                    self.widgets[widget_name] = widget
-                    widget.setParent(self)
-                    widget.show()
-                    
-                    saved_position = widget.config.get('position')
-                    if saved_position:
-                        widget.move(*saved_position)
-                    else:
-                        widget.move(50 * len(self.widgets), 50 * len(self.widgets))
-
-    def resizeEvent(self, event):
-        desktop = QDesktopWidget()
-        primary_screen = desktop.screenNumber(desktop.cursor().pos())
-        self.setGeometry(desktop.screenGeometry(primary_screen))
-        super().resizeEvent(event)
-
-    def showEvent(self, event):
-        self.lower()
-        super().showEvent(event)
-
-    def closeEvent(self, event):
+        # Plan actieve widgets in, in de volgorde van de instellingen (prioriteit)
+        pending = [name for name in active_widgets
+                   if name in available_widgets and name not in self.widgets and name not in self.placeholders]
+        # Compileren pas na de eerste frame, zodat het de eerste paint niet ophoudt
+        if self.first_paint_time is None:
+            self.prepare_after_paint.extend(pending)
+        else:
+            self.widget_manager.prepare_widgets(pending)
+        for widget_name in pending:
+            self.add_placeholder(widget_name)
+        self.activation_scheduler.schedule(pending)
+
+    def untrack_widget(self, widget_name, widget):
+        screen_overlay = self.screen_overlay_of(widget) if widget is not None else None
+        if screen_overlay is not None:
+            screen_overlay.untrack_widget(widget_name, widget)
+
+    def add_placeholder(self, widget_name):
+        screen_overlay = self.overlay_for(widget_name)
+        if screen_overlay is None:
+            return
+        placeholder = QFrame()
+        screen_overlay.adopt(placeholder)
+        placeholder.setStyleSheet("QFrame { border: 1px dashed rgba(200, 200, 200, 128); border-radius: 10px; }")
+        geometry = self.settings.get('widget_geometries', {}).get(widget_name)
+        if geometry:
+            x, y, width, height = geometry
+            placeholder.resize(width, height)
+            screen_overlay.place(placeholder, QPoint(x, y))
+        else:
+            placeholder.resize(200, 100)
+            screen_overlay.place(placeholder, screen_overlay.find_free_position(200, 100))
+        screen_overlay.show_widget(placeholder)
+        self.placeholders[widget_name] = placeholder
+        screen_overlay.track_widget(widget_name, placeholder)
+
+    def remove_placeholder(self, widget_name):
+        placeholder = self.placeholders.pop(widget_name, None)
+        if placeholder:
+            self.untrack_widget(widget_name, placeholder)
+            placeholder.deleteLater()
+
+    def on_widget_activated(self, widget_name, widget):
+        if widget is None and self.widget_manager.installer.is_pending(widget_name):
+            return  # De placeholder blijft staan tot de installatie klaar is
+        self.remove_placeholder(widget_name)
+        if widget:
+            self.add_widget(widget_name, widget)
+
+    def on_install_finished(self, widget_name):
+        if widget_name not in self.settings.get('active_widgets', []) or widget_name in self.widgets:
+            return
+        if widget_name not in self.placeholders:
+            self.add_placeholder(widget_name)
+        self.activation_scheduler.schedule([widget_name])
+
+    def on_install_failed(self, widget_name, message):
+        self.activation_scheduler.cancel(widget_name)
+        self.remove_placeholder(widget_name)
+
+    def on_activation_finished(self):
+        elapsed = (time.perf_counter() - self.start_time) * 1000
+        logging.getLogger('DesktopCustomizer').info(f"Alle widgets geactiveerd na {elapsed:.0f} ms")
+        self.save_widget_geometries()
+        self.widget_manager.profiler.finish()
+
+    def save_widget_geometries(self):
+        geometries = dict(self.settings.get('widget_geometries', {}))
+        screens = dict(self.settings.get('widget_screens', {}))
+        for widget_name, widget in self.widgets.items():
+            screen_overlay = self.screen_overlay_of(widget)
+            if screen_overlay is None:
+                continue
+            rect = screen_overlay.local_rect(widget)
+            geometries[widget_name] = [rect.x(), rect.y(), rect.width(), rect.height()]
+            screens[widget_name] = screen_overlay.screen_name()
+        with self.settings.batch():
+            self.settings.set('widget_geometries', geometries)
+            self.settings.set('widget_screens', screens)
+
+    def add_widget(self, widget_name, widget):
+        screen_overlay = self.overlay_for(widget_name)
+        if screen_overlay is None:
+            return
+        self.widgets[widget_name] = widget
+        screen_overlay.adopt(widget)
+        # Voor het plaatsen: screen_position() rekent via de snapper
+        widget.snapper = screen_overlay
+        profiler = self.widget_manager.profiler
+        profiler.watch_first_paint(widget_name, widget)
+        with profiler.phase(widget_name, 'first_show'):
+            screen_overlay.show_widget(widget)
+        profiler.shown(widget)
+
+        saved_position = widget.config.get('position')
+        if saved_position:
+            screen_overlay.place(widget, QPoint(*saved_position))
+            screen_overlay.keep_inside(widget)
+        else:
+            screen_overlay.place(widget, screen_overlay.find_free_position(widget.width(), widget.height()))
+        screen_overlay.track_widget(widget_name, widget)
+
+    def on_widget_files_changed(self, changed_paths):
+        refreshed, removed = self.widget_manager.reload_changed_widgets(changed_paths)
+        for widget_name in removed:
+            self.untrack_widget(widget_name, self.widgets.pop(widget_name, None))
+        for widget_name in refreshed:
+            self.untrack_widget(widget_name, self.widgets.pop(widget_name, None))
+            widget = self.widget_manager.get_active_widgets().get(widget_name)
+            if widget:
+                self.add_widget(widget_name, widget)
+
+    def on_first_paint(self):
+        if self.first_paint_time is not None:
+            return
+        self.first_paint_time = time.perf_counter()
+        elapsed = (self.first_paint_time - self.start_time) * 1000
+        logging.getLogger('DesktopCustomizer').info(f"Time-to-first-paint: {elapsed:.0f} ms")
+        self.widget_manager.prepare_widgets(self.prepare_after_paint)
+        self.prepare_after_paint = []
+        self.activation_scheduler.start()
+
+    def isVisible(self):
+        return self.visible
+
+    def show(self):
+        self.visible = True
+        for screen_overlay in self.screen_overlays.values():
+            screen_overlay.show()
+
+    def hide(self):
+        self.visible = False
+        for screen_overlay in self.screen_overlays.values():
+            screen_overlay.hide()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.widget_manager.shutdown()
+        self.widget_manager.venv_manager.shutdown_workers()
+        self.save_widget_geometries()
         for widget in self.widgets.values():
             widget.close()
-        QWidget.closeEvent(self, event)
\ No newline at end of file
+        wait_for_closing_widgets()
+        self.hide()
+        for screen_overlay in self.screen_overlays.values():
+            screen_overlay.close()
@@ -0,0 +1,232 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QEvent, QPoint, QRect, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPen, QRegion
+from src.utils.spatial_index import SpatialIndex, DEFAULT_MARGIN
+
+GUIDE_COLOR = QColor(0, 170, 255, 200)
+
+# full: widgets zijn kinderen van een schermvullend venster
+# mask: idem, maar het venster is gemaskeerd tot de widgetrechthoeken
+# windows: elke widget is een eigen klein Tool-venster
+FULL, MASK, WINDOWS = 'full', 'mask', 'windows'
+OVERLAY_MODES = (FULL, MASK, WINDOWS)
+WINDOW_FLAGS = Qt.FramelessWindowHint | Qt.WindowStaysOnBottomHint | Qt.Tool
+
+
+def rect_tuple(rect):
+    return rect.x(), rect.y(), rect.width(), rect.height()
+
+
+class ScreenOverlay(QWidget):
+    """Transparent desktop layer covering one screen.
+
+    The screen geometry is cached and only updated from the screen's
+    geometryChanged signal. Widget positions are relative to the top-left
+    of the screen, whichever mode is used. A spatial index of the widget
+    rectangles drives snapping, alignment guides and free-slot placement.
+
+    In the full mode widgets are children of this window and the
+    compositor blends the whole screen-sized surface. The mask mode
+    limits the window to the widget rectangles (plus any guides) with a
+    window mask that is updated per moved widget. In the windows mode
+    every widget is its own top-level tool window and this window is
+    masked down to the guides.
+    """
+
+    firstPaint = pyqtSignal()
+    widgetLeft = pyqtSignal(object)
+
+    def __init__(self, screen, mode=FULL):
+        super().__init__()
+        self.screen_ref = screen
+        self.screen_geometry = QRect(screen.geometry())
+        self.mode = mode
+        self.painted = False
+        self.spatial_index = SpatialIndex()
+        self.tracked = {}
+        self.guides = []
+        self.widget_region = QRegion()
+
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setWindowFlags(WINDOW_FLAGS)
+        self.setGeometry(self.screen_geometry)
+        self.apply_mask()
+        screen.geometryChanged.connect(self.on_geometry_changed)
+
+    def screen_name(self):
+        return self.screen_ref.name()
+
+    def on_geometry_changed(self, geometry):
+        if geometry == self.screen_geometry:
+            return
+        positions = {widget: self.local_rect(widget).topLeft() for widget in self.tracked}
+        self.screen_geometry = QRect(geometry)
+        self.setGeometry(self.screen_geometry)
+        # Eigen vensters schuiven mee met het scherm; widgets buiten een kleiner scherm terugzetten
+        for widget, position in positions.items():
+            self.place(widget, position)
+            self.keep_inside(widget)
+
+    def origin(self, widget):
+        if widget.isWindow():
+            return self.screen_geometry.topLeft()
+        return QPoint()
+
+    def local_rect(self, widget):
+        return widget.geometry().translated(-self.origin(widget))
+
+    def local_position(self, widget):
+        rect = self.local_rect(widget)
+        return rect.x(), rect.y()
+
+    def place(self, widget, position):
+        widget.move(position + self.origin(widget))
+
+    def adopt(self, widget):
+        if self.mode == WINDOWS:
+            widget.setParent(None)
+            widget.setWindowFlags(WINDOW_FLAGS)
+            widget.setAttribute(Qt.WA_TranslucentBackground)
+        else:
+            widget.setParent(self)
+
+    def show_widget(self, widget):
+        # Eigen vensters volgen de zichtbaarheid van de overlay
+        if widget.parentWidget() is self or self.isVisible():
+            widget.show()
+
+    def keep_inside(self, widget):
+        rect = self.local_rect(widget)
+        x = min(max(rect.x(), 0), max(self.width() - rect.width(), 0))
+        y = min(max(rect.y(), 0), max(self.height() - rect.height(), 0))
+        if (x, y) != (rect.x(), rect.y()):
+            self.place(widget, QPoint(x, y))
+            # Verborgen widgets krijgen hun Move-event pas bij het tonen
+            if widget in self.tracked:
+                self.update_rect(self.tracked[widget], self.local_rect(widget))
+
+    def track_widget(self, widget_name, widget):
+        self.tracked[widget] = widget_name
+        widget.installEventFilter(self)
+        self.update_rect(widget_name, self.local_rect(widget))
+
+    def untrack_widget(self, widget_name, widget):
+        if widget is not None and self.tracked.pop(widget, None) is not None:
+            widget.removeEventFilter(self)
+        if widget_name not in self.tracked.values():
+            old = self.spatial_index.rect(widget_name)
+            self.spatial_index.remove(widget_name)
+            self.update_widget_region(widget_name, old, None)
+
+    def update_rect(self, widget_name, rect):
+        old = self.spatial_index.rect(widget_name)
+        self.spatial_index.insert(widget_name, rect_tuple(rect))
+        self.update_widget_region(widget_name, old, rect)
+
+    def update_widget_region(self, widget_name, old, rect):
+        if self.mode != MASK:
+            return
+        region = self.widget_region
+        if old is not None:
+            region = region.subtracted(QRegion(*old))
+            # Wat andere widgets van de oude plek bedekken blijft zichtbaar
+            for key in self.spatial_index.query(old, exclude=widget_name):
+                region = region.united(QRect(*self.spatial_index.rect(key)))
+        if rect is not None:
+            region = region.united(rect)
+        self.widget_region = region
+        self.apply_mask()
+
+    def apply_mask(self):
+        if self.mode == FULL:
+            return
+        region = QRegion(self.widget_region)
+        for guide in self.guides:
+            region = region.united(self.guide_rect(guide))
+        if region.isEmpty():
+            # Een lege mask betekent geen mask: houd een enkele pixel over
+            region = QRegion(0, 0, 1, 1)
+        if region != self.mask():
+            self.setMask(region)
+
+    def eventFilter(self, watched, event):
+        if event.type() in (QEvent.Move, QEvent.Resize) and watched in self.tracked:
+            self.update_rect(self.tracked[watched], self.local_rect(watched))
+        return super().eventFilter(watched, event)
+
+    def find_free_position(self, width, height):
+        slot = self.spatial_index.find_free_slot(width, height, rect_tuple(self.rect()))
+        return QPoint(*slot) if slot else QPoint(DEFAULT_MARGIN, DEFAULT_MARGIN)
+
+    def snap_widget(self, widget, rect):
+        origin = self.origin(widget)
+        x, y, guides = self.spatial_index.snap(rect_tuple(rect.translated(-origin)), bounds=rect_tuple(self.rect()),
+                                               exclude=self.tracked.get(widget))
+        self.set_guides(guides)
+        return QPoint(x, y) + origin
+
+    def end_snap(self, widget):
+        self.set_guides([])
+        # Midden van de widget op een ander scherm: de Overlay verhuist hem
+        if not self.rect().contains(self.local_rect(widget).center()):
+            self.widgetLeft.emit(widget)
+
+    def set_guides(self, guides):
+        if guides == self.guides:
+            return
+        # Alleen de strookjes van oude en nieuwe hulplijnen opnieuw tekenen
+        for guide in self.guides + guides:
+            self.update(self.guide_rect(guide))
+        self.guides = guides
+        self.apply_mask()
+
+    @staticmethod
+    def guide_rect(guide):
+        orientation, position, start, end = guide
+        if orientation == 'vertical':
+            return QRect(position - 1, start, 3, end - start + 1)
+        return QRect(start, position - 1, end - start + 1, 3)
+
+    def showEvent(self, event):
+        if self.windowHandle() is not None:
+            self.windowHandle().setScreen(self.screen_ref)
+        self.lower()
+        super().showEvent(event)
+        for widget in self.tracked:
+            if widget.isWindow():
+                widget.show()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        for widget in self.tracked:
+            if widget.isWindow():
+                widget.hide()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.painted:
+            self.painted = True
+            self.firstPaint.emit()
+        if self.guides:
+            painter = QPainter(self)
+            painter.setPen(QPen(GUIDE_COLOR, 1, Qt.DashLine))
+            for orientation, position, start, end in self.guides:
+                if orientation == 'vertical':
+                    painter.drawLine(position, start, position, end)
+                else:
+                    painter.drawLine(start, position, end, position)
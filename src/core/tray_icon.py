@@ -16,6 +16,7 @@
 from PyQt5.QtWidgets import QSystemTrayIcon, QMenu, QAction
 from PyQt5.QtCore import QCoreApplication
 from src.gui.settings_window import SettingsWindow
+from src.gui.startup_report_window import StartupReportWindow
 from src.config import APP_NAME
 
 class SystemTrayIcon(QSystemTrayIcon):
@@ -39,6 +40,10 @@ class SystemTrayIcon(QSystemTrayIcon):
         settings_action.triggered.connect(self.open_settings)
         menu.addAction(settings_action)
 
+        report_action = QAction(("Startup Report"), self)
+        report_action.triggered.connect(self.open_startup_report)
+        menu.addAction(report_action)
+
         exit_action = QAction(("Exit"), self)
         exit_action.triggered.connect(QCoreApplication.instance().quit)
         menu.addAction(exit_action)
@@ -57,4 +62,8 @@ class SystemTrayIcon(QSystemTrayIcon):
 
     def open_settings(self):
         settings_window = SettingsWindow(self.settings, self.overlay)
-        settings_window.exec_()
\ No newline at end of file
+        settings_window.exec_()
+
+    def open_startup_report(self):
+        report_window = StartupReportWindow()
+        report_window.exec_()
\ No newline at end of file
@@ -0,0 +1,179 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Child process that hosts a single isolated widget.
+
+Started by IsolatedWidget as:  python -m src.core.widget_host <server> <name> <module_path>
+The widget is rendered off screen and its frames are streamed to the overlay
+over a QLocalSocket; input events from the overlay are replayed on it.
+"""
+
+import sys
+import zlib
+import logging
+from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtCore import Qt, QObject, QTimer, QPoint, QPointF, QRect, QEvent
+from PyQt5.QtGui import QImage, QMouseEvent, QKeyEvent, QWheelEvent
+from PyQt5.QtNetwork import QLocalSocket
+from src.utils.widget_config import flush_widget_configs
+from src.utils.widget_ipc import MessageReader, encode_message
+from src.utils.widget_loader import import_widget_module
+
+FRAME_INTERVAL_MS = 33
+
+MOUSE_EVENT_TYPES = {
+    'press': QEvent.MouseButtonPress,
+    'release': QEvent.MouseButtonRelease,
+    'move': QEvent.MouseMove,
+    'double': QEvent.MouseButtonDblClick,
+}
+
+KEY_EVENT_TYPES = {
+    'press': QEvent.KeyPress,
+    'release': QEvent.KeyRelease,
+}
+
+class WidgetHost(QObject):
+    def __init__(self, server_name, widget_name, module_path):
+        super().__init__()
+        self.widget_name = widget_name
+        self.reader = MessageReader()
+        self.last_frame_crc = None
+        self.mouse_target = None
+
+        module = import_widget_module(widget_name, module_path)
+        self.widget = module.Widget()
+        # Zichtbaar voor Qt (layout, focus, timers), maar niet op het scherm
+        self.widget.setAttribute(Qt.WA_DontShowOnScreen)
+        self.widget.show()
+
+        self.socket = QLocalSocket(self)
+        self.socket.readyRead.connect(self.on_ready_read)
+        self.socket.disconnected.connect(QApplication.instance().quit)
+        self.socket.connectToServer(server_name)
+        if not self.socket.waitForConnected(5000):
+            raise ConnectionError(f"Kan niet verbinden met {server_name}: {self.socket.errorString()}")
+
+        config = getattr(self.widget, 'config', {})
+        self.send('hello', {
+            'position': config.get('position') or [self.widget.x(), self.widget.y()],
+            'size': [self.widget.width(), self.widget.height()],
+            'minimum_size': [self.widget.minimumWidth(), self.widget.minimumHeight()],
+        })
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.send_frame)
+        self.frame_timer.start(FRAME_INTERVAL_MS)
+
+    def send(self, kind, payload=None, data=b''):
+        self.socket.write(encode_message(kind, payload, data))
+        self.socket.flush()
+
+    def interactive_rects(self):
+        rects = []
+        for child in self.widget.findChildren(QWidget):
+            if child.isVisible() and child.focusPolicy() != Qt.NoFocus:
+                rect = QRect(child.mapTo(self.widget, QPoint(0, 0)), child.size())
+                rects.append([rect.x(), rect.y(), rect.width(), rect.height()])
+        return rects
+
+    def send_frame(self):
+        image = self.widget.grab().toImage().convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        data = bytes(bits)
+        crc = zlib.crc32(data)
+        if crc == self.last_frame_crc:
+            return
+        self.last_frame_crc = crc
+        self.send('frame', {
+            'width': image.width(),
+            'height': image.height(),
+            'dpr': image.devicePixelRatio(),
+            'interactive': self.interactive_rects(),
+        }, data)
+
+    def on_ready_read(self):
+        for kind, payload, _ in self.reader.feed(bytes(self.socket.readAll())):
+            handler = getattr(self, f'on_{kind}', None)
+            if handler is None:
+                logging.warning(f"Onbekend bericht voor widget {self.widget_name}: {kind}")
+            else:
+                handler(payload)
+
+    def on_mouse(self, payload):
+        pos = QPoint(payload['x'], payload['y'])
+        event_type = MOUSE_EVENT_TYPES[payload['type']]
+        if event_type in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick) or self.mouse_target is None:
+            self.mouse_target = self.widget.childAt(pos) or self.widget
+        target = self.mouse_target
+        if event_type == QEvent.MouseButtonPress and target.focusPolicy() & Qt.ClickFocus:
+            target.setFocus(Qt.MouseFocusReason)
+
+        local = QPointF(target.mapFrom(self.widget, pos)) if target is not self.widget else QPointF(pos)
+        event = QMouseEvent(event_type, local, local, QPointF(self.widget.mapToGlobal(pos)),
+                            Qt.MouseButton(payload['button']), Qt.MouseButtons(payload['buttons']),
+                            Qt.KeyboardModifiers(payload['modifiers']))
+        QApplication.sendEvent(target, event)
+        if event_type == QEvent.MouseButtonRelease and not payload['buttons']:
+            self.mouse_target = None
+        self.send_frame()
+
+    def on_wheel(self, payload):
+        pos = QPoint(payload['x'], payload['y'])
+        target = self.widget.childAt(pos) or self.widget
+        local = QPointF(target.mapFrom(self.widget, pos)) if target is not self.widget else QPointF(pos)
+        event = QWheelEvent(local, QPointF(self.widget.mapToGlobal(pos)), QPoint(),
+                            QPoint(payload['dx'], payload['dy']), Qt.MouseButtons(payload['buttons']),
+                            Qt.KeyboardModifiers(payload['modifiers']), Qt.NoScrollPhase, False)
+        QApplication.sendEvent(target, event)
+        self.send_frame()
+
+    def on_key(self, payload):
+        target = self.widget.focusWidget() or self.widget
+        event = QKeyEvent(KEY_EVENT_TYPES[payload['type']], payload['key'],
+                          Qt.KeyboardModifiers(payload['modifiers']), payload['text'])
+        QApplication.sendEvent(target, event)
+        self.send_frame()
+
+    def on_geometry(self, payload):
+        self.widget.move(payload['x'], payload['y'])
+        self.widget.resize(payload['width'], payload['height'])
+        self.send_frame()
+
+    def on_settings(self, payload):
+        if hasattr(self.widget, 'openSettings'):
+            self.widget.openSettings()
+
+    def on_close(self, payload):
+        self.widget.close()
+        flush_widget_configs()
+        QApplication.instance().quit()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr,
+                        format='%(levelname)s - %(message)s')
+    server_name, widget_name, module_path = sys.argv[1:4]
+    app = QApplication(sys.argv[:1])
+    app.setQuitOnLastWindowClosed(False)
+    # Zonder parent: de app houdt de host in leven zolang de event loop draait
+    app.host = WidgetHost(server_name, widget_name, module_path)
+    app.aboutToQuit.connect(flush_widget_configs)
+    sys.exit(app.exec_())
+
+
+if __name__ == '__main__':
+    main()
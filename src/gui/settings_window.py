@@ -130,6 +130,12 @@ class SettingsWindow(QDialog):
 
         self.widget_list = QListWidget()
         self.populate_widget_list()
+
+        installer = self.overlay.widget_manager.installer
+        installer.installStarted.connect(self.on_install_started)
+        installer.installProgress.connect(self.on_install_progress)
+        installer.installFinished.connect(self.on_install_finished)
+        installer.installFailed.connect(self.on_install_failed)
         layout.addWidget(self.widget_list)
 
         tab.setLayout(layout)
@@ -137,8 +143,12 @@ class SettingsWindow(QDialog):
 
     def populate_widget_list(self):
         self.widget_list.clear()
+        self.active_checkboxes = {}
+        self.isolated_checkboxes = {}
+        self.status_labels = {}
         available_widgets = self.overlay.widget_manager.get_available_widgets()
         active_widgets = self.settings.get('active_widgets', [])
+        isolated_widgets = self.settings.get('isolated_widgets', [])
 
         for widget_name in available_widgets:
             item = QListWidgetItem()
@@ -152,6 +162,21 @@ class SettingsWindow(QDialog):
             label = QLabel(self.get_widget_display_name(widget_name))
             item_layout.addWidget(label)
 
+            status_label = QLabel()
+            status_label.setStyleSheet("color: #808080; font-size: 12px;")
+            if self.overlay.widget_manager.installer.is_pending(widget_name):
+                status_label.setText("Installing...")
+            item_layout.addWidget(status_label)
+
+            isolated_checkbox = QCheckBox("Isolated")
+            isolated_checkbox.setToolTip("Run this widget in its own process so it cannot freeze the overlay")
+            isolated_checkbox.setChecked(widget_name in isolated_widgets)
+            item_layout.addWidget(isolated_checkbox)
+
+            self.active_checkboxes[widget_name] = checkbox
+            self.isolated_checkboxes[widget_name] = isolated_checkbox
+            self.status_labels[widget_name] = status_label
+
             settings_button = QPushButton()
             settings_button.setIcon(self.style().standardIcon(QStyle.SP_FileDialogDetailedView))
             settings_button.clicked.connect(lambda _, wn=widget_name: self.open_widget_settings(wn))
@@ -169,7 +194,29 @@ class SettingsWindow(QDialog):
             'system_monitor_widget': 'System Monitor',
             'todo_widget': 'To-Do List'
         }
-        return display_names.get(widget_name, widget_name.replace('_', ' ').title())
+        if widget_name in display_names:
+            return display_names[widget_name]
+        return self.overlay.widget_manager.get_widget_display_name(widget_name)
+
+    def on_install_started(self, widget_name):
+        if widget_name in self.status_labels:
+            self.status_labels[widget_name].setStyleSheet("color: #808080; font-size: 12px;")
+            self.status_labels[widget_name].setText("Installing...")
+
+    def on_install_progress(self, widget_name, line):
+        if widget_name in self.status_labels:
+            self.status_labels[widget_name].setToolTip(line)
+
+    def on_install_finished(self, widget_name):
+        if widget_name in self.status_labels:
+            self.status_labels[widget_name].setText("")
+            self.status_labels[widget_name].setToolTip("")
+
+    def on_install_failed(self, widget_name, message):
+        if widget_name in self.status_labels:
+            self.status_labels[widget_name].setStyleSheet("color: #f44336; font-size: 12px;")
+            self.status_labels[widget_name].setText("Install failed")
+            self.status_labels[widget_name].setToolTip(message)
 
     def open_widget_settings(self, widget_name):
         if widget_name in self.overlay.widgets:
@@ -177,15 +224,16 @@ class SettingsWindow(QDialog):
 
     def save_settings(self):
         active_widgets = []
-        for i in range(self.widget_list.count()):
-            item = self.widget_list.item(i)
-            checkbox = self.widget_list.itemWidget(item).layout().itemAt(0).widget()
+        isolated_widgets = []
+        for widget_name, checkbox in self.active_checkboxes.items():
             if checkbox.isChecked():
-                widget_name = self.overlay.widget_manager.get_available_widgets()[i]
                 active_widgets.append(widget_name)
+            if self.isolated_checkboxes[widget_name].isChecked():
+                isolated_widgets.append(widget_name)
 
-        self.settings.set('active_widgets', active_widgets)
-        self.settings.save()
+        with self.settings.batch():
+            self.settings.set('active_widgets', active_widgets)
+            self.settings.set('isolated_widgets', isolated_widgets)
 
         self.overlay.load_active_widgets()
 
@@ -0,0 +1,99 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import importlib.util
+import logging
+import marshal
+import os
+import sys
+
+class BytecodeCache:
+    """Compiled widget code stored in the application data directory.
+
+    Entries are named after the interpreter's cache tag and keyed by the
+    source's content hash, so nothing is written next to the user's widget
+    files (which may be synced by OneDrive). A stale or corrupt entry is
+    dropped and the caller compiles from source again.
+    """
+
+    MAX_ENTRIES = 256
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def path_for(self, module_path, content_hash):
+        # Het pad hoort bij de sleutel: co_filename zit in de code-objecten
+        key = hashlib.sha256(f"{os.path.normcase(module_path)}\0{content_hash}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.{sys.implementation.cache_tag}.pyc")
+
+    def header(self, content_hash):
+        return importlib.util.MAGIC_NUMBER + bytes.fromhex(content_hash)
+
+    def load(self, module_path, content_hash):
+        cache_path = self.path_for(module_path, content_hash)
+        try:
+            with open(cache_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        header = self.header(content_hash)
+        try:
+            if not data.startswith(header):
+                raise ValueError("verouderde header")
+            code = marshal.loads(data[len(header):])
+        except (EOFError, ValueError, TypeError) as e:
+            logging.warning(f"Bytecode-cache voor {module_path} ongeldig ({str(e)}), bron wordt gebruikt")
+            self.discard(cache_path)
+            return None
+
+        try:
+            os.utime(cache_path)  # Houdt recent gebruikte entries bij het opruimen
+        except OSError:
+            pass
+        return code
+
+    def store(self, module_path, content_hash, code):
+        cache_path = self.path_for(module_path, content_hash)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(self.header(content_hash))
+                marshal.dump(code, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"Kon bytecode voor {module_path} niet cachen: {str(e)}")
+            self.discard(tmp_path)
+            return
+        self.trim()
+
+    def trim(self):
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.pyc')]
+        except OSError:
+            return
+        if len(entries) <= self.MAX_ENTRIES:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.MAX_ENTRIES]:
+            self.discard(entry.path)
+
+    def discard(self, cache_path):
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
@@ -0,0 +1,95 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QPoint, QPointF, QRectF
+from PyQt5.QtGui import QColor, QPainter, QPen, QPixmap, QPolygonF
+
+MAX_CACHED_PIXMAPS = 64
+DEFAULT_HANDLE_COLOR = QColor(200, 200, 200, 128)
+
+
+def color_key(color):
+    return QColor(color).rgba() if color is not None else None
+
+
+class ChromeRenderer:
+    """Pre-rendered widget decorations: resize handle, border and move handle.
+
+    Each decoration is painted once into a QPixmap at the device pixel
+    ratio of the screen and kept in a small LRU cache keyed by size,
+    colour and DPR, so identical widgets share their pixmaps and a repaint
+    is a single drawPixmap.
+    """
+
+    def __init__(self, max_entries=MAX_CACHED_PIXMAPS):
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+
+    def clear(self):
+        self.cache.clear()
+
+    def pixmap(self, key, width, height, dpr, paint):
+        pixmap = self.cache.get(key)
+        if pixmap is not None:
+            self.cache.move_to_end(key)
+            return pixmap
+        pixmap = QPixmap(math.ceil(width * dpr), math.ceil(height * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        paint(painter)
+        painter.end()
+        self.cache[key] = pixmap
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return pixmap
+
+    def chrome(self, width, height, dpr, handle_size=10, handle_color=DEFAULT_HANDLE_COLOR,
+               border_color=None, border_width=1):
+        """Return (origin, pixmap) with the decorations of a width x height widget.
+
+        Without a border only the resize handle is rendered, so that pixmap
+        does not depend on the widget size and is shared by all widgets.
+        """
+        def paint(painter):
+            if border_color is not None:
+                painter.setPen(QPen(QColor(border_color), border_width, Qt.SolidLine))
+                painter.setBrush(Qt.NoBrush)
+                painter.drawRect(QRectF(0, 0, width - 1, height - 1))
+            handle_origin = QPointF(width - handle_size, height - handle_size) if border_color is not None else QPointF()
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(handle_color))
+            painter.drawRect(QRectF(handle_origin.x(), handle_origin.y(), handle_size, handle_size))
+
+        if border_color is None:
+            key = ('handle', handle_size, color_key(handle_color), dpr)
+            origin = QPoint(width - handle_size, height - handle_size)
+            return origin, self.pixmap(key, handle_size, handle_size, dpr, paint)
+        key = ('chrome', width, height, handle_size, color_key(handle_color), color_key(border_color), border_width, dpr)
+        return QPoint(), self.pixmap(key, width, height, dpr, paint)
+
+    def move_handle(self, size, dpr, color=QColor(100, 100, 100)):
+        """Triangular move handle in the lower-left corner of a size x size square."""
+        def paint(painter):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawPolygon(QPolygonF([QPointF(0, size), QPointF(size, size), QPointF(0, 0)]))
+
+        return self.pixmap(('move_handle', size, color_key(color), dpr), size, size, dpr, paint)
+
+
+chrome_renderer = ChromeRenderer()
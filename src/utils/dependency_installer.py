@@ -0,0 +1,78 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import subprocess
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, pyqtSignal
+
+MAX_CONCURRENT_INSTALLS = 2
+
+class DependencyInstaller(QObject):
+    """Installs widget dependencies on worker threads.
+
+    Installs are queued and at most max_concurrent run at the same time.
+    The signals are emitted from the worker threads; Qt delivers them to
+    receivers in the GUI thread as queued connections.
+    """
+
+    installStarted = pyqtSignal(str)
+    installProgress = pyqtSignal(str, str)
+    installFinished = pyqtSignal(str)
+    installFailed = pyqtSignal(str, str)
+
+    def __init__(self, venv_manager, max_concurrent=MAX_CONCURRENT_INSTALLS, profiler=None, parent=None):
+        super().__init__(parent)
+        self.venv_manager = venv_manager
+        self.profiler = profiler
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix='pip')
+        self.pending = {}
+
+    def install(self, widget_name, dependencies):
+        if widget_name in self.pending:
+            return
+        logging.info(f"Afhankelijkheden voor {widget_name} worden op de achtergrond geïnstalleerd")
+        self.pending[widget_name] = self.executor.submit(self.run_install, widget_name, list(dependencies))
+
+    def is_pending(self, widget_name):
+        return widget_name in self.pending
+
+    def cancel(self, widget_name):
+        # Een lopende installatie loopt door; alleen wachtende worden geannuleerd
+        future = self.pending.get(widget_name)
+        if future is not None and future.cancel():
+            del self.pending[widget_name]
+
+    def run_install(self, widget_name, dependencies):
+        self.installStarted.emit(widget_name)
+        start = time.perf_counter()
+        try:
+            self.venv_manager.install_dependencies(
+                widget_name, dependencies, progress=lambda line: self.installProgress.emit(widget_name, line))
+        except Exception as e:
+            message = e.output if isinstance(e, subprocess.CalledProcessError) and e.output else str(e)
+            logging.error(f"Fout bij installeren van afhankelijkheden voor {widget_name}: {message}")
+            self.pending.pop(widget_name, None)
+            self.installFailed.emit(widget_name, message)
+            return
+        if self.profiler is not None:
+            self.profiler.record(widget_name, 'pip_install', (time.perf_counter() - start) * 1000)
+        self.pending.pop(widget_name, None)
+        self.installFinished.emit(widget_name)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pending.clear()
@@ -14,10 +14,38 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QDialog, QLabel, QSpinBox, QColorDialog, QPushButton, QHBoxLayout, QGroupBox
-from PyQt5.QtCore import Qt, QPoint, QSize, QEvent
-from PyQt5.QtGui import QCursor, QColor, QResizeEvent, QPainter, QPen, QBrush
+from PyQt5.QtCore import Qt, QPoint, QRect, QSize, QEvent, QTimer
+from PyQt5.QtGui import QCursor, QResizeEvent, QPainter
+from functools import wraps
+from src.utils.chrome_renderer import chrome_renderer
+from src.utils.widget_config import load_widget_config, save_widget_config
+
+DEFAULT_REFRESH_RATE = 60
+
+def deferred_during_interaction(save_config):
+    @wraps(save_config)
+    def wrapper(self):
+        if self.dragging or self.resizing:
+            # Wordt bij loslaten in één keer opgeslagen
+            return
+        save_config(self)
+    return wrapper
 
 class DraggableWidget(QWidget):
+    """Frameless widget that can be dragged and resized with the mouse.
+
+    Mouse moves only record the target geometry; it is applied at most once
+    per display frame. While dragging or resizing save_config() is deferred,
+    including calls from moveEvent/resizeEvent overrides and subclasses that
+    override save_config, and the geometry is committed to the config once
+    on release.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'save_config' in cls.__dict__:
+            cls.save_config = deferred_during_interaction(cls.__dict__['save_config'])
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
@@ -25,17 +53,53 @@ class DraggableWidget(QWidget):
         self.dragging = False
         self.resizing = False
         self.offset = QPoint()
+        self.press_global_pos = QPoint()
+        self.press_geometry = None
+        self.pending_pos = None
+        self.pending_size = None
+        self.geometry_timer = QTimer(self)
+        self.geometry_timer.setSingleShot(True)
+        self.geometry_timer.timeout.connect(self.apply_pending_geometry)
         self.resize_handle_size = 10  # Kleinere resize handle
+        self.chrome = None
+        self.snapper = None  # De ScreenOverlay: snap_widget, end_snap, local_position en place
         self.setMouseTracking(True)
         self.config = self.load_config()
 
+    def config_name(self):
+        # Sleutel in de gedeelde widgetconfiguratie; standaard de naam van de widgetmodule
+        return type(self).__module__
+
     def load_config(self):
-        # Deze methode moet worden overschreven door kindklassen
-        return {}
+        return load_widget_config(self.config_name())
 
+    @deferred_during_interaction
     def save_config(self):
-        # Deze methode moet worden overschreven door kindklassen
-        pass
+        save_widget_config(self.config_name(), self.config)
+
+    def frame_interval(self):
+        screen = self.screen()
+        refresh_rate = screen.refreshRate() if screen is not None else 0
+        return max(1, int(1000 / (refresh_rate if refresh_rate > 0 else DEFAULT_REFRESH_RATE)))
+
+    def schedule_geometry(self, pos=None, size=None):
+        if pos is not None:
+            self.pending_pos = pos
+        if size is not None:
+            self.pending_size = size
+        if not self.geometry_timer.isActive():
+            self.geometry_timer.start(self.frame_interval())
+
+    def apply_pending_geometry(self):
+        self.geometry_timer.stop()
+        if self.pending_size is not None:
+            self.resize(self.pending_size)
+            self.pending_size = None
+        if self.pending_pos is not None:
+            if self.dragging and self.snapper is not None:
+                self.pending_pos = self.snapper.snap_widget(self, QRect(self.pending_pos, self.size()))
+            self.move(self.pending_pos)
+            self.pending_pos = None
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -46,26 +110,30 @@ class DraggableWidget(QWidget):
                 self.dragging = True
                 self.setCursor(Qt.ClosedHandCursor)
             self.offset = event.pos()
+            self.press_global_pos = event.globalPos()
+            self.press_geometry = self.geometry()
 
     def mouseMoveEvent(self, event):
+        if not (self.resizing or self.dragging):
+            return
+        # Vanaf de geometrie bij het indrukken rekenen: de widget loopt tot een frame achter
+        delta = event.globalPos() - self.press_global_pos
         if self.resizing:
-            global_pos = event.globalPos()
-            top_left = self.mapToGlobal(QPoint(0, 0))
-            new_size = global_pos - top_left
-            self.resize(max(new_size.x(), self.minimumWidth()), 
-                        max(new_size.y(), self.minimumHeight()))
-            event.accept()
-        elif self.dragging:
-            new_pos = self.mapToParent(event.pos() - self.offset)
-            self.move(new_pos)
-            self.config['position'] = (new_pos.x(), new_pos.y())
-            self.save_config()
+            self.schedule_geometry(size=QSize(max(self.press_geometry.width() + delta.x(), self.minimumWidth()),
+                                              max(self.press_geometry.height() + delta.y(), self.minimumHeight())))
+        else:
+            self.schedule_geometry(pos=self.press_geometry.topLeft() + delta)
+        event.accept()
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton:
+            self.apply_pending_geometry()
+            if self.snapper is not None:
+                self.snapper.end_snap(self)
             self.dragging = False
             self.resizing = False
             self.setCursor(Qt.ArrowCursor)
+        self.config['position'] = self.screen_position()
         self.config['size'] = (self.width(), self.height())
         self.save_config()
 
@@ -79,17 +147,41 @@ class DraggableWidget(QWidget):
         return (self.width() - self.resize_handle_size <= pos.x() <= self.width() and
                 self.height() - self.resize_handle_size <= pos.y() <= self.height())
 
+    def screen_position(self):
+        """Position relative to the screen; differs from pos() when the overlay
+        makes the widget its own window."""
+        if self.snapper is not None:
+            return self.snapper.local_position(self)
+        return (self.x(), self.y())
+
+    def move_to_screen_position(self, x, y):
+        if self.snapper is not None:
+            self.snapper.place(self, QPoint(x, y))
+        else:
+            self.move(x, y)
+
+    def chrome_options(self):
+        """Decorations drawn on top of the widget; see ChromeRenderer.chrome()."""
+        return {'handle_size': self.resize_handle_size}
+
+    def invalidate_chrome(self):
+        self.chrome = None
+        self.update()
+
     def paintEvent(self, event):
         super().paintEvent(event)
+        # Opnieuw opvragen na een resize, een andere DPR of invalidate_chrome()
+        key = (self.width(), self.height(), self.devicePixelRatioF())
+        if self.chrome is None or self.chrome[0] != key:
+            self.chrome = (key, *chrome_renderer.chrome(*key, **self.chrome_options()))
+        _, origin, pixmap = self.chrome
         painter = QPainter(self)
-        
-        # Teken alleen de resize handle
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(QBrush(QColor(200, 200, 200, 128)))  # Semi-transparante grijze kleur
-        painter.drawRect(self.width() - self.resize_handle_size, 
-                         self.height() - self.resize_handle_size,
-                         self.resize_handle_size,
-                         self.resize_handle_size)
+        painter.drawPixmap(origin, pixmap)
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() in (QEvent.StyleChange, QEvent.PaletteChange):
+            self.invalidate_chrome()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -100,7 +192,7 @@ class DraggableWidget(QWidget):
         self.config.update(new_config)
         self.save_config()
         if 'color' in new_config:
-            self.update()
+            self.invalidate_chrome()
 
     def openSettings(self):
         dialog = WidgetSettingsDialog(self)
@@ -0,0 +1,109 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import weakref
+from collections import OrderedDict
+from PyQt5.QtGui import QFont, QFontMetrics
+
+MAX_CACHED_FONTS = 256
+REFERENCE_PIXEL_SIZE = 100
+MIN_PIXEL_SIZE = 6
+
+
+def quantise(pixel_size):
+    """Round down to a size bucket: exact below 16 px, then steps of about 6-12%."""
+    if pixel_size < 16:
+        return max(pixel_size, MIN_PIXEL_SIZE)
+    step = 1 << (pixel_size.bit_length() - 4)
+    return pixel_size - pixel_size % step
+
+
+class LRUCache(OrderedDict):
+    def __init__(self, max_entries):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def lookup(self, key, build):
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        value = self[key] = build()
+        if len(self) > self.max_entries:
+            self.popitem(last=False)
+        return value
+
+
+class FontFitter:
+    """Finds the largest font for which a text template fits a rectangle.
+
+    Sizes are quantised into buckets, so while a widget is being resized
+    the fitted font (and with it the label's layout) only changes when
+    the bucket does. Fonts, their QFontMetrics and fit results are kept
+    in LRU caches.
+    """
+
+    def __init__(self, max_entries=MAX_CACHED_FONTS):
+        self.fonts = LRUCache(max_entries)
+        self.metrics = LRUCache(max_entries)
+        self.results = LRUCache(max_entries)
+        self.applied = weakref.WeakKeyDictionary()
+
+    def sized(self, font, pixel_size):
+        def build():
+            sized_font = QFont(font)
+            sized_font.setPixelSize(pixel_size)
+            return sized_font
+        return self.fonts.lookup((font.key(), pixel_size), build)
+
+    def font_metrics(self, font):
+        return self.metrics.lookup(font.key(), lambda: QFontMetrics(font))
+
+    def text_size(self, font, lines):
+        metrics = self.font_metrics(font)
+        return max(metrics.horizontalAdvance(line) for line in lines), metrics.height() * len(lines)
+
+    def fit(self, font, template, width, height, max_pixel_size=None):
+        """The largest bucketed size of font (at most max_pixel_size) that fits template in width x height."""
+        key = (font.key(), template, width, height, max_pixel_size)
+        return self.results.lookup(key, lambda: self.compute_fit(font, template, width, height, max_pixel_size))
+
+    def compute_fit(self, font, template, width, height, max_pixel_size):
+        lines = template.split('\n') or ['']
+        text_width, text_height = self.text_size(self.sized(font, REFERENCE_PIXEL_SIZE), lines)
+        # Tekstmaten schalen bijna lineair met de pixelgrootte; daarna alleen nog corrigeren
+        scale = min(width / max(text_width, 1), height / max(text_height, 1))
+        pixel_size = int(REFERENCE_PIXEL_SIZE * scale)
+        if max_pixel_size is not None:
+            pixel_size = min(pixel_size, int(max_pixel_size))
+        pixel_size = quantise(max(pixel_size, MIN_PIXEL_SIZE))
+        while pixel_size > MIN_PIXEL_SIZE:
+            text_width, text_height = self.text_size(self.sized(font, pixel_size), lines)
+            if text_width <= width and text_height <= height:
+                break
+            pixel_size = quantise(pixel_size - 1)
+        return self.sized(font, pixel_size)
+
+    def apply(self, widget, font):
+        """setFont only when the bucket changed since the last apply, avoiding a relayout."""
+        # widget.font() is de opgeloste font en daardoor niet vergelijkbaar; onthoud wat gezet is
+        key = font.key()
+        if self.applied.get(widget) == key:
+            return False
+        widget.setFont(font)
+        self.applied[widget] = key
+        return True
+
+
+font_fitter = FontFitter()
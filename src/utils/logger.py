@@ -15,15 +15,15 @@
 
 import logging
 import os
+from src.config import LOG_DIR
 
 def setup_logger():
     logger = logging.getLogger('DesktopCustomizer')
     logger.setLevel(logging.DEBUG)
 
     # Creëer logs directory in AppData
-    log_dir = os.path.join(os.getenv('APPDATA'), 'Imolia Desktop Customizer', 'logs')
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, 'app.log')
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_file = os.path.join(LOG_DIR, 'app.log')
 
     try:
         # File handler
@@ -15,30 +15,202 @@
 
 import json
 import os
+import time
+import threading
+import logging
+from contextlib import contextmanager
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+
+def write_json_atomic(filename, data, indent=None):
+    # Eerst naar een tijdelijk bestand en fsync: een crash laat nooit een half bestand achter
+    tmp_filename = f"{filename}.tmp"
+    try:
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+
+@contextmanager
+def file_lock(filename):
+    """Exclusive lock on filename across processes, held through <filename>.lock."""
+    with open(f"{filename}.lock", 'a+b') as f:
+        if msvcrt is not None:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK geeft het na tien seconden op; een ander proces schrijft nog
+                    logging.debug(f"Wachten op vergrendeling van {filename}")
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
 
 class Settings:
-    def __init__(self, filename='settings.json'):
+    """Application settings in a JSON file.
+
+    set() only marks the settings dirty; the file is written once the
+    changes have been quiet for flush_delay seconds, on flush() or on
+    save(). Use batch() to group several changes into one write. The
+    delayed write runs on one flush thread per Settings; a change only
+    moves its deadline.
+
+    With a backend (see sqlite_store) the settings live there instead and
+    a write only stores the changed keys; the JSON file is imported once
+    when the backend is still empty.
+    """
+
+    DEFAULTS = {
+        'overlay_geometry': (100, 100, 300, 200)
+    }
+    INDENT = 4
+
+    def __init__(self, filename='settings.json', flush_delay=1.0, backend=None):
         self.filename = filename
+        self.flush_delay = flush_delay
+        self.backend = backend
         self.settings = {}
+        self.dirty = False
+        self.dirty_keys = set()
+        self.batch_depth = 0
+        self.flush_deadline = None
+        self.flush_thread = None
+        self.lock = threading.RLock()
+        self.flush_wakeup = threading.Condition(self.lock)
         self.load()
 
     def load(self):
+        if self.backend is not None:
+            self.load_from_backend()
+            return
         if os.path.exists(self.filename):
-            with open(self.filename, 'r') as f:
-                self.settings = json.load(f)
-        else:
-            self.settings = {
-                'overlay_geometry': (100, 100, 300, 200)
-            }
+            try:
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    self.settings = json.load(f)
+                return
+            except ValueError as e:
+                logging.error(f"Instellingen in {self.filename} onleesbaar, standaardwaarden worden gebruikt: {str(e)}")
+                # Het onleesbare bestand bewaren in plaats van het te overschrijven
+                try:
+                    os.replace(self.filename, f"{self.filename}.corrupt")
+                except OSError as e:
+                    logging.error(f"Kon {self.filename} niet veiligstellen, het bestand blijft ongewijzigd: {str(e)}")
+                    self.settings = dict(self.DEFAULTS)
+                    return
+                logging.warning(f"Onleesbare instellingen bewaard als {self.filename}.corrupt")
+        self.settings = dict(self.DEFAULTS)
+        self.save()
+
+    def load_from_backend(self):
+        data = self.backend.load()
+        if data is None and os.path.exists(self.filename):
+            try:
+                self.backend.import_json(self.filename)
+                data = self.backend.load()
+            except (OSError, ValueError) as e:
+                logging.error(f"Kon {self.filename} niet importeren: {str(e)}")
+        if data is None:
+            self.settings = dict(self.DEFAULTS)
             self.save()
+        else:
+            self.settings = data
 
     def save(self):
-        with open(self.filename, 'w') as f:
-            json.dump(self.settings, f, indent=4)
+        with self.lock:
+            self.cancel_flush()
+            if self.backend is not None:
+                # Alleen gewijzigde sleutels; een expliciete save() zonder wijzigingen schrijft alles
+                keys = self.dirty_keys or self.settings.keys()
+                self.backend.write({key: self.settings[key] for key in keys})
+            else:
+                write_json_atomic(self.filename, self.settings, indent=self.INDENT)
+            self.dirty_keys.clear()
+            self.dirty = False
+
+    def flush(self):
+        with self.lock:
+            if self.dirty:
+                self.save()
 
     def get(self, key, default=None):
         return self.settings.get(key, default)
 
     def set(self, key, value):
-        self.settings[key] = value
-        self.save()
\ No newline at end of file
+        with self.lock:
+            if key in self.settings and self.settings[key] == value:
+                return
+            self.settings[key] = value
+            self.dirty = True
+            self.dirty_keys.add(key)
+            if not self.batch_depth:
+                self.schedule_flush()
+
+    @contextmanager
+    def batch(self):
+        with self.lock:
+            self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                if not self.batch_depth and self.dirty:
+                    self.schedule_flush()
+
+    def schedule_flush(self):
+        # Elke wijziging schuift het schrijven op (debounce); geen nieuwe thread per set()
+        with self.lock:
+            idle = self.flush_deadline is None
+            self.flush_deadline = time.monotonic() + self.flush_delay
+            if self.flush_thread is None:
+                self.flush_thread = threading.Thread(target=self.run_flush_thread, name='settings-flush',
+                                                     daemon=True)
+                self.flush_thread.start()
+            elif idle:
+                self.flush_wakeup.notify()
+
+    def cancel_flush(self):
+        with self.lock:
+            self.flush_deadline = None
+
+    def run_flush_thread(self):
+        with self.lock:
+            while True:
+                if self.flush_deadline is None:
+                    self.flush_wakeup.wait()
+                    continue
+                # Een latere deadline betekent gewoon nog een keer wachten
+                remaining = self.flush_deadline - time.monotonic()
+                if remaining > 0:
+                    self.flush_wakeup.wait(remaining)
+                    continue
+                self.flush_deadline = None
+                self.on_flush_timer()
+
+    def on_flush_timer(self):
+        try:
+            self.flush()
+        except (OSError, TypeError, ValueError) as e:
+            # TypeError/ValueError: een waarde die niet als JSON kan worden opgeslagen
+            logging.error(f"Fout bij opslaan van instellingen: {str(e)}")
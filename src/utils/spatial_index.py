@@ -0,0 +1,163 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import defaultdict
+
+DEFAULT_CELL_SIZE = 128
+SNAP_DISTANCE = 8
+DEFAULT_MARGIN = 10
+
+
+def intersects(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def snap_offset(start, length, spans, threshold):
+    """Smallest shift within threshold that lines up start/end or the centre
+    of a span with the same features of one of spans (start, length)."""
+    end, centre = start + length, start + length // 2
+    best = threshold + 1
+    for other_start, other_length in spans:
+        other_end = other_start + other_length
+        # Randen op elkaar of tegen elkaar aan; midden alleen op midden
+        for offset in (other_start - start, other_start - end, other_end - start, other_end - end,
+                       other_start + other_length // 2 - centre):
+            if abs(offset) < abs(best):
+                best = offset
+    return best if abs(best) <= threshold else 0
+
+
+def aligned_positions(start, length, other_start, other_length):
+    edges = {start, start + length}
+    found = {position for position in (other_start, other_start + other_length) if position in edges}
+    if other_start + other_length // 2 == start + length // 2:
+        found.add(start + length // 2)
+    return sorted(found)
+
+
+class SpatialIndex:
+    """Uniform grid hash of widget rectangles, (x, y, width, height) tuples by key.
+
+    A rectangle is registered in every cell it covers, so a query only
+    looks at the widgets in the cells of the queried area instead of at
+    every widget.
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.rects = {}
+        self.cells = defaultdict(set)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def rect(self, key):
+        return self.rects.get(key)
+
+    def cells_for(self, rect):
+        x, y, width, height = rect
+        size = self.cell_size
+        for cell_x in range(x // size, (x + max(width, 1) - 1) // size + 1):
+            for cell_y in range(y // size, (y + max(height, 1) - 1) // size + 1):
+                yield cell_x, cell_y
+
+    def insert(self, key, rect):
+        rect = tuple(int(value) for value in rect)
+        if self.rects.get(key) == rect:
+            return
+        self.remove(key)
+        self.rects[key] = rect
+        for cell in self.cells_for(rect):
+            self.cells[cell].add(key)
+
+    def remove(self, key):
+        rect = self.rects.pop(key, None)
+        if rect is None:
+            return
+        for cell in self.cells_for(rect):
+            keys = self.cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self.cells[cell]
+
+    def query(self, rect, exclude=None):
+        """Keys whose rectangles overlap rect (touching edges do not count)."""
+        found = set()
+        for cell in self.cells_for(rect):
+            found.update(self.cells.get(cell, ()))
+        found.discard(exclude)
+        return [key for key in found if intersects(self.rects[key], rect)]
+
+    def snap(self, rect, threshold=SNAP_DISTANCE, bounds=None, exclude=None):
+        """Snap rect to the edges and centres of nearby rectangles and of bounds.
+
+        Returns (x, y, guides); guides are ('vertical', x, top, bottom) and
+        ('horizontal', y, left, right) lines along the edges that line up.
+        Alignment is searched in a band around rect that spans bounds, so
+        widgets far away on the same row or column are found as well.
+        """
+        x, y, width, height = rect
+        if bounds is not None:
+            column = (x - threshold, bounds[1], width + 2 * threshold, bounds[3])
+            row = (bounds[0], y - threshold, bounds[2], height + 2 * threshold)
+        else:
+            column = row = (x - threshold, y - threshold, width + 2 * threshold, height + 2 * threshold)
+        column_rects = [self.rects[key] for key in self.query(column, exclude)]
+        row_rects = [self.rects[key] for key in self.query(row, exclude)]
+        if bounds is not None:
+            column_rects.append(bounds)
+            row_rects.append(bounds)
+
+        dx = snap_offset(x, width, [(other[0], other[2]) for other in column_rects], threshold)
+        dy = snap_offset(y, height, [(other[1], other[3]) for other in row_rects], threshold)
+        x, y = x + dx, y + dy
+
+        guides = []
+        for other in column_rects:
+            if other is not bounds:
+                for position in aligned_positions(x, width, other[0], other[2]):
+                    guides.append(('vertical', position, min(y, other[1]), max(y + height, other[1] + other[3])))
+        for other in row_rects:
+            if other is not bounds:
+                for position in aligned_positions(y, height, other[1], other[3]):
+                    guides.append(('horizontal', position, min(x, other[0]), max(x + width, other[0] + other[2])))
+        return x, y, guides
+
+    def find_free_slot(self, width, height, bounds, margin=DEFAULT_MARGIN):
+        """Top-left of the first spot, scanning rows top to bottom, where a
+        width x height rectangle keeps margin from every other rectangle;
+        None when bounds are full."""
+        left, top, bounds_width, bounds_height = bounds
+        right, bottom = left + bounds_width - margin, top + bounds_height - margin
+        rows = sorted({top + margin} | {rect[1] + rect[3] + margin for rect in self.rects.values()
+                                        if rect[1] + rect[3] + margin > top + margin})
+        for y in rows:
+            if y + height > bottom:
+                break
+            # Per rij één query; daarna de bezette stukken van links naar rechts aflopen
+            band = (left, y - margin, bounds_width, height + 2 * margin)
+            blocked = sorted((self.rects[key][0] - margin, self.rects[key][0] + self.rects[key][2] + margin)
+                             for key in self.query(band))
+            x = left + margin
+            for start, end in blocked:
+                if start - x >= width:
+                    break
+                x = max(x, end)
+            if x + width <= right:
+                return x, y
+        return None
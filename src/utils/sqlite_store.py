@@ -0,0 +1,140 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""SQLite backend for Settings and the widget config store.
+
+Every store keeps its keys under its own namespace in one key/value table.
+The database runs in WAL mode, so a flush only upserts the changed keys in
+a single transaction and readers in other processes are never blocked.
+Enable it with IMOLIA_SETTINGS_BACKEND=sqlite; existing JSON files are
+imported on first use. Import and export by hand:
+
+    python -m src.utils.sqlite_store export <namespace> <file.json>
+    python -m src.utils.sqlite_store import <namespace> <file.json>
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import logging
+from src.config import SETTINGS_BACKEND, SETTINGS_DB_PATH
+from src.utils.settings import write_json_atomic
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+UPSERT = ("INSERT INTO kv (namespace, key, value) VALUES (?, ?, ?) "
+          "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value")
+
+
+class SqliteBackend:
+    """One namespace of the key/value table; values are stored as JSON."""
+
+    def __init__(self, path=SETTINGS_DB_PATH, namespace='settings'):
+        self.path = path
+        self.namespace = namespace
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Settings schrijft ook vanuit de flush-timer; de lock houdt de verbinding serieel
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(SCHEMA)
+
+    def load(self):
+        """Return all keys of the namespace, or None when it holds nothing yet."""
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT key, value FROM kv WHERE namespace = ?', (self.namespace,)).fetchall()
+        if not rows:
+            return None
+        return {key: json.loads(value) for key, value in rows}
+
+    def write(self, items):
+        """Upsert the given {key: value} pairs in one transaction."""
+        rows = [(self.namespace, key, json.dumps(value)) for key, value in items.items()]
+        if not rows:
+            return
+        with self.lock:
+            self.connection.execute('BEGIN IMMEDIATE')
+            try:
+                self.connection.executemany(UPSERT, rows)
+            except BaseException:
+                self.connection.execute('ROLLBACK')
+                raise
+            self.connection.execute('COMMIT')
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute('DELETE FROM kv WHERE namespace = ?', (self.namespace,))
+
+    def import_json(self, filename):
+        """Copy the keys of a JSON settings file into the namespace; returns the number of keys."""
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{filename} bevat geen JSON-object")
+        self.write(data)
+        logging.info(f"{len(data)} sleutels uit {filename} geïmporteerd in {self.namespace}")
+        return len(data)
+
+    def export_json(self, filename, indent=4):
+        data = self.load() or {}
+        write_json_atomic(filename, data, indent=indent)
+        return len(data)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def open_backend(namespace, path=SETTINGS_DB_PATH):
+    """The configured backend for a store, or None for the JSON file."""
+    if SETTINGS_BACKEND != 'sqlite':
+        return None
+    try:
+        return SqliteBackend(path, namespace)
+    except sqlite3.Error as e:
+        logging.error(f"SQLite-opslag niet beschikbaar, JSON wordt gebruikt: {str(e)}")
+        return None
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    if len(sys.argv) != 4 or sys.argv[1] not in ('import', 'export'):
+        print(__doc__)
+        sys.exit(2)
+    command, namespace, filename = sys.argv[1:]
+    backend = SqliteBackend(SETTINGS_DB_PATH, namespace)
+    try:
+        if command == 'import':
+            backend.import_json(filename)
+        else:
+            count = backend.export_json(filename)
+            logging.info(f"{count} sleutels uit {namespace} geëxporteerd naar {filename}")
+    finally:
+        backend.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from functools import lru_cache
+from PyQt5.QtGui import QColor, QPalette
+
+MAX_CACHED_THEMES = 128
+
+
+@lru_cache(maxsize=256)
+def lighten_color(color, amount=20):
+    h, s, l, _ = QColor(color).getHsl()
+    return QColor.fromHsl(h, s, min(l + amount, 255), 255).name()
+
+
+class ThemeEngine:
+    """Compiles widget themes once and shares them between widgets.
+
+    A stylesheet theme is a str.format template plus its parameters; a
+    palette theme maps QPalette role names to colours. Every distinct
+    combination is compiled once and widgets get the same string or
+    QPalette. Applying the theme a widget already has is a no-op, so an
+    updateConfig() that only moved the widget does not make Qt re-polish
+    the whole widget tree.
+    """
+
+    def __init__(self, max_entries=MAX_CACHED_THEMES):
+        self.max_entries = max_entries
+        self.stylesheets = OrderedDict()
+        self.palettes = OrderedDict()
+
+    def clear(self):
+        self.stylesheets.clear()
+        self.palettes.clear()
+
+    def cached(self, cache, key, build):
+        value = cache.get(key)
+        if value is None:
+            value = cache[key] = build()
+            if len(cache) > self.max_entries:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
+
+    def stylesheet(self, template, **params):
+        key = (template, tuple(sorted(params.items())))
+        return self.cached(self.stylesheets, key, lambda: template.format(**params))
+
+    def palette(self, **colors):
+        def build():
+            palette = QPalette()
+            for role, color in colors.items():
+                palette.setColor(getattr(QPalette, role), QColor(color))
+            return palette
+        return self.cached(self.palettes, tuple(sorted(colors.items())), build)
+
+    def apply_stylesheet(self, widget, template, **params):
+        """Set the compiled stylesheet on widget; returns False when it already had it."""
+        stylesheet = self.stylesheet(template, **params)
+        if widget.styleSheet() == stylesheet:
+            return False
+        widget.setStyleSheet(stylesheet)
+        return True
+
+    def apply_palette(self, widget, **colors):
+        # Qt slaat setPalette zelf over als het palet niet verandert
+        widget.setPalette(self.palette(**colors))
+
+
+theme_engine = ThemeEngine()
@@ -13,41 +13,316 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import glob
+import hashlib
+import importlib.metadata
+import json
 import os
+import shutil
 import subprocess
 import sys
+import threading
+import time
 import venv
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.venv_worker import VenvWorker
+from src.utils.wheelhouse import has_wheels_for, offline_install_args, wheel_args
+from src.utils.widget_header import Requirement, parse_requirements
+
+try:
+    from packaging.utils import canonicalize_name
+except ImportError:
+    canonicalize_name = None
+
+REGISTRY_FILENAME = 'venvs.json'
+LOCK_FILENAME = 'imolia-lock.json'
+
+
+def normalise_requirement(requirement):
+    name = canonicalize_name(requirement.name)
+    extras = f"[{','.join(sorted(requirement.extras))}]" if requirement.extras else ''
+    version = f" @ {requirement.url}" if requirement.url else str(requirement.specifier)
+    marker = f"; {requirement.marker}" if requirement.marker else ''
+    return f"{name}{extras}{version}{marker}"
+
+
+def normalise_requirements(dependencies):
+    if Requirement is None or canonicalize_name is None:
+        return sorted({dep.strip().lower() for dep in dependencies if dep.strip()})
+    return sorted({normalise_requirement(req) for req in parse_requirements(dependencies)})
+
+
+def requirements_key(dependencies):
+    """Content address of a requirement set: same requirements, same venv."""
+    normalised = '\n'.join(normalise_requirements(dependencies))
+    return hashlib.sha256(normalised.encode('utf-8')).hexdigest()[:16]
+
+
+def venv_bin_dir(venv_path):
+    return os.path.join(venv_path, 'Scripts' if sys.platform == 'win32' else 'bin')
+
+
+def site_packages_dirs(venv_path):
+    if sys.platform == 'win32':
+        return [os.path.join(venv_path, 'Lib', 'site-packages')]
+    return sorted(glob.glob(os.path.join(venv_path, 'lib', 'python*', 'site-packages')))
+
+
+def installed_distributions(venv_path):
+    distributions = {}
+    for dist in importlib.metadata.distributions(path=site_packages_dirs(venv_path)):
+        name = dist.metadata['Name']
+        if name:
+            distributions.setdefault(canonicalize_name(name), dist)
+    return distributions
+
+
+def is_satisfied(requirement, distributions, extra=None):
+    if requirement.marker and not requirement.marker.evaluate({'extra': extra or ''}):
+        return True
+    dist = distributions.get(canonicalize_name(requirement.name))
+    if dist is None:
+        return False
+    if requirement.specifier and not requirement.specifier.contains(dist.version, prereleases=True):
+        return False
+    # De afhankelijkheden van gevraagde extras moeten er ook zijn
+    for extra_name in requirement.extras:
+        for line in dist.requires or []:
+            extra_requirement = parse_requirements([line])
+            if extra_requirement and extra_requirement[0].marker and \
+                    not is_satisfied(extra_requirement[0], distributions, extra_name):
+                return False
+    return True
+
+
+def missing_requirements(venv_path, dependencies):
+    """Return the dependencies that are not installed in the venv (all of them without packaging)."""
+    if Requirement is None or canonicalize_name is None:
+        return list(dependencies)
+    distributions = installed_distributions(venv_path)
+    return [str(requirement) for requirement in parse_requirements(dependencies)
+            if not is_satisfied(requirement, distributions)]
+
 
 class VenvManager:
-    def __init__(self, base_dir):
+    """Shared virtual environments, one per distinct requirement set.
+
+    Widgets are mapped to the venv of their (normalised) requirements, so
+    widgets that pin the same packages share one environment. A venv's
+    reference count is the number of widgets mapped to it; unreferenced
+    venvs are kept for reuse up to max_unused and then removed, least
+    recently used first. Removing happens on a background thread; a venv
+    that is taken into use again before its turn is kept.
+    """
+
+    def __init__(self, base_dir, max_unused=2, wheelhouse_dir=None):
         self.base_dir = base_dir
+        self.wheelhouse_dir = wheelhouse_dir
+        self.venvs_dir = os.path.join(base_dir, 'venvs')
+        self.registry_path = os.path.join(self.venvs_dir, REGISTRY_FILENAME)
+        self.max_unused = max_unused
         self.venv_path = None
+        self.lock = threading.RLock()
+        self.install_locks = {}
+        self.workers = {}
+        self.remover = ThreadPoolExecutor(max_workers=1, thread_name_prefix='venv-gc')
+        self.venvs = {}
+        self.widgets = {}
+        self.load_registry()
 
-    def create_widget_venv(self, widget_name):
-        self.venv_path = os.path.join(self.base_dir, f'{widget_name}_venv')
-        if not os.path.exists(self.venv_path):
-            venv.create(self.venv_path, with_pip=True)
-        return self.venv_path
+    def load_registry(self):
+        if not os.path.exists(self.registry_path):
+            return
+        try:
+            with open(self.registry_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.venvs = data.get('venvs', {})
+            self.widgets = data.get('widgets', {})
+        except (OSError, ValueError) as e:
+            logging.warning(f"Venv-register onleesbaar, wordt opnieuw opgebouwd: {str(e)}")
 
-    def install_dependencies(self, widget_name, dependencies):
-        venv_path = self.create_widget_venv(widget_name)
-        pip_path = os.path.join(venv_path, 'Scripts', 'pip.exe')
-        for dep in dependencies:
-            subprocess.run([pip_path, 'install', dep], check=True)
+    def save_registry(self):
+        os.makedirs(self.venvs_dir, exist_ok=True)
+        tmp_path = f"{self.registry_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'venvs': self.venvs, 'widgets': self.widgets}, f, indent=4)
+            os.replace(tmp_path, self.registry_path)
+        except OSError as e:
+            logging.warning(f"Kon venv-register niet opslaan: {str(e)}")
+
+    def venv_path_for(self, key):
+        return os.path.join(self.venvs_dir, key)
+
+    def reference_count(self, key):
+        return sum(1 for widget_key in self.widgets.values() if widget_key == key)
+
+    def key_lock(self, key):
+        with self.lock:
+            return self.install_locks.setdefault(key, threading.Lock())
+
+    def create_widget_venv(self, widget_name, dependencies=()):
+        key = requirements_key(dependencies)
+        venv_path = self.venv_path_for(key)
+        # Aanmaken kan seconden duren: alleen andere installaties in dezelfde venv wachten
+        # Registreren onder dezelfde lock, zodat remove_venv nooit een net gebruikte venv weggooit
+        with self.key_lock(key):
+            if not os.path.exists(venv_path):
+                logging.info(f"Nieuwe venv {key} voor {widget_name}: {normalise_requirements(dependencies)}")
+                venv.create(venv_path, with_pip=True)
+            with self.lock:
+                entry = self.venvs.setdefault(key, {'requirements': normalise_requirements(dependencies)})
+                entry['last_used'] = time.time()
+                self.widgets[widget_name] = key
+                self.venv_path = venv_path
+                self.collect_garbage()
+                self.save_registry()
+                return venv_path
+
+    def release_widget(self, widget_name):
+        with self.lock:
+            key = self.widgets.pop(widget_name, None)
+            if key is not None:
+                # Net nog in gebruik: als laatste aan de beurt bij het opruimen
+                if key in self.venvs:
+                    self.venvs[key]['last_used'] = time.time()
+                self.collect_garbage()
+                self.save_registry()
 
-    def get_python_executable(self):
-        if self.venv_path is None:
+    def prune(self, widget_names):
+        # Widgets die niet meer bestaan houden hun venv niet langer in leven
+        with self.lock:
+            stale = set(self.widgets) - set(widget_names)
+            for widget_name in stale:
+                del self.widgets[widget_name]
+            if stale:
+                self.collect_garbage()
+                self.save_registry()
+
+    def collect_garbage(self):
+        # Alleen kiezen wat weg mag; rmtree van een venv duurt seconden en hoort niet op de GUI-thread
+        with self.lock:
+            unused = sorted((key for key in self.venvs if self.reference_count(key) == 0),
+                            key=lambda key: self.venvs[key].get('last_used', 0), reverse=True)
+            for key in unused[self.max_unused:]:
+                self.remover.submit(self.remove_venv, key, self.venvs.pop(key))
+
+    def remove_venv(self, key, entry):
+        venv_path = self.venv_path_for(key)
+        with self.key_lock(key):
+            with self.lock:
+                if key in self.venvs:
+                    return
+            try:
+                self.stop_worker(venv_path)
+                if os.path.exists(venv_path):
+                    shutil.rmtree(venv_path)
+                logging.info(f"Ongebruikte venv {key} verwijderd")
+            except OSError as e:
+                logging.warning(f"Kon ongebruikte venv {key} niet verwijderen: {str(e)}")
+                # Blijft geregistreerd, een volgende opruiming probeert het opnieuw
+                with self.lock:
+                    self.venvs.setdefault(key, entry)
+                    self.save_registry()
+
+    def site_packages_mtime(self, venv_path):
+        return [os.stat(path).st_mtime_ns for path in site_packages_dirs(venv_path)]
+
+    def is_locked(self, venv_path, dependencies):
+        # Snelle route: niets aan de venv veranderd sinds de laatste geslaagde controle
+        try:
+            with open(os.path.join(venv_path, LOCK_FILENAME), 'r', encoding='utf-8') as f:
+                lock = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (lock.get('requirements') == normalise_requirements(dependencies) and
+                lock.get('site_packages_mtime') == self.site_packages_mtime(venv_path))
+
+    def write_lock(self, venv_path, dependencies):
+        # Geen stille fout: zonder lock-bestand is de venv nooit 'ready' en start elke activatie pip opnieuw
+        with open(os.path.join(venv_path, LOCK_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump({'requirements': normalise_requirements(dependencies),
+                       'site_packages_mtime': self.site_packages_mtime(venv_path)}, f, indent=4)
+
+    def is_ready(self, dependencies):
+        """True when the venv for these dependencies exists and needs no pip run."""
+        venv_path = self.venv_path_for(requirements_key(dependencies))
+        return os.path.exists(venv_path) and self.is_locked(venv_path, dependencies)
+
+    def run_pip(self, widget_name, args, progress=None):
+        command = [self.get_python_executable(widget_name), '-m', 'pip', *args]
+        creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                   encoding='utf-8', errors='replace', creationflags=creationflags)
+        output = []
+        for line in process.stdout:
+            line = line.rstrip()
+            output.append(line)
+            if progress and line:
+                progress(line)
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, command, output='\n'.join(output[-20:]))
+
+    def install_missing(self, widget_name, missing, progress=None):
+        if self.wheelhouse_dir is None:
+            self.run_pip(widget_name, ['install', *missing], progress)
+            return
+        os.makedirs(self.wheelhouse_dir, exist_ok=True)
+        if has_wheels_for(self.wheelhouse_dir, missing):
+            try:
+                self.run_pip(widget_name, offline_install_args(self.wheelhouse_dir, missing), progress)
+                return
+            except subprocess.CalledProcessError:
+                logging.info(f"Wheelhouse onvolledig voor {widget_name}, ontbrekende wheels worden gedownload")
+        # Wat gedownload wordt komt eerst in de wheelhouse, zodat een volgende venv offline kan
+        self.run_pip(widget_name, wheel_args(self.wheelhouse_dir, missing), progress)
+        self.run_pip(widget_name, offline_install_args(self.wheelhouse_dir, missing), progress)
+
+    def install_dependencies(self, widget_name, dependencies, progress=None):
+        venv_path = self.create_widget_venv(widget_name, dependencies)
+        with self.key_lock(requirements_key(dependencies)):
+            if self.is_locked(venv_path, dependencies):
+                return
+            missing = missing_requirements(venv_path, dependencies)
+            if missing:
+                logging.info(f"Installeren voor {widget_name}: {missing}")
+                self.install_missing(widget_name, missing, progress)
+            self.write_lock(venv_path, dependencies)
+
+    def get_python_executable(self, widget_name=None):
+        venv_path = self.venv_path
+        if widget_name is not None and widget_name in self.widgets:
+            venv_path = self.venv_path_for(self.widgets[widget_name])
+        if venv_path is None:
             raise ValueError("Virtual environment path is not set. Call create_widget_venv first.")
-        return os.path.join(self.venv_path, 'Scripts' if sys.platform == 'win32' else 'bin', 'python')
+        return os.path.join(venv_bin_dir(venv_path), 'python')
+
+    def get_worker(self, widget_name=None):
+        python_executable = self.get_python_executable(widget_name)
+        with self.lock:
+            if python_executable not in self.workers:
+                self.workers[python_executable] = VenvWorker(python_executable)
+            return self.workers[python_executable]
+
+    def stop_worker(self, venv_path):
+        with self.lock:
+            worker = self.workers.pop(os.path.join(venv_bin_dir(venv_path), 'python'), None)
+        if worker is not None:
+            worker.stop()
+
+    def shutdown_workers(self):
+        with self.lock:
+            workers, self.workers = list(self.workers.values()), {}
+        for worker in workers:
+            worker.stop()
 
     def run_in_venv(self, command):
-        python_executable = self.get_python_executable()
+        worker = self.get_worker()
         logging.info(f"Running command in virtual environment: {command}")
-        try:
-            result = subprocess.run([python_executable, '-c', command], capture_output=True, text=True, check=True)
-            logging.info("Command executed successfully")
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Error executing command: {e.stderr}")
-            raise
\ No newline at end of file
+        result = worker.run(command)
+        if result['returncode'] != 0:
+            logging.error(f"Error executing command: {result['stderr']}")
+            raise subprocess.CalledProcessError(result['returncode'], command, result['stdout'], result['stderr'])
+        logging.info("Command executed successfully")
+        return result['stdout']
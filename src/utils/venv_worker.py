@@ -0,0 +1,133 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import logging
+from concurrent.futures import CancelledError
+from src.utils.widget_ipc import MessageReader, encode_message
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'venv_worker_process.py')
+DEFAULT_TIMEOUT = 60
+
+
+class VenvWorker:
+    """A long-lived interpreter of one venv that runs commands sent over a pipe.
+
+    Imports done by earlier commands stay loaded, so only the first call
+    pays for interpreter start-up. A request that exceeds its timeout or
+    is cancelled kills the process; the next request starts a new one.
+    """
+
+    def __init__(self, python_executable, timeout=DEFAULT_TIMEOUT):
+        self.python_executable = python_executable
+        self.timeout = timeout
+        self.process = None
+        self.responses = None
+        self.lock = threading.Lock()
+        self.request_id = 0
+        self.cancelled = False
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        self.process = subprocess.Popen([self.python_executable, WORKER_SCRIPT], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                        creationflags=creationflags)
+        self.responses = queue.Queue()
+        threading.Thread(target=self.read_responses, args=(self.process, self.responses), daemon=True).start()
+        self.wait_for_reply(None, self.timeout)
+        logging.debug(f"Venv-worker gestart: {self.python_executable} (pid {self.process.pid})")
+
+    def read_responses(self, process, responses):
+        reader = MessageReader()
+        try:
+            while True:
+                chunk = process.stdout.read1(65536)
+                if not chunk:
+                    break
+                for message in reader.feed(chunk):
+                    responses.put(message)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Venv-worker verbroken: {str(e)}")
+        responses.put(None)
+
+    def wait_for_reply(self, request_id, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                message = self.responses.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.kill()
+                raise subprocess.TimeoutExpired(self.python_executable, timeout)
+            if message is None:
+                self.kill()
+                if self.cancelled:
+                    raise CancelledError()
+                raise ChildProcessError(f"Venv-worker {self.python_executable} is onverwacht gestopt")
+            kind, payload, _ = message
+            if kind == 'ready' or payload.get('id') == request_id:
+                return payload
+
+    def request(self, kind, payload, timeout=None):
+        with self.lock:
+            if not self.is_running():
+                if self.process is not None:
+                    logging.info(f"Venv-worker {self.python_executable} wordt herstart")
+                self.cancelled = False
+                self.start()
+            self.cancelled = False
+            self.request_id += 1
+            try:
+                self.process.stdin.write(encode_message(kind, dict(payload, id=self.request_id)))
+                self.process.stdin.flush()
+            except OSError:
+                self.kill()
+                raise
+            return self.wait_for_reply(self.request_id, timeout or self.timeout)
+
+    def run(self, command, timeout=None):
+        return self.request('run', {'command': command}, timeout)
+
+    def warm(self, modules, timeout=None):
+        """Import modules ahead of the first command; returns {module: error} for failures."""
+        return self.request('import', {'modules': list(modules)}, timeout)['failed']
+
+    def cancel(self):
+        # Breekt een lopend verzoek af vanuit een andere thread
+        if self.is_running():
+            self.cancelled = True
+            self.kill()
+
+    def kill(self):
+        if self.is_running():
+            self.process.kill()
+            self.process.wait()
+
+    def stop(self):
+        if not self.is_running():
+            return
+        try:
+            self.process.stdin.write(encode_message('close'))
+            self.process.stdin.close()
+            self.process.wait(2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
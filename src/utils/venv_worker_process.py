@@ -0,0 +1,90 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Interpreter process behind VenvWorker.
+
+Started by path with a venv's python (python venv_worker_process.py), not
+as part of the src package: the venv does not necessarily have PyQt5,
+which src.utils imports. Requests arrive on stdin and replies go out on
+stdout, both framed as in widget_ipc.
+"""
+
+import contextlib
+import importlib
+import io
+import os
+import sys
+import traceback
+
+# De scriptmap staat vooraan in sys.path; alleen nodig voor widget_ipc
+from widget_ipc import MessageReader, encode_message
+del sys.path[0]
+
+
+def run_command(command):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            exec(compile(command, '<string>', 'exec'), {'__name__': '__main__'})
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                returncode = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+    return {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'returncode': returncode}
+
+
+def import_modules(modules):
+    failed = {}
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            failed[module] = str(e)
+    return {'failed': failed}
+
+
+def main():
+    # Het protocol krijgt een eigen kopie van stdout; losse prints op fd 1 gaan naar stderr
+    channel = os.fdopen(os.dup(1), 'wb', buffering=0)
+    os.dup2(2, 1)
+    stdin = sys.stdin.buffer
+    reader = MessageReader()
+    channel.write(encode_message('ready', {'pid': os.getpid()}))
+
+    while True:
+        chunk = stdin.read1(65536)
+        if not chunk:
+            return
+        for kind, payload, _ in reader.feed(chunk):
+            if kind == 'close':
+                return
+            if kind == 'run':
+                reply = run_command(payload['command'])
+            elif kind == 'import':
+                reply = import_modules(payload['modules'])
+            else:
+                reply = {'error': f"Onbekend verzoek: {kind}"}
+            reply['id'] = payload.get('id')
+            channel.write(encode_message('result', reply))
+
+
+if __name__ == '__main__':
+    main()
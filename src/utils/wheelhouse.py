@@ -0,0 +1,93 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Local wheelhouse for building widget venvs offline.
+
+Pre-seed it from the Dependencies headers of every installed widget:
+
+    python -m src.utils.wheelhouse [widgets folder]
+"""
+
+import os
+import subprocess
+import sys
+import logging
+from pathlib import Path
+from src.config import WHEELHOUSE_DIR, WIDGETS_FOLDER_NAME
+from src.utils.widget_header import parse_requirements
+from src.utils.widget_index import WidgetIndex, discover_widget_modules, parse_dependencies
+
+try:
+    from packaging.utils import canonicalize_name
+except ImportError:
+    canonicalize_name = None
+
+
+def wheel_names(wheelhouse_dir):
+    # Bestandsnaam van een wheel: {naam}-{versie}(-{build})?-{python}-{abi}-{platform}.whl
+    if not os.path.isdir(wheelhouse_dir) or canonicalize_name is None:
+        return set()
+    return {canonicalize_name(name.split('-', 1)[0]) for name in os.listdir(wheelhouse_dir) if name.endswith('.whl')}
+
+
+def has_wheels_for(wheelhouse_dir, dependencies):
+    """Cheap check whether an offline install is worth trying: a wheel exists for every project."""
+    available = wheel_names(wheelhouse_dir)
+    return bool(available) and all(canonicalize_name(requirement.name) in available
+                                   for requirement in parse_requirements(dependencies))
+
+
+def wheel_args(wheelhouse_dir, dependencies):
+    return ['wheel', '--wheel-dir', wheelhouse_dir, '--find-links', wheelhouse_dir, *dependencies]
+
+
+def offline_install_args(wheelhouse_dir, dependencies):
+    return ['install', '--no-index', '--find-links', wheelhouse_dir, *dependencies]
+
+
+def widget_requirement_sets(widget_dir):
+    # Eén set per widget: pins van verschillende widgets mogen elkaar tegenspreken
+    module_paths, _ = discover_widget_modules(widget_dir, WidgetIndex())
+    requirement_sets = []
+    for module_path in module_paths:
+        dependencies = sorted(parse_dependencies(module_path))
+        if dependencies and dependencies not in requirement_sets:
+            requirement_sets.append(dependencies)
+    return requirement_sets
+
+
+def seed_wheelhouse(widget_dir, wheelhouse_dir=WHEELHOUSE_DIR, python_executable=sys.executable):
+    os.makedirs(wheelhouse_dir, exist_ok=True)
+    failed = []
+    for dependencies in widget_requirement_sets(widget_dir):
+        logging.info(f"Wheels ophalen voor: {', '.join(dependencies)}")
+        result = subprocess.run([python_executable, '-m', 'pip', *wheel_args(wheelhouse_dir, dependencies)])
+        if result.returncode != 0:
+            failed.append(dependencies)
+    return failed
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    widget_dir = sys.argv[1] if len(sys.argv) > 1 else str(Path.home() / "Documents" / WIDGETS_FOLDER_NAME)
+    failed = seed_wheelhouse(widget_dir)
+    for dependencies in failed:
+        logging.error(f"Kon geen wheels maken voor: {', '.join(dependencies)}")
+    logging.info(f"Wheelhouse: {WHEELHOUSE_DIR} ({len(wheel_names(WHEELHOUSE_DIR))} pakketten)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
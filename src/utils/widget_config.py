@@ -0,0 +1,114 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+import logging
+from src.config import WIDGET_CONFIG_PATH
+from src.utils.settings import Settings, file_lock, write_json_atomic
+from src.utils.sqlite_store import open_backend
+
+class WidgetConfigStore(Settings):
+    """The configs of all widgets, keyed by widget name, in one JSON file.
+
+    Changes stay in memory and are written together once the widgets are
+    idle (see Settings). Isolated widgets write the same file from their
+    own process, so a write merges only the keys this process changed,
+    under a lock file shared by all processes.
+    A backend takes care of that itself by storing only the changed keys.
+    """
+
+    DEFAULTS = {}
+    INDENT = None
+
+    def __init__(self, filename=WIDGET_CONFIG_PATH, flush_delay=1.0, backend=None):
+        super().__init__(filename, flush_delay, backend)
+
+    def load(self):
+        if self.backend is not None or os.path.exists(self.filename):
+            super().load()
+
+    def save(self):
+        if self.backend is not None:
+            super().save()
+            return
+        with self.lock:
+            self.cancel_flush()
+            os.makedirs(os.path.dirname(os.path.abspath(self.filename)), exist_ok=True)
+            # Lezen, samenvoegen en schrijven als één stap: andere processen wachten zolang
+            with file_lock(self.filename):
+                data = {}
+                if os.path.exists(self.filename):
+                    try:
+                        with open(self.filename, 'r', encoding='utf-8') as f:
+                            data = json.load(f)
+                    except (OSError, ValueError) as e:
+                        logging.warning(f"Widgetconfiguraties onleesbaar, worden overschreven: {str(e)}")
+                for key, value in data.items():
+                    if key not in self.dirty_keys:
+                        self.settings[key] = value
+                data.update(self.settings)
+                write_json_atomic(self.filename, data)
+            self.dirty_keys.clear()
+            self.dirty = False
+
+    def load_widget_config(self, name, defaults=None, legacy_path=None):
+        config = dict(defaults or {})
+        stored = self.get(name)
+        if stored is None and legacy_path and os.path.exists(legacy_path):
+            stored = self.migrate(name, legacy_path)
+        if stored:
+            config.update(json.loads(json.dumps(stored)))
+        return config
+
+    def save_widget_config(self, name, config):
+        # Kopie opslaan: widgets passen hun config-dict zelf verder aan
+        self.set(name, json.loads(json.dumps(config)))
+
+    def migrate(self, name, legacy_path):
+        # Eenmalig: het oude <widget>_config.json naast de widget overnemen
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Kon oude configuratie {legacy_path} niet overnemen: {str(e)}")
+            return None
+        self.set(name, config)
+        try:
+            self.flush()
+            os.replace(legacy_path, f"{legacy_path}.migrated")
+        except OSError as e:
+            logging.warning(f"Fout bij overnemen van {legacy_path}: {str(e)}")
+        logging.info(f"Configuratie van {name} overgenomen uit {legacy_path}")
+        return config
+
+
+widget_config_store = None
+
+def get_widget_config_store():
+    global widget_config_store
+    if widget_config_store is None:
+        widget_config_store = WidgetConfigStore(backend=open_backend('widget_configs'))
+    return widget_config_store
+
+def load_widget_config(name, defaults=None, legacy_path=None):
+    return get_widget_config_store().load_widget_config(name, defaults, legacy_path)
+
+def save_widget_config(name, config):
+    get_widget_config_store().save_widget_config(name, config)
+
+def flush_widget_configs():
+    if widget_config_store is not None:
+        widget_config_store.flush()
@@ -0,0 +1,152 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import ast
+import io
+import logging
+import re
+import tokenize
+from functools import lru_cache
+
+try:
+    from packaging.requirements import InvalidRequirement, Requirement
+except ImportError:  # Widget-venvs (geïsoleerde widgets) hebben packaging niet altijd
+    InvalidRequirement = ValueError
+    Requirement = None
+
+HEADER_CHUNK_SIZE = 4096
+MAX_HEADER_SIZE = 256 * 1024
+
+# Gewone docstring na eventuele lege regels en commentaar; al het andere gaat via tokenize
+PLAIN_DOCSTRING = re.compile(r'(?:[ \t]*(?:#[^\n]*)?\r?\n)*("""|\'\'\')(.*?)\1', re.S)
+
+
+def extract_docstring(data, complete):
+    """Return (docstring, done) for the module docstring at the start of data.
+
+    done is False when data ends inside the docstring and more bytes are needed.
+    """
+    text = data.decode('utf-8-sig', errors='replace')
+    match = PLAIN_DOCSTRING.match(text)
+    if match and '\\' not in match.group(2):
+        # Zonder escapes is de tekst zelf de waarde; de parser maakt van \r\n een \n
+        return match.group(2).replace('\r\n', '\n').replace('\r', '\n'), True
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(text).readline):
+            if token.type in (tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.ENCODING):
+                continue
+            if token.type == tokenize.STRING:
+                try:
+                    value = ast.literal_eval(token.string)
+                except (SyntaxError, ValueError):
+                    return None, True
+                return (value if isinstance(value, str) else None), True
+            return None, True
+    except (tokenize.TokenError, SyntaxError):
+        return None, complete
+    return None, True
+
+
+def read_widget_header(file_path):
+    # Leest in blokken van een paar KB tot de module-docstring compleet is
+    with open(file_path, 'rb') as f:
+        data = b''
+        size = HEADER_CHUNK_SIZE
+        while True:
+            chunk = f.read(size)
+            data += chunk
+            complete = len(chunk) < size or len(data) >= MAX_HEADER_SIZE
+            docstring, done = extract_docstring(data, complete)
+            if done or complete:
+                return docstring
+            size = len(data)
+
+
+def read_header_from_source(source):
+    return extract_docstring(source[:MAX_HEADER_SIZE], True)[0]
+
+
+def parse_dependency_lines(docstring):
+    if not docstring:
+        return []
+    lines = docstring.splitlines()
+    for i, line in enumerate(lines):
+        if 'Dependencies:' in line:
+            candidates = [line.split('Dependencies:', 1)[1]] + lines[i + 1:]
+            return [dep.strip() for dep in candidates
+                    if dep.strip() and not dep.strip().startswith(('#', 'Display Name:'))]
+    return []
+
+
+def parse_display_name(docstring):
+    for line in (docstring or '').splitlines():
+        if line.strip().startswith('Display Name:'):
+            return line.split('Display Name:', 1)[1].strip() or None
+    return None
+
+
+@lru_cache(maxsize=1024)
+def parse_requirement(dependency):
+    # Gememoiseerd: PEP 508 parsen kost meer dan het lezen van de header
+    return Requirement(dependency)
+
+
+@lru_cache(maxsize=1024)
+def normalized_requirement(dependency):
+    return str(parse_requirement(dependency))
+
+
+def log_invalid_requirement(dependency, source, error):
+    logging.warning(f"Ongeldige afhankelijkheid '{dependency}' in {source or 'widget'}: {str(error)}")
+
+
+def parse_requirements(dependencies, source=None):
+    """Parse dependency lines into PEP 508 Requirement objects, skipping invalid lines.
+
+    Requirement objects are passed through and each line is parsed once
+    per process, so callers share the objects; treat them as read-only.
+    """
+    if Requirement is None:
+        raise ImportError("packaging is nodig om widget-afhankelijkheden te interpreteren")
+    requirements = []
+    for dependency in dependencies:
+        if isinstance(dependency, Requirement):
+            requirements.append(dependency)
+            continue
+        try:
+            requirements.append(parse_requirement(dependency))
+        except InvalidRequirement as e:
+            log_invalid_requirement(dependency, source, e)
+    return requirements
+
+
+def valid_dependencies(dependencies, source=None):
+    """The valid dependencies as Requirement objects (the plain lines without packaging)."""
+    if Requirement is None:
+        return list(dependencies)
+    return parse_requirements(dependencies, source)
+
+
+def dependency_strings(dependencies, source=None):
+    """The valid dependency lines in normalised PEP 508 form, as stored in the widget index."""
+    if Requirement is None:
+        return list(dependencies)
+    strings = []
+    for dependency in dependencies:
+        try:
+            strings.append(normalized_requirement(dependency))
+        except InvalidRequirement as e:
+            log_invalid_requirement(dependency, source, e)
+    return strings
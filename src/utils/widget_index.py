@@ -0,0 +1,238 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import threading
+from src.utils.widget_header import (dependency_strings, parse_dependency_lines, parse_display_name,
+                                     read_header_from_source, read_widget_header)
+
+INDEX_VERSION = 3
+PACKAGE_MANIFEST = 'widget.json'
+MAX_DISCOVERY_DEPTH = 2
+
+# ast.parse is niet thread-safe in CPython 3.11 ("AST constructor recursion depth
+# mismatch"); de headers worden parallel gelezen, het parsen gaat één voor één
+AST_PARSE_LOCK = threading.Lock()
+
+
+def parse_dependencies_from_source(content, source=None):
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return dependency_strings(parse_dependency_lines(read_header_from_source(content)), source)
+
+
+def parse_dependencies(file_path):
+    # Alleen de module-docstring wordt gelezen, niet het hele bestand
+    return dependency_strings(parse_dependency_lines(read_widget_header(file_path)), file_path)
+
+
+def default_display_name(module_name):
+    return module_name.replace('_', ' ').title()
+
+
+def defines_widget(tree):
+    # Kijk alleen naar top-level definities, net als hasattr(module, 'Widget')
+    for node in tree.body:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name == 'Widget':
+                return True
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id == 'Widget':
+                    return True
+        elif isinstance(node, ast.AnnAssign):
+            if isinstance(node.target, ast.Name) and node.target.id == 'Widget':
+                return True
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if (alias.asname or alias.name) == 'Widget':
+                    return True
+    return False
+
+
+def scan_widget_source(module_name, source):
+    """Read a widget's manifest data from its source without executing it."""
+    try:
+        with AST_PARSE_LOCK:
+            tree = ast.parse(source)
+        has_widget = defines_widget(tree)
+    except (SyntaxError, ValueError) as e:
+        logging.error(f"Syntaxfout in widget {module_name}: {str(e)}")
+        has_widget = False
+    docstring = read_header_from_source(source)
+    return {
+        'name': module_name,
+        'dependencies': dependency_strings(parse_dependency_lines(docstring), module_name),
+        'display_name': parse_display_name(docstring) or default_display_name(module_name),
+        'has_widget': has_widget,
+    }
+
+
+class WidgetIndex:
+    """On-disk manifest of the widgets folder.
+
+    Entries are keyed by path and validated against size, mtime and a content
+    hash, so the widget list can be built without importing any widget.
+    Directory listings are cached by mtime so unchanged folders are not
+    scanned again.
+    """
+
+    def __init__(self, index_path=None):
+        self.index_path = index_path
+        self.entries = {}
+        self.directories = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Widget-index onleesbaar, wordt opnieuw opgebouwd: {str(e)}")
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.entries = data.get('entries', {})
+            self.directories = data.get('directories', {})
+
+    def save(self):
+        if not self.index_path or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'entries': self.entries,
+                           'directories': self.directories}, f)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+        except OSError as e:
+            logging.warning(f"Kon widget-index niet opslaan: {str(e)}")
+
+    def lookup(self, module_name, module_path):
+        stat = os.stat(module_path)
+        entry = self.entries.get(module_path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry
+
+        with open(module_path, 'rb') as f:
+            source = f.read()
+        content_hash = hashlib.sha256(source).hexdigest()
+        if entry is None or entry['hash'] != content_hash or entry['name'] != module_name:
+            logging.debug(f"Widget {module_name} (opnieuw) geïndexeerd")
+            entry = scan_widget_source(module_name, source)
+            entry['hash'] = content_hash
+        entry['size'] = stat.st_size
+        entry['mtime_ns'] = stat.st_mtime_ns
+        self.entries[module_path] = entry
+        self.dirty = True
+        return entry
+
+    def list_directory(self, path):
+        # Een map-mtime verandert alleen als er entries bijkomen of verdwijnen
+        mtime_ns = os.stat(path).st_mtime_ns
+        listing = self.directories.get(path)
+        if listing and listing['mtime_ns'] == mtime_ns:
+            return listing
+
+        files, subdirs = [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.startswith('.') or entry.name == '__pycache__':
+                    continue
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+        listing = {'mtime_ns': mtime_ns, 'files': sorted(files), 'subdirs': sorted(subdirs)}
+        self.directories[path] = listing
+        self.dirty = True
+        return listing
+
+    def prune(self, module_paths, directories=None):
+        stale = set(self.entries) - set(module_paths)
+        for module_path in stale:
+            del self.entries[module_path]
+        stale_dirs = set()
+        if directories is not None:
+            stale_dirs = set(self.directories) - set(directories)
+            for path in stale_dirs:
+                del self.directories[path]
+        if stale or stale_dirs:
+            self.dirty = True
+
+
+def widget_modules(files):
+    return [f for f in files if f.endswith('.py') and f != '__init__.py']
+
+
+def find_package_main(path, files):
+    # Een pakketmap wordt herkend aan een manifest, <map>.py of één enkele module
+    if PACKAGE_MANIFEST in files:
+        try:
+            with open(os.path.join(path, PACKAGE_MANIFEST), 'r', encoding='utf-8') as f:
+                main = json.load(f).get('main')
+            if main in files:
+                return main
+            logging.warning(f"Manifest in {path} verwijst naar onbekende module: {main}")
+        except (OSError, ValueError, AttributeError) as e:
+            logging.warning(f"Ongeldig widget-manifest in {path}: {str(e)}")
+    modules = widget_modules(files)
+    folder_module = f"{os.path.basename(path)}.py"
+    if folder_module in modules:
+        return folder_module
+    if len(modules) == 1:
+        return modules[0]
+    return None
+
+
+def discover_widget_modules(widget_dir, index, max_depth=MAX_DISCOVERY_DEPTH):
+    """Return widget module paths below widget_dir in a stable order.
+
+    Top-level ``.py`` files are widgets; a subfolder is a widget package when
+    find_package_main() recognises its main module. Other folders are walked
+    up to max_depth levels deep.
+    """
+    module_paths = []
+    directories = []
+
+    def walk(path, depth):
+        try:
+            listing = index.list_directory(path)
+        except OSError as e:
+            logging.error(f"Kon widgetmap {path} niet lezen: {str(e)}")
+            return
+        directories.append(path)
+
+        if depth == 0:
+            module_paths.extend(os.path.join(path, f) for f in widget_modules(listing['files']))
+        else:
+            main = find_package_main(path, listing['files'])
+            if main:
+                module_paths.append(os.path.join(path, main))
+                return
+
+        if depth < max_depth:
+            for subdir in listing['subdirs']:
+                walk(os.path.join(path, subdir), depth + 1)
+
+    walk(widget_dir, 0)
+    return module_paths, directories
@@ -0,0 +1,50 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import struct
+
+# Een bericht is: totale lengte (4 bytes), lengte van de JSON-header (4 bytes),
+# de JSON-header en optioneel binaire data (bijvoorbeeld de pixels van een frame).
+PREFIX = struct.Struct('>II')
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+def encode_message(kind, payload=None, data=b''):
+    header = json.dumps({'kind': kind, 'payload': payload or {}}, separators=(',', ':')).encode('utf-8')
+    return PREFIX.pack(len(header) + len(data), len(header)) + header + data
+
+
+class MessageReader:
+    """Reassembles messages from a byte stream that arrives in arbitrary chunks."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, chunk):
+        self.buffer.extend(chunk)
+        messages = []
+        while len(self.buffer) >= PREFIX.size:
+            total, header_size = PREFIX.unpack_from(self.buffer)
+            if total > MAX_MESSAGE_SIZE or header_size > total:
+                raise ValueError(f"Ongeldig bericht van {total} bytes")
+            if len(self.buffer) < PREFIX.size + total:
+                break
+            start = PREFIX.size
+            header = json.loads(bytes(self.buffer[start:start + header_size]).decode('utf-8'))
+            data = bytes(self.buffer[start + header_size:start + total])
+            del self.buffer[:start + total]
+            messages.append((header['kind'], header['payload'], data))
+        return messages
@@ -14,73 +14,243 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import os
+import hashlib
 import importlib.util
 import sys
-import re
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from src.config import APP_DATA_DIR, LOG_DIR, WHEELHOUSE_DIR, PROFILE_STARTUP
+from src.core.isolated_widget import IsolatedWidget
+from src.utils.bytecode_cache import BytecodeCache
+from src.utils.dependency_installer import DependencyInstaller
 from src.utils.venv_manager import VenvManager
+from src.utils.widget_header import parse_requirements
+from src.utils.widget_index import WidgetIndex, discover_widget_modules
+from src.utils.widget_profiler import WidgetProfiler
 
-def parse_dependencies(file_path):
-    dependencies = []
-    with open(file_path, 'r') as file:
-        content = file.read()
-        match = re.search(r'"""[\s\S]*?Dependencies:([\s\S]*?)"""', content)
-        if match:
-            deps = match.group(1).strip().split('\n')
-            dependencies = [dep.strip() for dep in deps if dep.strip()]
-    return dependencies
-
-def load_widgets(widget_dir):
+DEFAULT_INDEX_PATH = os.path.join(APP_DATA_DIR, 'cache', 'widget_index.json')
+DISCOVERY_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+bytecode_cache = BytecodeCache(os.path.join(APP_DATA_DIR, 'cache', 'bytecode'))
+
+def lookup_widget(index, module_name, module_path, profiler=None):
+    start = time.perf_counter()
+    try:
+        return index.lookup(module_name, module_path), None
+    except OSError as e:
+        return None, e
+    finally:
+        if profiler is not None:
+            profiler.record(module_name, 'dependency_parse', (time.perf_counter() - start) * 1000)
+
+def load_widgets(widget_dir, index=None, max_workers=DISCOVERY_WORKERS, profiler=None):
+    # Leest alleen de manifest-index; modules worden pas bij activatie geïmporteerd
+    if index is None:
+        index = WidgetIndex()
+    start = time.perf_counter()
     widgets = {}
+    module_paths, directories = discover_widget_modules(widget_dir, index)
+
+    candidates = {}
+    for module_path in module_paths:
+        module_name = os.path.basename(module_path)[:-3]  # Remove .py extension
+        if module_name in candidates:
+            logging.warning(f"Waarschuwing: {module_path} overgeslagen, widget {module_name} bestaat al.")
+            continue
+        candidates[module_name] = module_path
+
+    # Headers lezen, hashen en parsen gebeurt parallel; de volgorde blijft die van de discovery
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda item: lookup_widget(index, *item, profiler), candidates.items()))
+
+    for (module_name, module_path), (entry, error) in zip(candidates.items(), results):
+        filename = os.path.basename(module_path)
+        if error is not None:
+            logging.error(f"Fout bij het lezen van widget {filename}: {str(error)}")
+            continue
+
+        logging.debug(f"Afhankelijkheden voor {module_name}: {entry['dependencies']}")
+
+        if entry['has_widget']:
+            widgets[module_name] = {
+                'class': None,
+                'dependencies': entry['dependencies'],
+                'display_name': entry['display_name'],
+                'path': module_path,
+                'hash': entry['hash']
+            }
+        else:
+            logging.warning(f"Waarschuwing: {filename} bevat geen 'Widget' klasse.")
+
+    index.prune(module_paths, directories)
+    index.save()
+    logging.debug(f"Widgetdiscovery: {len(widgets)} widgets in "
+                  f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    return widgets
+
+def compile_widget_source(module_path):
+    with open(module_path, 'rb') as f:
+        source = f.read()
+    content_hash = hashlib.sha256(source).hexdigest()
+    code = bytecode_cache.load(module_path, content_hash)
+    if code is None:
+        code = compile(source, module_path, 'exec', dont_inherit=True)
+        bytecode_cache.store(module_path, content_hash, code)
+    return content_hash, code
+
+def import_widget_module(module_name, module_path, code=None):
+    if code is None:
+        _, code = compile_widget_source(module_path)
+    widget_dir = os.path.dirname(module_path)
     sys.path.append(widget_dir)  # Add widget directory to Python path
-    for filename in os.listdir(widget_dir):
-        if filename.endswith('.py') and filename != '__init__.py':
-            module_name = filename[:-3]  # Remove .py extension
-            module_path = os.path.join(widget_dir, filename)
-            dependencies = parse_dependencies(module_path)
-            
-            logging.debug(f"Laden van widget: {module_name}")
-            logging.debug(f"Afhankelijkheden voor {module_name}: {dependencies}")
-            
+    # Geen __pycache__ naast de widgets (OneDrive), ook niet voor hulpmodules
+    dont_write_bytecode = sys.dont_write_bytecode
+    sys.dont_write_bytecode = True
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        module = importlib.util.module_from_spec(spec)
+        exec(code, module.__dict__)
+    finally:
+        sys.dont_write_bytecode = dont_write_bytecode
+        sys.path.remove(widget_dir)  # Remove widget directory from Python path
+    return module
+
+def widget_files_changed(module_path, changed_paths):
+    # Bron (naam.py) of sidecar-bestanden (naam.*) van deze widget
+    prefix = os.path.splitext(os.path.normcase(module_path))[0] + '.'
+    return any(os.path.normcase(path).startswith(prefix) for path in changed_paths)
+
+class ModuleCache:
+    """Imported widget modules keyed by path and the source's content hash.
+
+    An unchanged file reuses the module object (and so its Widget class);
+    only a modified file is executed again. precompile() prepares code
+    objects on a thread pool so activation only has to execute them; it
+    may run on a background thread while widgets are being activated.
+    """
+
+    def __init__(self):
+        self.modules = {}
+        self.code = {}
+        self.stats = {'imports': 0, 'avoided': 0}
+
+    def precompile(self, widgets, max_workers=DISCOVERY_WORKERS):
+        pending = [(path, content_hash) for path, content_hash in widgets
+                   if self.modules.get(path, (None,))[0] != content_hash and
+                   self.code.get(path, (None,))[0] != content_hash]
+        if not pending:
+            return
+
+        def compile_pending(item):
             try:
-                spec = importlib.util.spec_from_file_location(module_name, module_path)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                
-                if hasattr(module, 'Widget'):
-                    widgets[module_name] = {
-                        'class': module.Widget,
-                        'dependencies': dependencies
-                    }
-                    logging.debug(f"Widget {module_name} succesvol geladen")
-                else:
-                    logging.warning(f"Waarschuwing: {filename} bevat geen 'Widget' klasse.")
-            except Exception as e:
-                logging.error(f"Fout bij het laden van widget {filename}: {str(e)}")
-    
-    sys.path.remove(widget_dir)  # Remove widget directory from Python path
-    return widgets
+                return compile_widget_source(item[0])
+            except (OSError, SyntaxError, ValueError) as e:
+                logging.error(f"Fout bij het compileren van widget {item[0]}: {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for (path, content_hash), result in zip(pending, executor.map(compile_pending, pending)):
+                # Bestand gewijzigd sinds het indexeren: bij activatie opnieuw compileren
+                if result is None or result[0] != content_hash:
+                    continue
+                # Intussen al geactiveerd (en zelf gecompileerd): code niet bewaren
+                if self.modules.get(path, (None,))[0] != content_hash:
+                    self.code[path] = result
+
+    def get_module(self, module_name, module_path, content_hash):
+        cached = self.modules.get(module_path)
+        if cached is not None and cached[0] == content_hash:
+            self.stats['avoided'] += 1
+            logging.debug(f"Widget {module_name} uit module-cache gehaald")
+            return cached[1]
+
+        compiled = self.code.pop(module_path, None)
+        code = compiled[1] if compiled is not None and compiled[0] == content_hash else None
+        module = import_widget_module(module_name, module_path, code)
+        self.stats['imports'] += 1
+        self.modules[module_path] = (content_hash, module)
+        return module
+
+    def prune(self, module_paths):
+        module_paths = set(module_paths)
+        for cache in (self.modules, self.code):
+            for module_path in set(cache) - module_paths:
+                del cache[module_path]
+
+# Shared by every WidgetManager so a module is never imported twice
+module_cache = ModuleCache()
 
 class WidgetManager:
-    def __init__(self, widget_dir):
+    def __init__(self, widget_dir, index_path=DEFAULT_INDEX_PATH):
         self.widget_dir = widget_dir
-        self.venv_manager = VenvManager(os.path.dirname(widget_dir))
+        self.venv_manager = VenvManager(os.path.dirname(widget_dir), wheelhouse_dir=WHEELHOUSE_DIR)
+        self.index = WidgetIndex(index_path)
+        self.profiler = WidgetProfiler(LOG_DIR, enabled=PROFILE_STARTUP)
+        self.profiler.start()
+        self.installer = DependencyInstaller(self.venv_manager, profiler=self.profiler)
+        self.precompiler = ThreadPoolExecutor(max_workers=1, thread_name_prefix='precompile')
         self.widgets = self.load_widgets()
         self.active_widgets = {}
+        self.isolated_widgets = set()
 
     def load_widgets(self):
-        return load_widgets(self.widget_dir)
+        widgets = load_widgets(self.widget_dir, self.index, profiler=self.profiler)
+        self.venv_manager.prune(widgets)
+        return widgets
+
+    def prepare_widgets(self, widget_names):
+        # Op de achtergrond: een widget die eerder aan de beurt is compileert zichzelf
+        widgets = [(self.widgets[name]['path'], self.widgets[name]['hash'])
+                   for name in widget_names if name in self.widgets]
+        if widgets:
+            return self.precompiler.submit(module_cache.precompile, widgets)
+        return None
+
+    def shutdown(self):
+        self.installer.shutdown()
+        self.precompiler.shutdown(wait=False, cancel_futures=True)
+
+    def set_isolated_widgets(self, widget_names):
+        # Geeft de widgets terug waarvan de modus wijzigde (in-process <-> eigen proces)
+        widget_names = set(widget_names)
+        changed = self.isolated_widgets ^ widget_names
+        self.isolated_widgets = widget_names
+        return changed
 
     def get_available_widgets(self):
         return list(self.widgets.keys())
 
     def reload_widgets(self):
         self.widgets = self.load_widgets()
+        module_cache.prune(info['path'] for info in self.widgets.values())
         for widget_name in list(self.active_widgets.keys()):
             if widget_name not in self.widgets:
                 self.deactivate_widget(widget_name)
             else:
                 self.refresh_widget(widget_name)
+        logging.debug(f"Module-cache: {module_cache.stats['imports']} imports, "
+                      f"{module_cache.stats['avoided']} vermeden")
+
+    def reload_changed_widgets(self, changed_paths):
+        # Herlaadt alleen actieve widgets waarvan de bron of een sidecar is gewijzigd
+        old_hashes = {name: info['hash'] for name, info in self.widgets.items()}
+        self.widgets = self.load_widgets()
+        module_cache.prune(info['path'] for info in self.widgets.values())
+
+        refreshed, removed = [], []
+        for widget_name in list(self.active_widgets.keys()):
+            widget_info = self.widgets.get(widget_name)
+            if widget_info is None:
+                self.deactivate_widget(widget_name)
+                removed.append(widget_name)
+            elif (widget_info['hash'] != old_hashes.get(widget_name) or
+                    widget_files_changed(widget_info['path'], changed_paths)):
+                self.refresh_widget(widget_name)
+                refreshed.append(widget_name)
+
+        logging.debug(f"Hot-reload: vernieuwd {refreshed}, verwijderd {removed}")
+        return refreshed, removed
 
     def activate_widget(self, widget_name):
         if widget_name in self.widgets:
@@ -91,20 +261,26 @@ class WidgetManager:
             logging.debug(f"Afhankelijkheden voor {widget_name}: {dependencies}")
             
             try:
-                self.venv_manager.install_dependencies(widget_name, dependencies)
+                # pip draait nooit op de GUI-thread; de widget wordt geactiveerd zodra de installatie klaar is
+                if not self.venv_manager.is_ready(dependencies):
+                    self.installer.install(widget_name, dependencies)
+                    return None
+                self.venv_manager.create_widget_venv(widget_name, dependencies)
                 
                 # Use the virtual environment's Python to import the widget
-                python_exec = self.venv_manager.get_python_executable()
+                python_exec = self.venv_manager.get_python_executable(widget_name)
+                if widget_name in self.isolated_widgets:
+                    return self.activate_isolated_widget(widget_name, widget_info, python_exec)
                 original_executable = sys.executable
                 sys.executable = python_exec
                 
-                # Reload the module to ensure we're using the correct environment
-                module_path = os.path.join(self.widget_dir, f"{widget_name}.py")
-                spec = importlib.util.spec_from_file_location(widget_name, module_path)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+                # Import the module only now that the widget is actually needed
+                with self.profiler.phase(widget_name, 'module_import'):
+                    module = module_cache.get_module(widget_name, widget_info['path'], widget_info['hash'])
+                widget_info['class'] = module.Widget
                 
-                self.active_widgets[widget_name] = module.Widget()
+                with self.profiler.phase(widget_name, 'construction'):
+                    self.active_widgets[widget_name] = module.Widget()
                 
                 # Restore the original Python executable
                 sys.executable = original_executable
@@ -119,7 +295,16 @@ class WidgetManager:
             logging.warning(f"Widget {widget_name} niet gevonden.")
             return None
 
-    def deactivate_widget(self, widget_name):
+    def activate_isolated_widget(self, widget_name, widget_info, python_exec):
+        if not os.path.exists(python_exec) and not os.path.exists(python_exec + '.exe'):
+            logging.warning(f"Geen venv-interpreter voor {widget_name}, {sys.executable} wordt gebruikt")
+            python_exec = sys.executable
+        with self.profiler.phase(widget_name, 'construction'):
+            self.active_widgets[widget_name] = IsolatedWidget(widget_name, widget_info['path'], python_exec)
+        logging.debug(f"Widget {widget_name} geactiveerd in een eigen proces")
+        return self.active_widgets[widget_name]
+
+    def deactivate_widget(self, widget_name, release_venv=True):
         if widget_name in self.active_widgets:
             widget = self.active_widgets[widget_name]
             if hasattr(widget, 'close') and callable(getattr(widget, 'close')):
@@ -128,14 +313,24 @@ class WidgetManager:
             logging.debug(f"Widget {widget_name} gedeactiveerd")
         else:
             logging.warning(f"Widget {widget_name} is niet actief.")
+        # Anders houdt de widget zijn venv in leven en ruimt de LRU-opruiming nooit iets op
+        if release_venv:
+            self.venv_manager.release_widget(widget_name)
 
     def refresh_widget(self, widget_name):
         if widget_name in self.active_widgets:
-            self.deactivate_widget(widget_name)
+            # De widget komt meteen terug: zijn venv niet vrijgeven, anders kan de opruiming hem weggooien
+            self.deactivate_widget(widget_name, release_venv=False)
         return self.activate_widget(widget_name)
 
     def get_active_widgets(self):
         return self.active_widgets
 
     def get_widget_dependencies(self, widget_name):
-        return self.widgets.get(widget_name, {}).get('dependencies', [])
\ No newline at end of file
+        return self.widgets.get(widget_name, {}).get('dependencies', [])
+
+    def get_widget_requirements(self, widget_name):
+        return parse_requirements(self.get_widget_dependencies(widget_name), widget_name)
+
+    def get_widget_display_name(self, widget_name):
+        return self.widgets.get(widget_name, {}).get('display_name', widget_name.replace('_', ' ').title())
@@ -0,0 +1,175 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from PyQt5.QtCore import QObject, QEvent, QTimer
+
+PHASES = ('dependency_parse', 'pip_install', 'module_import', 'construction', 'first_show', 'first_paint')
+REPORT_FILENAME = 'widget_startup_report.json'
+
+class WidgetProfiler(QObject):
+    """Records per-widget time and tracemalloc memory deltas for each startup phase.
+
+    Memory is only measured for phases that run on the GUI thread; the
+    dependency parse runs on the discovery pool and is timed only.
+
+    Profiling is opt-in (enabled, see PROFILE_STARTUP in src.config) and
+    covers one startup: the report is written once, after which tracing
+    stops and later activations are no longer recorded.
+    """
+
+    def __init__(self, log_dir, enabled=True, parent=None):
+        super().__init__(parent)
+        self.enabled = enabled
+        self.report_path = os.path.join(log_dir, REPORT_FILENAME)
+        self.records = {}
+        self.lock = threading.Lock()
+        self.pending_paints = {}
+        self.finishing = False
+        self.started_tracing = False
+
+    def start(self):
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def record(self, widget_name, phase, duration_ms, memory_kb=None):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.records.setdefault(widget_name, {})[phase] = {
+                'ms': round(duration_ms, 2),
+                'memory_kb': None if memory_kb is None else round(memory_kb, 1)
+            }
+
+    @contextmanager
+    def phase(self, widget_name, phase):
+        if not self.enabled:
+            yield
+            return
+        tracing = tracemalloc.is_tracing()
+        memory_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            memory_kb = None
+            if tracing and tracemalloc.is_tracing():
+                memory_kb = (tracemalloc.get_traced_memory()[0] - memory_before) / 1024
+            self.record(widget_name, phase, duration_ms, memory_kb)
+
+    def watch_first_paint(self, widget_name, widget):
+        if not self.enabled:
+            return
+        # De eerste paint wordt gemeten vanaf het einde van show()
+        self.pending_paints[widget] = [widget_name, None]
+        widget.installEventFilter(self)
+
+    def shown(self, widget):
+        if widget in self.pending_paints:
+            self.pending_paints[widget][1] = time.perf_counter()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and obj in self.pending_paints:
+            widget_name, shown_at = self.pending_paints.pop(obj)
+            obj.removeEventFilter(self)
+            if shown_at is not None:
+                self.record(widget_name, 'first_paint', (time.perf_counter() - shown_at) * 1000)
+            if self.finishing and not self.pending_paints:
+                self.write_report()
+        return False
+
+    def finish(self, timeout_ms=2000):
+        # Wacht op de eerste paint van de laatste widgets, maar niet eindeloos
+        if not self.enabled or self.finishing:
+            return
+        self.finishing = True
+        if self.pending_paints:
+            QTimer.singleShot(timeout_ms, self.write_report)
+        else:
+            self.write_report()
+
+    def write_report(self):
+        if not self.finishing:
+            return
+        self.finishing = False
+        # Alleen de opstart: volgende activaties (installaties, hot-reload) niet meer meten
+        self.enabled = False
+        for widget in list(self.pending_paints):
+            widget.removeEventFilter(self)
+        self.pending_paints.clear()
+
+        with self.lock:
+            widgets = {name: dict(phases) for name, phases in self.records.items()}
+        report = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'widgets': widgets,
+            'totals_ms': {name: round(sum(p['ms'] for p in phases.values()), 2)
+                          for name, phases in widgets.items()}
+        }
+        try:
+            os.makedirs(os.path.dirname(self.report_path), exist_ok=True)
+            with open(self.report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=4)
+        except OSError as e:
+            logging.error(f"Kon opstartrapport niet schrijven: {str(e)}")
+
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+        slowest = sorted(report['totals_ms'].items(), key=lambda item: item[1], reverse=True)
+        summary = ', '.join(f"{name} {total:.0f} ms" for name, total in slowest[:3])
+        logging.getLogger('DesktopCustomizer').info(
+            f"Widget-opstartprofiel: {len(widgets)} widgets, traagste: {summary or '-'} ({self.report_path})")
+        return report
+
+
+def load_last_report(log_dir):
+    report_path = os.path.join(log_dir, REPORT_FILENAME)
+    try:
+        with open(report_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def format_report(report):
+    lines = [f"Report created: {report.get('created', '?')}", ""]
+    header = f"{'Widget':<28}" + ''.join(f"{phase:>20}" for phase in PHASES) + f"{'total':>12}"
+    lines.append(header)
+    lines.append('-' * len(header))
+    totals = report.get('totals_ms', {})
+    for widget_name in sorted(totals, key=totals.get, reverse=True):
+        phases = report['widgets'].get(widget_name, {})
+        cells = []
+        for phase in PHASES:
+            data = phases.get(phase)
+            if data is None:
+                cells.append(f"{'-':>20}")
+            elif data['memory_kb'] is None:
+                cells.append(f"{data['ms']:>17.1f} ms")
+            else:
+                cells.append(f"{data['ms']:>9.1f} ms {data['memory_kb']:>+6.0f}K")
+        lines.append(f"{widget_name[:27]:<28}" + ''.join(cells) + f"{totals[widget_name]:>9.1f} ms")
+    return '\n'.join(lines)
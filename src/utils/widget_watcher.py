@@ -0,0 +1,80 @@
+# Copyright (C) 2024 Imolia Media
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import logging
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from src.utils.widget_index import WidgetIndex, discover_widget_modules
+
+class WidgetWatcher(QObject):
+    """Watches the widgets folder and reports changed files in debounced batches.
+
+    Every folder visited by widget discovery is watched for added packages,
+    but only widget sources (``name.py``) and their sidecar files (``name.*``)
+    are watched for changes, so widgets writing their ``*_config.json`` do
+    not trigger reloads.
+    """
+
+    widgetsChanged = pyqtSignal(list)
+
+    def __init__(self, widget_dir, debounce_ms=300, parent=None):
+        super().__init__(parent)
+        self.widget_dir = widget_dir
+        self.index = WidgetIndex()
+        self.pending = set()
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_path_changed)
+        self.watcher.fileChanged.connect(self.on_path_changed)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self.flush)
+
+        self.update_watched_paths()
+
+    def watched_paths(self):
+        module_paths, directories = discover_widget_modules(self.widget_dir, self.index)
+        self.index.prune(module_paths, directories)
+        files = []
+        for module_path in module_paths:
+            path = os.path.dirname(module_path)
+            prefix = os.path.basename(module_path)[:-3] + '.'
+            files.extend(os.path.join(path, f) for f in self.index.directories[path]['files']
+                         if f.startswith(prefix))
+        return files, directories
+
+    def update_watched_paths(self):
+        files, directories = self.watched_paths()
+        for wanted, watched in ((set(files), set(self.watcher.files())),
+                                (set(directories), set(self.watcher.directories()))):
+            if watched - wanted:
+                self.watcher.removePaths(list(watched - wanted))
+            if wanted - watched:
+                self.watcher.addPaths(list(wanted - watched))
+
+    def on_path_changed(self, path):
+        self.pending.add(path)
+        # Elke nieuwe melding herstart de timer, zodat een reeks saves één reload geeft
+        self.debounce_timer.start()
+
+    def flush(self):
+        # Editors die opslaan via rename halen het bestand uit de watchlist
+        self.update_watched_paths()
+        changed = sorted(self.pending)
+        self.pending.clear()
+        logging.debug(f"Gewijzigde widgetbestanden: {changed}")
+        self.widgetsChanged.emit(changed)
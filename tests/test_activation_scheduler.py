@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+from src.core import activation_scheduler
+from src.core.activation_scheduler import ActivationScheduler
+
+app = QApplication.instance() or QApplication([])
+
+class TestActivationScheduler(unittest.TestCase):
+    def run_scheduler(self, scheduler):
+        scheduler.finished.connect(app.quit)
+        QTimer.singleShot(5000, app.quit)
+        scheduler.start()
+        app.exec_()
+
+    def test_widgets_are_activated_in_order(self):
+        activated = []
+        scheduler = ActivationScheduler(lambda name: name.upper())
+        scheduler.widgetActivated.connect(lambda name, widget: activated.append((name, widget)))
+        scheduler.schedule(['clock', 'notes', 'clock'])
+        self.run_scheduler(scheduler)
+        self.assertEqual(activated, [('clock', 'CLOCK'), ('notes', 'NOTES')])
+
+    def test_nothing_is_activated_before_start(self):
+        scheduler = ActivationScheduler(self.fail)
+        scheduler.schedule(['clock'])
+        app.processEvents()
+        self.assertTrue(scheduler.is_pending('clock'))
+
+    def test_frame_budget_spreads_slow_widgets(self):
+        frames = []
+        # Nepklok: elke activatie kost precies 10 ms, hoe druk de testmachine ook is
+        clock = [0.0]
+        mock.patch.object(activation_scheduler, 'time', mock.Mock(perf_counter=lambda: clock[0])).start()
+        self.addCleanup(mock.patch.stopall)
+        scheduler = ActivationScheduler(lambda name: clock.__setitem__(0, clock[0] + 0.01), frame_budget_ms=15)
+        scheduler.widgetActivated.connect(lambda name, widget: frames.append(frame_counter[0]))
+        frame_counter = [0]
+        original_run_frame = scheduler.run_frame
+
+        def counting_run_frame():
+            frame_counter[0] += 1
+            original_run_frame()
+
+        scheduler.timer.timeout.disconnect()
+        scheduler.timer.timeout.connect(counting_run_frame)
+        scheduler.schedule(['a', 'b', 'c', 'd'])
+        self.run_scheduler(scheduler)
+        self.assertEqual(frames, [1, 1, 2, 2])
+
+    def test_cancelled_widget_is_skipped(self):
+        activated = []
+        scheduler = ActivationScheduler(activated.append)
+        scheduler.schedule(['clock', 'notes'])
+        scheduler.cancel('clock')
+        self.run_scheduler(scheduler)
+        self.assertEqual(activated, ['notes'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+from src.utils import widget_loader
+from src.utils.bytecode_cache import BytecodeCache
+
+class TestBytecodeCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.widget_dir = os.path.join(self.temp_dir, 'widgets')
+        os.makedirs(self.widget_dir)
+        self.cache = BytecodeCache(os.path.join(self.temp_dir, 'bytecode'))
+        patcher = mock.patch.object(widget_loader, 'bytecode_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.module_path = os.path.join(self.widget_dir, 'cached_widget.py')
+        with open(self.module_path, 'w') as f:
+            f.write('from helper import VALUE\n\nclass Widget:\n    value = VALUE\n')
+        with open(os.path.join(self.widget_dir, 'helper.py'), 'w') as f:
+            f.write('VALUE = 42\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_compiled_code_is_reused(self):
+        content_hash, code = widget_loader.compile_widget_source(self.module_path)
+        self.assertIsNotNone(self.cache.load(self.module_path, content_hash))
+
+        with mock.patch('builtins.compile') as compile_mock:
+            _, cached_code = widget_loader.compile_widget_source(self.module_path)
+        compile_mock.assert_not_called()
+        self.assertEqual(cached_code, code)
+
+    def test_corrupt_entry_falls_back_to_source(self):
+        content_hash, _ = widget_loader.compile_widget_source(self.module_path)
+        cache_path = self.cache.path_for(self.module_path, content_hash)
+        with open(cache_path, 'wb') as f:
+            f.write(self.cache.header(content_hash) + b'\x00garbage')
+
+        self.assertIsNone(self.cache.load(self.module_path, content_hash))
+        self.assertFalse(os.path.exists(cache_path))
+        module = widget_loader.import_widget_module('cached_widget', self.module_path)
+        self.assertEqual(module.Widget.value, 42)
+
+    def test_entry_from_other_interpreter_is_ignored(self):
+        content_hash, _ = widget_loader.compile_widget_source(self.module_path)
+        cache_path = self.cache.path_for(self.module_path, content_hash)
+        with open(cache_path, 'r+b') as f:
+            f.write(b'\x00\x00\x00\x00')
+        self.assertIsNone(self.cache.load(self.module_path, content_hash))
+
+    def test_no_pycache_next_to_widgets(self):
+        module = widget_loader.import_widget_module('cached_widget', self.module_path)
+        self.assertEqual(module.Widget.value, 42)
+        self.assertFalse(os.path.exists(os.path.join(self.widget_dir, '__pycache__')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest import mock
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication
+from src.utils.chrome_renderer import ChromeRenderer
+from src.utils.draggable_widget import DraggableWidget
+
+class PlainWidget(DraggableWidget):
+    def load_config(self):
+        return {}
+
+    def save_config(self):
+        pass
+
+class TestChromeRenderer(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.renderer = ChromeRenderer(max_entries=3)
+
+    def test_handle_is_shared_between_sizes(self):
+        origin, first = self.renderer.chrome(300, 200, 1.0)
+        self.assertEqual((origin.x(), origin.y()), (290, 190))
+        _, second = self.renderer.chrome(500, 400, 1.0)
+        self.assertIs(first, second)
+        self.assertEqual(len(self.renderer.cache), 1)
+
+    def test_pixmaps_follow_device_pixel_ratio(self):
+        _, pixmap = self.renderer.chrome(300, 200, 2.0, border_color='#000000')
+        self.assertEqual((pixmap.width(), pixmap.height()), (600, 400))
+        self.assertEqual(pixmap.devicePixelRatio(), 2.0)
+        self.assertEqual(pixmap.toImage().pixelColor(0, 0), QColor('#000000'))
+
+    def test_colour_is_part_of_the_key_and_cache_is_bounded(self):
+        for color in ('#000000', '#111111', '#222222', '#333333'):
+            self.renderer.chrome(100, 100, 1.0, border_color=color)
+        self.assertEqual(len(self.renderer.cache), 3)
+        _, black = self.renderer.chrome(100, 100, 1.0, border_color='#000000')
+        _, grey = self.renderer.chrome(100, 100, 1.0, border_color='#333333')
+        self.assertIsNot(black, grey)
+
+class TestWidgetChrome(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.widget = PlainWidget()
+        self.widget.resize(200, 100)
+
+    def tearDown(self):
+        self.widget.deleteLater()
+
+    def test_repaint_reuses_chrome_until_resize(self):
+        with mock.patch('src.utils.draggable_widget.chrome_renderer') as renderer:
+            renderer.chrome.side_effect = ChromeRenderer().chrome
+            for _ in range(5):
+                self.widget.grab()
+            self.assertEqual(renderer.chrome.call_count, 1)
+            self.widget.resize(300, 100)
+            self.widget.grab()
+            self.assertEqual(renderer.chrome.call_count, 2)
+            self.widget.setStyleSheet('background: red;')
+            self.widget.grab()
+            self.assertEqual(renderer.chrome.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
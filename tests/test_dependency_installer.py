@@ -0,0 +1,72 @@
+import unittest
+import threading
+import time
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtTest import QTest
+from src.utils.dependency_installer import DependencyInstaller
+
+class FakeVenvManager:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def install_dependencies(self, widget_name, dependencies, progress=None):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        progress(f"Collecting {dependencies[0]}")
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        if widget_name == 'broken':
+            raise RuntimeError("No matching distribution found")
+
+class TestDependencyInstaller(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.venv_manager = FakeVenvManager()
+        self.installer = DependencyInstaller(self.venv_manager, max_concurrent=2)
+        self.events = []
+        self.installer.installProgress.connect(lambda name, line: self.events.append(('progress', name, line)))
+        self.installer.installFinished.connect(lambda name: self.events.append(('finished', name)))
+        self.installer.installFailed.connect(lambda name, message: self.events.append(('failed', name, message)))
+
+    def tearDown(self):
+        self.installer.shutdown()
+
+    def wait_for(self, count):
+        deadline = time.monotonic() + 5
+        while sum(1 for event in self.events if event[0] != 'progress') < count and time.monotonic() < deadline:
+            QTest.qWait(10)
+
+    def test_installs_run_in_background_with_concurrency_limit(self):
+        start = time.perf_counter()
+        for number in range(5):
+            self.installer.install(f'widget_{number}', ['psutil'])
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(self.installer.is_pending('widget_0'))
+
+        self.wait_for(5)
+        finished = [event[1] for event in self.events if event[0] == 'finished']
+        self.assertEqual(sorted(finished), [f'widget_{number}' for number in range(5)])
+        self.assertEqual(self.venv_manager.max_running, 2)
+        self.assertIn(('progress', 'widget_0', 'Collecting psutil'), self.events)
+        self.assertFalse(self.installer.is_pending('widget_0'))
+
+    def test_failure_is_reported(self):
+        with self.assertLogs(level='ERROR'):
+            self.installer.install('broken', ['does-not-exist'])
+            self.wait_for(1)
+        self.assertEqual(self.events[-1], ('failed', 'broken', 'No matching distribution found'))
+
+    def test_duplicate_requests_are_queued_once(self):
+        self.installer.install('clock', ['PyQt5'])
+        self.installer.install('clock', ['PyQt5'])
+        self.wait_for(1)
+        QTest.qWait(100)
+        self.assertEqual([event for event in self.events if event[0] == 'finished'], [('finished', 'clock')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from unittest import mock
+from PyQt5.QtCore import Qt, QPoint, QEvent
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtTest import QTest
+from src.utils import draggable_widget
+from src.utils.draggable_widget import DraggableWidget
+
+class MovingWidget(DraggableWidget):
+    # Zoals de meegeleverde widgets: opslaan vanuit moveEvent
+    def load_config(self):
+        return {}
+
+    def save_config(self):
+        draggable_widget.save_widget_config('moving_widget', self.config)
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.config['position'] = (self.x(), self.y())
+        self.save_config()
+
+def mouse_event(widget, event_type, pos, buttons=Qt.LeftButton):
+    button = Qt.NoButton if event_type == QEvent.MouseMove else Qt.LeftButton
+    return QMouseEvent(event_type, QPoint(*pos), widget.mapToGlobal(QPoint(*pos)), button, buttons, Qt.NoModifier)
+
+class TestDraggableWidget(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.widget = MovingWidget()
+        self.widget.setGeometry(100, 100, 200, 100)
+        self.save = mock.patch.object(draggable_widget, 'save_widget_config').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def tearDown(self):
+        self.widget.deleteLater()
+
+    def send(self, event_type, pos):
+        self.widget.event(mouse_event(self.widget, event_type, pos))
+
+    def test_drag_is_coalesced_and_saved_on_release(self):
+        self.send(QEvent.MouseButtonPress, (10, 10))
+        with mock.patch.object(self.widget, 'move', wraps=self.widget.move) as move:
+            for step in range(1, 51):
+                self.send(QEvent.MouseMove, (10 + step, 10))
+            self.assertEqual(move.call_count, 0)
+            QTest.qWait(self.widget.frame_interval() * 3)
+            self.assertEqual(move.call_count, 1)
+        self.assertEqual(self.widget.pos(), QPoint(150, 100))
+        self.save.assert_not_called()
+
+        self.send(QEvent.MouseButtonRelease, (60, 10))
+        self.save.assert_called_once()
+        self.assertEqual(self.widget.config['position'], (150, 100))
+        self.assertEqual(self.widget.config['size'], (200, 100))
+
+    def test_resize_is_applied_on_release(self):
+        self.send(QEvent.MouseButtonPress, (195, 95))
+        self.assertTrue(self.widget.resizing)
+        self.send(QEvent.MouseMove, (245, 115))
+        self.send(QEvent.MouseButtonRelease, (245, 115))
+        self.assertEqual(self.widget.size().width(), 250)
+        self.assertEqual(self.widget.size().height(), 120)
+        self.assertEqual(self.widget.config['size'], (250, 120))
+        self.save.assert_called_once()
+
+    def test_drag_positions_go_through_the_snapper(self):
+        snapper = mock.Mock()
+        snapper.snap_widget.side_effect = lambda widget, rect: QPoint(rect.x() - rect.x() % 50, rect.y())
+        snapper.local_position.side_effect = lambda widget: (widget.x(), widget.y())
+        self.widget.snapper = snapper
+        self.send(QEvent.MouseButtonPress, (10, 10))
+        self.send(QEvent.MouseMove, (33, 10))
+        self.send(QEvent.MouseButtonRelease, (33, 10))
+        self.assertEqual(self.widget.pos(), QPoint(100, 100))
+        self.assertEqual(self.widget.config['position'], (100, 100))
+        snapper.end_snap.assert_called_once_with(self.widget)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from unittest import mock
+from PyQt5.QtGui import QFont, QFontMetrics
+from PyQt5.QtWidgets import QApplication, QLabel
+from src.utils.font_fitting import FontFitter, quantise, MIN_PIXEL_SIZE
+
+class TestFontFitter(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.fitter = FontFitter()
+        self.font = QFont('Arial')
+
+    def assertFits(self, font, text, width, height):
+        metrics = QFontMetrics(font)
+        self.assertLessEqual(metrics.horizontalAdvance(text), width)
+        self.assertLessEqual(metrics.height(), height)
+
+    def test_quantise(self):
+        self.assertEqual(quantise(3), MIN_PIXEL_SIZE)
+        self.assertEqual(quantise(15), 15)
+        self.assertEqual([quantise(size) for size in (64, 67, 71, 72)], [64, 64, 64, 72])
+
+    def test_fitted_font_fits_and_is_the_largest_bucket(self):
+        for width, height in ((250, 70), (600, 300), (120, 400)):
+            font = self.fitter.fit(self.font, '23:58:58', width, height)
+            self.assertFits(font, '23:58:58', width, height)
+            larger = QFont(self.font)
+            larger.setPixelSize(quantise(font.pixelSize() + (1 << max(font.pixelSize().bit_length() - 4, 0))))
+            metrics = QFontMetrics(larger)
+            self.assertTrue(metrics.horizontalAdvance('23:58:58') > width or metrics.height() > height)
+
+    def test_max_pixel_size_caps_the_font(self):
+        self.assertEqual(self.fitter.fit(self.font, 'CPU', 1000, 1000, max_pixel_size=20).pixelSize(), 20)
+
+    def test_results_are_cached_per_bucket(self):
+        first = self.fitter.fit(self.font, '23:58:58', 400, 200)
+        self.assertIs(self.fitter.fit(self.font, '23:58:58', 400, 200), first)
+        # Een paar pixels groter valt in dezelfde bucket: hetzelfde QFont-object
+        self.assertIs(self.fitter.fit(self.font, '23:58:58', 403, 201), first)
+
+    def test_font_is_only_reapplied_when_the_bucket_changes(self):
+        label = QLabel('23:58:58')
+        fonts = [self.fitter.fit(self.font, '23:58:58', width, 200) for width in range(400, 420)]
+        with mock.patch.object(label, 'setFont', wraps=label.setFont) as set_font:
+            for font in fonts:
+                self.fitter.apply(label, font)
+        self.assertEqual(set_font.call_count, len({id(font) for font in fonts}))
+        self.assertLess(set_font.call_count, 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from PyQt5.QtCore import Qt, QPoint, QPointF, QEvent, QProcess, QRect
+from PyQt5.QtGui import QKeyEvent, QMouseEvent, QWheelEvent
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtTest import QTest
+from src.core import isolated_widget
+from src.core.isolated_widget import IsolatedWidget, wait_for_closing_widgets
+
+WIDGET_SOURCE = '''
+from PyQt5.QtWidgets import QPushButton, QWidget
+
+class Widget(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.button = QPushButton('Klik', self)
+        self.button.setGeometry(10, 10, 80, 30)
+        self.resize(200, 100)
+'''
+
+def mouse_event(widget, event_type, pos, button=Qt.LeftButton, buttons=Qt.LeftButton):
+    return QMouseEvent(event_type, QPoint(*pos), widget.mapToGlobal(QPoint(*pos)), button, buttons, Qt.NoModifier)
+
+def wait_until(condition, timeout=20):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        QTest.qWait(20)
+    return True
+
+class TestIsolatedWidget(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        mock.patch.object(IsolatedWidget, 'start_process').start()
+        self.addCleanup(mock.patch.stopall)
+        self.widget = IsolatedWidget('clock', 'clock.py', sys.executable)
+        self.widget.setGeometry(0, 0, 200, 100)
+        self.widget.interactive = [QRect(10, 10, 80, 30)]
+        self.send = mock.patch.object(self.widget, 'send').start()
+
+    def tearDown(self):
+        self.widget.close()
+        self.widget.deleteLater()
+
+    def sent(self, kind):
+        return [call.args[1] for call in self.send.call_args_list if call.args[0] == kind]
+
+    def test_backoff_doubles_up_to_the_maximum(self):
+        with mock.patch.object(isolated_widget, 'QTimer') as timer:
+            self.widget.started_at = time.monotonic()
+            for _ in range(8):
+                self.widget.schedule_restart()
+        delays = [call.args[0] for call in timer.singleShot.call_args_list]
+        self.assertEqual(delays, [1000, 2000, 4000, 8000, 16000, 32000, 60000, 60000])
+
+    def test_backoff_resets_after_a_stable_run(self):
+        self.widget.backoff_ms = 16000
+        self.widget.started_at = time.monotonic() - IsolatedWidget.STABLE_RUN_SECONDS - 1
+        with mock.patch.object(isolated_widget, 'QTimer') as timer, self.assertLogs(level='WARNING'):
+            self.widget.on_process_finished(1, QProcess.CrashExit)
+        timer.singleShot.assert_called_once_with(1000, self.widget.restart_process)
+
+    def test_closing_widget_is_not_restarted(self):
+        self.widget.closing = True
+        with mock.patch.object(isolated_widget, 'QTimer') as timer:
+            self.widget.on_process_finished(1, QProcess.CrashExit)
+            self.widget.restart_process()
+        timer.singleShot.assert_not_called()
+        IsolatedWidget.start_process.assert_called_once()
+
+    def test_clicks_on_controls_are_forwarded(self):
+        self.widget.event(mouse_event(self.widget, QEvent.MouseButtonPress, (20, 20)))
+        self.widget.event(mouse_event(self.widget, QEvent.MouseButtonRelease, (20, 20), buttons=Qt.NoButton))
+        self.assertEqual([payload['type'] for payload in self.sent('mouse')], ['press', 'release'])
+        self.assertFalse(self.widget.dragging)
+        self.assertFalse(self.widget.forwarding)
+
+    def test_presses_elsewhere_drag_the_proxy(self):
+        self.widget.event(mouse_event(self.widget, QEvent.MouseButtonPress, (150, 20)))
+        self.assertTrue(self.widget.dragging)
+        self.widget.event(mouse_event(self.widget, QEvent.MouseMove, (160, 30), Qt.NoButton))
+        self.widget.event(mouse_event(self.widget, QEvent.MouseButtonRelease, (160, 30), buttons=Qt.NoButton))
+        self.assertEqual(self.sent('mouse'), [])
+        self.assertEqual(self.sent('geometry')[-1], {'x': 10, 'y': 10, 'width': 200, 'height': 100})
+
+    def test_wheel_and_keys_are_forwarded(self):
+        self.widget.event(QWheelEvent(QPointF(20, 20), QPointF(20, 20), QPoint(), QPoint(0, 120),
+                                      Qt.NoButton, Qt.NoModifier, Qt.NoScrollPhase, False))
+        self.widget.event(QKeyEvent(QEvent.KeyPress, Qt.Key_A, Qt.NoModifier, 'a'))
+        self.assertEqual(self.sent('wheel')[0]['dy'], 120)
+        self.assertEqual(self.sent('key')[0], {'type': 'press', 'key': Qt.Key_A, 'modifiers': 0, 'text': 'a'})
+
+    def test_total_wait_is_capped(self):
+        process = mock.Mock()
+        process.state.return_value = QProcess.Running
+        process.waitForFinished.return_value = False
+        with mock.patch.object(isolated_widget, 'closing_processes', {process, mock.Mock()}):
+            wait_for_closing_widgets(0)
+            self.assertEqual(isolated_widget.closing_processes, set())
+        process.waitForFinished.assert_any_call(0)
+        process.kill.assert_called_once()
+
+
+class TestIsolatedWidgetProcess(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.module_path = os.path.join(self.temp_dir, 'button_widget.py')
+        with open(self.module_path, 'w', encoding='utf-8') as f:
+            f.write(WIDGET_SOURCE)
+        mock.patch.object(IsolatedWidget, 'INITIAL_BACKOFF_MS', 10).start()
+        self.addCleanup(mock.patch.stopall)
+        self.widget = IsolatedWidget('button_widget', self.module_path, sys.executable)
+        self.addCleanup(self.widget.deleteLater)
+        self.addCleanup(wait_for_closing_widgets, 5000)
+        self.addCleanup(self.widget.close)
+
+    def test_crashed_process_is_restarted(self):
+        self.assertTrue(wait_until(lambda: self.widget.frame is not None))
+        self.assertEqual(self.widget.interactive, [QRect(10, 10, 80, 30)])
+        first_pid = self.widget.process.processId()
+        self.widget.frame = None
+        with self.assertLogs(level='WARNING'):
+            self.widget.process.kill()
+            self.assertTrue(wait_until(lambda: self.widget.frame is not None))
+        self.assertNotEqual(self.widget.process.processId(), first_pid)
+
+    def test_close_does_not_wait_for_the_process(self):
+        self.assertTrue(wait_until(lambda: self.widget.frame is not None))
+        process = self.widget.process
+        with mock.patch.object(QProcess, 'waitForFinished') as wait:
+            self.widget.close()
+        wait.assert_not_called()
+        self.assertIn(process, isolated_widget.closing_processes)
+        self.assertTrue(wait_until(lambda: process not in isolated_widget.closing_processes))
+
+if __name__ == '__main__':
+    unittest.main()
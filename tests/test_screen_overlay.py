@@ -0,0 +1,217 @@
+import os
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+from PyQt5.QtCore import QObject, QRect, QPoint, pyqtSignal
+from PyQt5.QtGui import QRegion
+from PyQt5.QtWidgets import QApplication, QWidget
+from src.core import overlay as overlay_module
+from src.core.screen_overlay import ScreenOverlay, MASK, WINDOWS
+from src.utils.settings import Settings
+
+class FakeScreen(QObject):
+    geometryChanged = pyqtSignal(QRect)
+
+    def __init__(self, name, geometry):
+        super().__init__()
+        self.screen_name = name
+        self.rect = QRect(*geometry)
+
+    def name(self):
+        return self.screen_name
+
+    def geometry(self):
+        return self.rect
+
+def without_window_screen(test):
+    # FakeScreen is geen QScreen; setScreen() bij het tonen overslaan
+    patcher = mock.patch.object(ScreenOverlay, 'windowHandle', return_value=None)
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+class TestScreenOverlay(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.screen = FakeScreen('left', (0, 0, 1920, 1080))
+        self.overlay = ScreenOverlay(self.screen)
+        self.widget = QWidget(self.overlay)
+        self.widget.setGeometry(1700, 900, 200, 100)
+        self.overlay.track_widget('clock', self.widget)
+
+    def tearDown(self):
+        self.overlay.deleteLater()
+
+    def test_geometry_follows_screen_signal(self):
+        self.assertEqual(self.overlay.geometry(), QRect(0, 0, 1920, 1080))
+        with mock.patch.object(self.overlay, 'setGeometry', wraps=self.overlay.setGeometry) as set_geometry:
+            self.overlay.resize(800, 600)
+        set_geometry.assert_not_called()
+
+        self.screen.geometryChanged.emit(QRect(0, 0, 1280, 720))
+        self.assertEqual(self.overlay.screen_geometry, QRect(0, 0, 1280, 720))
+        self.assertEqual(self.overlay.geometry(), QRect(0, 0, 1280, 720))
+        self.assertEqual(self.widget.pos(), QPoint(1080, 620))
+        self.assertEqual(self.overlay.spatial_index.rects['clock'], (1080, 620, 200, 100))
+
+    def test_widget_outside_screen_is_reported(self):
+        left = []
+        self.overlay.widgetLeft.connect(left.append)
+        self.overlay.end_snap(self.widget)
+        self.assertEqual(left, [])
+        self.widget.move(1850, 900)
+        self.overlay.end_snap(self.widget)
+        self.assertEqual(left, [self.widget])
+
+class TestMaskMode(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        without_window_screen(self)
+        self.overlay = ScreenOverlay(FakeScreen('left', (0, 0, 1920, 1080)), MASK)
+        self.widgets = []
+        for name, geometry in (('clock', (10, 10, 200, 100)), ('notes', (150, 50, 200, 100))):
+            widget = QWidget()
+            self.overlay.adopt(widget)
+            widget.setGeometry(*geometry)
+            self.overlay.track_widget(name, widget)
+            self.widgets.append(widget)
+        self.overlay.show()
+
+    def tearDown(self):
+        self.overlay.deleteLater()
+
+    def test_empty_overlay_keeps_one_pixel(self):
+        overlay = ScreenOverlay(FakeScreen('empty', (0, 0, 3840, 2160)), MASK)
+        self.assertEqual(overlay.mask(), QRegion(0, 0, 1, 1))
+        overlay.deleteLater()
+
+    def test_mask_follows_moved_widgets(self):
+        clock, notes = self.widgets
+        self.assertEqual(self.overlay.mask(), QRegion(10, 10, 200, 100).united(QRegion(150, 50, 200, 100)))
+        clock.move(800, 600)
+        self.assertEqual(self.overlay.mask(), QRegion(800, 600, 200, 100).united(QRegion(150, 50, 200, 100)))
+        self.overlay.untrack_widget('notes', notes)
+        self.assertEqual(self.overlay.mask(), QRegion(800, 600, 200, 100))
+
+    def test_guides_are_part_of_the_mask(self):
+        self.overlay.set_guides([('vertical', 500, 0, 400)])
+        self.assertTrue(self.overlay.mask().contains(QPoint(500, 300)))
+        self.overlay.set_guides([])
+        self.assertFalse(self.overlay.mask().contains(QPoint(500, 300)))
+
+class TestWindowsMode(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        without_window_screen(self)
+        self.screen = FakeScreen('right', (1920, 0, 1280, 1024))
+        self.overlay = ScreenOverlay(self.screen, WINDOWS)
+        self.widget = QWidget()
+        self.widget.resize(200, 100)
+        self.overlay.adopt(self.widget)
+        self.overlay.place(self.widget, QPoint(50, 60))
+        self.overlay.track_widget('clock', self.widget)
+
+    def tearDown(self):
+        self.widget.deleteLater()
+        self.overlay.deleteLater()
+
+    def test_widget_is_a_window_at_screen_relative_position(self):
+        self.assertTrue(self.widget.isWindow())
+        self.assertEqual(self.widget.pos(), QPoint(1970, 60))
+        self.assertEqual(self.overlay.local_position(self.widget), (50, 60))
+        self.assertEqual(self.overlay.spatial_index.rect('clock'), (50, 60, 200, 100))
+        self.assertEqual(self.overlay.mask(), QRegion(0, 0, 1, 1))
+
+    def test_windows_follow_overlay_visibility_and_screen(self):
+        self.overlay.show()
+        self.assertTrue(self.widget.isVisible())
+        self.screen.geometryChanged.emit(QRect(2560, 0, 1280, 1024))
+        self.assertEqual(self.widget.pos(), QPoint(2610, 60))
+        self.overlay.hide()
+        self.assertFalse(self.widget.isVisible())
+
+    def test_snapping_uses_screen_coordinates(self):
+        other = QWidget()
+        other.resize(200, 100)
+        self.overlay.adopt(other)
+        self.overlay.place(other, QPoint(400, 300))
+        self.overlay.track_widget('notes', other)
+        self.addCleanup(other.deleteLater)
+        position = self.overlay.snap_widget(self.widget, QRect(1920 + 403, 297, 200, 100))
+        self.assertEqual(position, QPoint(1920 + 400, 300))
+
+class TestOverlayScreens(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        for name in ('WidgetManager', 'WidgetWatcher'):
+            mock.patch.object(overlay_module, name).start()
+        self.addCleanup(mock.patch.stopall)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        # Overlay maakt de widgetmap in Documents aan; niet in de echte home-map
+        mock.patch.object(overlay_module.Path, 'home', return_value=Path(self.temp_dir.name)).start()
+        self.settings = Settings(os.path.join(self.temp_dir.name, 'settings.json'), flush_delay=60)
+        self.addCleanup(self.settings.cancel_flush)
+        self.settings.set('widget_screens', {'clock': 'right'})
+        self.overlay = overlay_module.Overlay(self.settings)
+        self.left = FakeScreen('left', (0, 0, 1920, 1080))
+        self.right = FakeScreen('right', (1920, 0, 1280, 1024))
+        self.overlay.add_screen(self.left)
+        self.overlay.add_screen(self.right)
+        mock.patch.object(self.overlay, 'primary_overlay', return_value=self.overlay.screen_overlays[self.left]).start()
+
+    def tearDown(self):
+        for screen_overlay in self.overlay.screen_overlays.values():
+            screen_overlay.deleteLater()
+
+    def add_clock(self, position):
+        widget = QWidget()
+        widget.resize(200, 100)
+        widget.config = {'position': position}
+        self.overlay.add_widget('clock', widget)
+        return widget
+
+    def test_widget_folder_is_created_under_the_patched_home(self):
+        widget_dir = overlay_module.WidgetManager.call_args[0][0]
+        self.assertTrue(widget_dir.startswith(self.temp_dir.name))
+        self.assertTrue(os.path.isdir(widget_dir))
+
+    def test_widget_goes_to_its_saved_screen(self):
+        widget = self.add_clock((50, 60))
+        self.assertIs(widget.parentWidget(), self.overlay.screen_overlays[self.right])
+        self.assertEqual(widget.pos(), QPoint(50, 60))
+
+    def test_dragging_onto_another_screen_keeps_global_position(self):
+        widget = self.add_clock((50, 60))
+        widget.move(-150, 60)  # Midden ligt nu op het linker scherm
+        widget.snapper.end_snap(widget)
+        left_overlay = self.overlay.screen_overlays[self.left]
+        self.assertIs(widget.parentWidget(), left_overlay)
+        self.assertIs(widget.snapper, left_overlay)
+        self.assertEqual(widget.pos(), QPoint(1720, 60))
+        self.assertEqual(self.settings.get('widget_screens'), {'clock': 'left'})
+        self.assertIn('clock', left_overlay.spatial_index.rects)
+        self.assertNotIn('clock', self.overlay.screen_overlays[self.right].spatial_index.rects)
+
+    def test_precompile_waits_for_first_paint(self):
+        manager = self.overlay.widget_manager
+        manager.get_available_widgets.return_value = ['clock']
+        manager.set_isolated_widgets.return_value = set()
+        self.settings.set('active_widgets', ['clock'])
+        self.overlay.load_active_widgets()
+        self.addCleanup(self.overlay.remove_placeholder, 'clock')
+        manager.prepare_widgets.assert_not_called()
+
+        self.overlay.on_first_paint()
+        manager.prepare_widgets.assert_called_once_with(['clock'])
+        self.overlay.activation_scheduler.timer.stop()
+
+    def test_removed_screen_moves_widgets_to_primary(self):
+        widget = self.add_clock((50, 60))
+        self.overlay.remove_screen(self.right)
+        self.assertIs(widget.parentWidget(), self.overlay.screen_overlays[self.left])
+        self.assertEqual(widget.pos(), QPoint(50, 60))
+        self.assertEqual(self.settings.get('widget_screens'), {'clock': 'left'})
+
+if __name__ == '__main__':
+    unittest.main()
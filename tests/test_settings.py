@@ -1,6 +1,10 @@
 import unittest
 import os
 import json
+import time
+import threading
+from unittest import mock
+from src.utils import settings as settings_module
 from src.utils.settings import Settings
 
 class TestSettings(unittest.TestCase):
@@ -9,6 +13,7 @@ class TestSettings(unittest.TestCase):
         self.settings = Settings(self.test_filename)
 
     def tearDown(self):
+        self.settings.cancel_flush()
         if os.path.exists(self.test_filename):
             os.remove(self.test_filename)
 
@@ -26,5 +31,82 @@ class TestSettings(unittest.TestCase):
     def test_default_value(self):
         self.assertEqual(self.settings.get('non_existent_key', 'default'), 'default')
 
+class TestSettingsWrites(unittest.TestCase):
+    def setUp(self):
+        self.test_filename = 'test_settings_writes.json'
+        self.settings = Settings(self.test_filename, flush_delay=0.1)
+
+    def tearDown(self):
+        self.settings.cancel_flush()
+        for filename in (self.test_filename, f'{self.test_filename}.tmp', f'{self.test_filename}.corrupt'):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def read_file(self):
+        with open(self.test_filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_changes_are_coalesced(self):
+        with mock.patch.object(settings_module, 'write_json_atomic',
+                               wraps=settings_module.write_json_atomic) as write:
+            for x in range(50):
+                self.settings.set('position', [x, x])
+            self.assertEqual(write.call_count, 0)
+            time.sleep(0.3)
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(self.read_file()['position'], [49, 49])
+
+    def test_one_flush_thread_serves_every_change(self):
+        with mock.patch.object(settings_module.threading, 'Thread', wraps=threading.Thread) as thread:
+            for burst in range(2):
+                for x in range(50):
+                    self.settings.set('position', [burst, x])
+                time.sleep(0.3)
+                self.assertEqual(self.read_file()['position'], [burst, 49])
+        self.assertEqual(thread.call_count, 1)
+
+    def test_flush_writes_pending_changes(self):
+        self.settings.set('test_key', 'test_value')
+        self.settings.flush()
+        self.assertEqual(self.read_file()['test_key'], 'test_value')
+        self.assertFalse(self.settings.dirty)
+
+    def test_batch_writes_once(self):
+        with mock.patch.object(settings_module, 'write_json_atomic') as write:
+            with self.settings.batch():
+                self.settings.set('a', 1)
+                self.settings.set('b', 2)
+                time.sleep(0.2)
+                self.assertEqual(write.call_count, 0)
+            self.settings.flush()
+        self.assertEqual(write.call_count, 1)
+
+    def test_failed_write_keeps_previous_file(self):
+        self.settings.set('test_key', 'test_value')
+        self.settings.flush()
+        self.settings.set('broken', object())
+        with self.assertRaises(TypeError):
+            self.settings.flush()
+        self.assertEqual(self.read_file()['test_key'], 'test_value')
+        self.assertFalse(os.path.exists(f'{self.test_filename}.tmp'))
+
+    def test_unreadable_file_is_kept_as_backup(self):
+        self.settings.cancel_flush()
+        with open(self.test_filename, 'w', encoding='utf-8') as f:
+            f.write('{"test_key": "test_va')
+        with self.assertLogs(level='ERROR'):
+            settings = Settings(self.test_filename)
+        self.assertEqual(settings.settings, dict(Settings.DEFAULTS))
+        with open(f'{self.test_filename}.corrupt', 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), '{"test_key": "test_va')
+        self.assertEqual(self.read_file(), {'overlay_geometry': [100, 100, 300, 200]})
+
+    def test_unserialisable_value_in_timer_flush_is_logged(self):
+        self.settings.set('broken', object())
+        with self.assertLogs(level='ERROR') as logs:
+            self.settings.on_flush_timer()
+        self.assertIn('Fout bij opslaan van instellingen', logs.output[0])
+        self.assertTrue(self.settings.dirty)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import unittest
+import random
+from src.utils.spatial_index import SpatialIndex, intersects
+
+BOUNDS = (0, 0, 1920, 1080)
+
+class TestSpatialIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SpatialIndex(cell_size=100)
+
+    def test_query_update_and_remove(self):
+        self.index.insert('clock', (0, 0, 250, 100))
+        self.index.insert('notes', (400, 400, 250, 300))
+        self.assertEqual(self.index.query((200, 50, 100, 100)), ['clock'])
+        self.assertEqual(self.index.query((250, 0, 100, 100)), [])  # Alleen aanraken
+        self.index.insert('clock', (500, 500, 250, 100))
+        self.assertEqual(sorted(self.index.query((450, 450, 100, 100))), ['clock', 'notes'])
+        self.assertEqual(self.index.query((0, 0, 100, 100)), [])
+        self.index.remove('notes')
+        self.assertEqual(self.index.query((400, 400, 50, 50)), [])
+        self.assertNotIn('notes', self.index)
+
+    def test_query_matches_brute_force(self):
+        rng = random.Random(1)
+        for number in range(300):
+            self.index.insert(number, (rng.randrange(-100, 1900), rng.randrange(-100, 1000),
+                                       rng.randrange(1, 300), rng.randrange(1, 300)))
+        for _ in range(50):
+            area = (rng.randrange(0, 1800), rng.randrange(0, 900), rng.randrange(1, 400), rng.randrange(1, 400))
+            expected = [key for key, rect in self.index.rects.items() if intersects(rect, area)]
+            self.assertEqual(sorted(self.index.query(area)), sorted(expected))
+
+    def test_snaps_to_edges_and_centres(self):
+        self.index.insert('clock', (100, 100, 200, 100))
+        # Linkerrand 5px rechts van de rechterrand van de klok: tegen elkaar aan
+        x, y, guides = self.index.snap((305, 103, 100, 100), bounds=BOUNDS)
+        self.assertEqual((x, y), (300, 100))
+        self.assertIn(('vertical', 300, 100, 200), guides)
+        self.assertIn(('horizontal', 100, 100, 400), guides)
+
+        # Gecentreerd onder de klok, ver weg in dezelfde kolom
+        x, y, guides = self.index.snap((153, 700, 100, 50), bounds=BOUNDS)
+        self.assertEqual((x, y), (150, 700))
+        self.assertIn(('vertical', 200, 100, 750), guides)
+
+    def test_snaps_to_bounds_and_ignores_far_widgets(self):
+        self.index.insert('clock', (100, 100, 200, 100))
+        x, y, guides = self.index.snap((1816, 500, 100, 100), bounds=BOUNDS)
+        self.assertEqual((x, y), (1820, 500))
+        self.assertEqual(guides, [])
+        self.assertEqual(self.index.snap((1000, 300, 100, 100), bounds=BOUNDS)[:2], (1000, 300))
+
+    def test_dragged_widget_is_excluded(self):
+        self.index.insert('clock', (100, 100, 200, 100))
+        self.assertEqual(self.index.snap((104, 104, 200, 100), exclude='clock')[:2], (104, 104))
+
+    def test_free_slot_does_not_overlap(self):
+        rng = random.Random(2)
+        for number in range(40):
+            slot = self.index.find_free_slot(rng.randrange(100, 300), rng.randrange(80, 200), BOUNDS, margin=10)
+            self.assertIsNotNone(slot)
+            self.index.insert(number, (slot[0], slot[1], 200, 100))
+        rects = list(self.index.rects.values())
+        for number, rect in enumerate(rects):
+            self.assertTrue(all(not intersects(rect, other) for other in rects[number + 1:]))
+        self.assertEqual(self.index.rects[0][:2], (10, 10))
+
+    def test_no_free_slot_when_full(self):
+        self.index.insert('wall', (0, 0, 1920, 1080))
+        self.assertIsNone(self.index.find_free_slot(200, 100, BOUNDS))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from src.utils.settings import Settings
+from src.utils.sqlite_store import SqliteBackend
+from src.utils.widget_config import WidgetConfigStore
+
+class TestSqliteBackend(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'settings.db')
+        self.json_path = os.path.join(self.temp_dir, 'settings.json')
+        self.backends = []
+
+    def tearDown(self):
+        for backend in self.backends:
+            backend.close()
+        shutil.rmtree(self.temp_dir)
+
+    def open(self, namespace='settings'):
+        backend = SqliteBackend(self.db_path, namespace)
+        self.backends.append(backend)
+        return backend
+
+    def test_wal_mode_and_namespaces(self):
+        settings, widgets = self.open('settings'), self.open('widget_configs')
+        self.assertEqual(settings.connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        self.assertIsNone(settings.load())
+        settings.write({'theme': 'dark'})
+        widgets.write({'theme': {'color': '#FFFFFF'}})
+        self.assertEqual(settings.load(), {'theme': 'dark'})
+        self.assertEqual(widgets.load(), {'theme': {'color': '#FFFFFF'}})
+
+    def test_settings_write_only_changed_keys(self):
+        backend = self.open()
+        settings = Settings(self.json_path, flush_delay=60, backend=backend)
+        self.assertEqual(backend.load(), {'overlay_geometry': [100, 100, 300, 200]})
+        with mock.patch.object(backend, 'write', wraps=backend.write) as write:
+            for x in range(100):
+                settings.set('overlay_geometry', (x, 0, 300, 200))
+            settings.set('theme', 'dark')
+            settings.flush()
+        write.assert_called_once_with({'overlay_geometry': (99, 0, 300, 200), 'theme': 'dark'})
+        self.assertFalse(os.path.exists(self.json_path))
+        self.assertEqual(Settings(self.json_path, backend=self.open()).get('theme'), 'dark')
+
+    def test_existing_json_is_imported_and_exported(self):
+        with open(self.json_path, 'w') as f:
+            json.dump({'overlay_geometry': [1, 2, 3, 4], 'theme': 'light'}, f)
+        with self.assertLogs(level='INFO'):
+            settings = Settings(self.json_path, backend=self.open())
+        self.assertEqual(settings.get('theme'), 'light')
+
+        export_path = os.path.join(self.temp_dir, 'export.json')
+        self.assertEqual(self.open().export_json(export_path), 2)
+        with open(export_path) as f:
+            self.assertEqual(json.load(f), {'overlay_geometry': [1, 2, 3, 4], 'theme': 'light'})
+
+    def test_widget_configs_from_two_processes_are_kept(self):
+        first = WidgetConfigStore(self.json_path, flush_delay=60, backend=self.open('widget_configs'))
+        second = WidgetConfigStore(self.json_path, flush_delay=60, backend=self.open('widget_configs'))
+        first.save_widget_config('clock_widget', {'color': '#FFFFFF'})
+        second.save_widget_config('calculator_widget', {'color': '#000000'})
+        first.flush()
+        second.flush()
+        reloaded = WidgetConfigStore(self.json_path, backend=self.open('widget_configs'))
+        self.assertEqual(reloaded.get('clock_widget'), {'color': '#FFFFFF'})
+        self.assertEqual(reloaded.get('calculator_widget'), {'color': '#000000'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from unittest import mock
+from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtWidgets import QApplication, QLabel, QWidget
+from src.utils.theme import ThemeEngine, lighten_color
+
+TEMPLATE = """
+QWidget {{
+    background-color: {bg_color};
+    color: {text_color};
+}}
+"""
+
+class TestThemeEngine(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.engine = ThemeEngine(max_entries=2)
+
+    def test_stylesheets_are_compiled_once_and_shared(self):
+        first = self.engine.stylesheet(TEMPLATE, bg_color='#000000', text_color='#FFFFFF')
+        second = self.engine.stylesheet(TEMPLATE, text_color='#FFFFFF', bg_color='#000000')
+        self.assertIs(first, second)
+        self.assertIn('background-color: #000000;', first)
+
+    def test_cache_is_bounded(self):
+        for color in ('#000000', '#111111', '#222222'):
+            self.engine.stylesheet(TEMPLATE, bg_color=color, text_color='#FFFFFF')
+        self.assertEqual(len(self.engine.stylesheets), 2)
+
+    def test_unchanged_theme_is_not_reapplied(self):
+        widget = QWidget()
+        self.assertTrue(self.engine.apply_stylesheet(widget, TEMPLATE, bg_color='#000000', text_color='#FFFFFF'))
+        with mock.patch.object(widget, 'setStyleSheet') as set_style_sheet:
+            self.assertFalse(self.engine.apply_stylesheet(widget, TEMPLATE, bg_color='#000000', text_color='#FFFFFF'))
+            set_style_sheet.assert_not_called()
+        self.assertTrue(self.engine.apply_stylesheet(widget, TEMPLATE, bg_color='#222222', text_color='#FFFFFF'))
+        self.assertIn('#222222', widget.styleSheet())
+
+    def test_palettes_are_shared(self):
+        first, second = QLabel(), QLabel()
+        self.engine.apply_palette(first, WindowText='#FF0000')
+        self.engine.apply_palette(second, WindowText='#FF0000')
+        self.assertIs(self.engine.palette(WindowText='#FF0000'), self.engine.palette(WindowText='#FF0000'))
+        self.assertEqual(first.palette().color(QPalette.WindowText), QColor('#FF0000'))
+        self.assertEqual(second.palette().color(QPalette.WindowText), QColor('#FF0000'))
+
+    def test_lighten_color(self):
+        self.assertEqual(lighten_color('#000000'), QColor.fromHsl(0, 0, 20).name())
+        self.assertEqual(lighten_color('#FFFFFF'), '#ffffff')
+
+if __name__ == '__main__':
+    unittest.main()
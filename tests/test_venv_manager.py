@@ -0,0 +1,240 @@
+import unittest
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from unittest import mock
+import subprocess
+from src.utils.venv_manager import VenvManager, requirements_key, site_packages_dirs
+from src.utils.wheelhouse import has_wheels_for, widget_requirement_sets
+
+def fake_venv_create(path, with_pip=True):
+    if sys.platform == 'win32':
+        site_packages = os.path.join(path, 'Lib', 'site-packages')
+    else:
+        site_packages = os.path.join(path, 'lib', f'python{sys.version_info[0]}.{sys.version_info[1]}',
+                                     'site-packages')
+    os.makedirs(site_packages)
+    with open(os.path.join(path, 'pyvenv.cfg'), 'w') as f:
+        f.write('home = test\n')
+
+def install_distribution(venv_path, name, version, requires=()):
+    dist_info = os.path.join(site_packages_dirs(venv_path)[0], f'{name}-{version}.dist-info')
+    os.makedirs(dist_info)
+    with open(os.path.join(dist_info, 'METADATA'), 'w') as f:
+        f.write(f'Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n')
+        for requirement in requires:
+            f.write(f'Requires-Dist: {requirement}\n')
+
+class TestVenvManager(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        patcher = mock.patch('src.utils.venv_manager.venv.create', side_effect=fake_venv_create)
+        self.venv_create = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def wait_for_removals(self, manager):
+        # Eén worker: alles wat eerder is ingediend is dan klaar
+        manager.remover.submit(lambda: None).result()
+
+    def test_key_ignores_order_case_and_spelling(self):
+        self.assertEqual(requirements_key(['PyQt5==5.15.6', 'psutil>=5.8,<6']),
+                         requirements_key(['psutil <6, >=5.8', 'pyqt5==5.15.6', 'PyQt5==5.15.6']))
+        self.assertNotEqual(requirements_key(['psutil==5.8.0']), requirements_key(['psutil==5.9.0']))
+
+    def test_widgets_with_same_requirements_share_a_venv(self):
+        manager = VenvManager(self.temp_dir)
+        clock = manager.create_widget_venv('clock', ['PyQt5==5.15.6'])
+        todo = manager.create_widget_venv('todo', ['pyqt5==5.15.6'])
+        self.assertEqual(clock, todo)
+        self.assertEqual(self.venv_create.call_count, 1)
+        self.assertEqual(manager.reference_count(manager.widgets['clock']), 2)
+        self.assertEqual(manager.get_python_executable('todo'), manager.get_python_executable('clock'))
+
+    def test_registry_is_persisted(self):
+        VenvManager(self.temp_dir).create_widget_venv('clock', ['PyQt5==5.15.6'])
+        manager = VenvManager(self.temp_dir)
+        self.assertEqual(manager.widgets['clock'], requirements_key(['PyQt5==5.15.6']))
+
+    def test_unused_venvs_are_collected_least_recently_used_first(self):
+        manager = VenvManager(self.temp_dir, max_unused=1)
+        paths = [manager.create_widget_venv('widget', [f'psutil=={version}'])
+                 for version in ('5.7.0', '5.8.0', '5.9.0')]
+        self.wait_for_removals(manager)
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertTrue(os.path.exists(paths[1]))
+        self.assertTrue(os.path.exists(paths[2]))
+
+        manager.prune([])
+        self.wait_for_removals(manager)
+        self.assertFalse(os.path.exists(paths[1]))
+        self.assertTrue(os.path.exists(paths[2]))
+        self.assertEqual(list(manager.venvs), [requirements_key(['psutil==5.9.0'])])
+
+    def test_shared_venv_survives_until_last_widget_is_released(self):
+        manager = VenvManager(self.temp_dir, max_unused=0)
+        path = manager.create_widget_venv('clock', ['PyQt5==5.15.6'])
+        manager.create_widget_venv('todo', ['PyQt5==5.15.6'])
+        manager.release_widget('clock')
+        self.wait_for_removals(manager)
+        self.assertTrue(os.path.exists(path))
+        manager.release_widget('todo')
+        self.wait_for_removals(manager)
+        self.assertFalse(os.path.exists(path))
+
+    def test_released_venv_is_collected_last(self):
+        # Elke tijdstempel verschillend, ook met de grove klok van Windows
+        clock_ticks = itertools.count(1)
+        mock.patch('src.utils.venv_manager.time', mock.Mock(time=lambda: next(clock_ticks))).start()
+        self.addCleanup(mock.patch.stopall)
+        manager = VenvManager(self.temp_dir, max_unused=2)
+        clock = manager.create_widget_venv('clock', ['PyQt5==5.15.6'])
+        first = manager.create_widget_venv('first', ['psutil==5.8.0'])
+        second = manager.create_widget_venv('second', ['psutil==5.9.0'])
+        manager.release_widget('first')
+        manager.release_widget('second')
+        manager.release_widget('clock')
+        self.wait_for_removals(manager)
+        self.assertTrue(os.path.exists(clock))
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+
+    def test_venvs_are_removed_off_the_calling_thread(self):
+        manager = VenvManager(self.temp_dir, max_unused=0)
+        manager.create_widget_venv('clock', ['PyQt5==5.15.6'])
+        removed_on = []
+        with mock.patch('src.utils.venv_manager.shutil.rmtree',
+                        side_effect=lambda path: removed_on.append(threading.current_thread())):
+            manager.release_widget('clock')
+            self.wait_for_removals(manager)
+        self.assertEqual(len(removed_on), 1)
+        self.assertIsNot(removed_on[0], threading.current_thread())
+
+    def test_venv_taken_back_into_use_is_kept(self):
+        manager = VenvManager(self.temp_dir, max_unused=0)
+        path = manager.create_widget_venv('clock', ['PyQt5==5.15.6'])
+        blocker = threading.Event()
+        manager.remover.submit(blocker.wait)
+        manager.release_widget('clock')
+        manager.create_widget_venv('clock', ['PyQt5==5.15.6'])
+        blocker.set()
+        self.wait_for_removals(manager)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(self.venv_create.call_count, 1)
+
+class TestInstallDependencies(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        patcher = mock.patch('src.utils.venv_manager.venv.create', side_effect=fake_venv_create)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('src.utils.venv_manager.VenvManager.run_pip')
+        self.run = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = VenvManager(self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_satisfied_requirements_skip_pip(self):
+        dependencies = ['psutil>=5.8', 'pywin32; sys_platform == "nonexistent"']
+        install_distribution(self.manager.create_widget_venv('monitor', dependencies), 'psutil', '5.9.0')
+        self.manager.install_dependencies('monitor', dependencies)
+        self.run.assert_not_called()
+
+    def test_missing_requirements_are_installed_in_one_call(self):
+        dependencies = ['psutil>=5.8', 'requests==2.26.0', 'icalendar']
+        install_distribution(self.manager.create_widget_venv('calendar', dependencies), 'psutil', '5.7.0')
+        self.manager.install_dependencies('calendar', dependencies)
+        self.run.assert_called_once()
+        widget_name, args, _ = self.run.call_args[0]
+        self.assertEqual(widget_name, 'calendar')
+        self.assertEqual(args, ['install', 'psutil>=5.8', 'requests==2.26.0', 'icalendar'])
+
+    def test_missing_extra_dependency_triggers_install(self):
+        dependencies = ['requests[socks]']
+        venv_path = self.manager.create_widget_venv('chat', dependencies)
+        install_distribution(venv_path, 'requests', '2.26.0', ['PySocks>=1.5.6; extra == "socks"'])
+        self.manager.install_dependencies('chat', dependencies)
+        self.run.assert_called_once()
+
+        install_distribution(venv_path, 'PySocks', '1.7.1')
+        self.run.reset_mock()
+        self.manager.install_dependencies('chat', dependencies)
+        self.run.assert_not_called()
+
+    def test_lock_file_skips_metadata_scan(self):
+        dependencies = ['psutil']
+        install_distribution(self.manager.create_widget_venv('monitor', dependencies), 'psutil', '5.9.0')
+        self.manager.install_dependencies('monitor', dependencies)
+        with mock.patch('src.utils.venv_manager.missing_requirements') as missing:
+            self.manager.install_dependencies('monitor', dependencies)
+        missing.assert_not_called()
+
+    def test_unwritable_lock_file_fails_the_install(self):
+        dependencies = ['psutil']
+        install_distribution(self.manager.create_widget_venv('monitor', dependencies), 'psutil', '5.9.0')
+        with mock.patch('builtins.open', side_effect=PermissionError('read-only')):
+            with self.assertRaises(PermissionError):
+                self.manager.install_dependencies('monitor', dependencies)
+        self.assertFalse(self.manager.is_ready(dependencies))
+
+class TestWheelhouse(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.wheelhouse = os.path.join(self.temp_dir, 'wheelhouse')
+        patcher = mock.patch('src.utils.venv_manager.venv.create', side_effect=fake_venv_create)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('src.utils.venv_manager.VenvManager.run_pip')
+        self.run = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = VenvManager(self.temp_dir, wheelhouse_dir=self.wheelhouse)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def add_wheel(self, filename):
+        os.makedirs(self.wheelhouse, exist_ok=True)
+        open(os.path.join(self.wheelhouse, filename), 'w').close()
+
+    def pip_commands(self):
+        return [call[0][1][0] for call in self.run.call_args_list]
+
+    def test_present_wheels_are_installed_offline(self):
+        self.add_wheel('psutil-5.8.0-cp39-cp39-win_amd64.whl')
+        self.add_wheel('PyQt5_sip-12.9.0-cp39-cp39-win_amd64.whl')
+        self.assertTrue(has_wheels_for(self.wheelhouse, ['psutil==5.8.0', 'pyqt5-sip']))
+        self.manager.install_dependencies('monitor', ['psutil==5.8.0'])
+        self.assertEqual(self.pip_commands(), ['install'])
+        self.assertIn('--no-index', self.run.call_args[0][1])
+
+    def test_downloads_fill_the_wheelhouse_first(self):
+        self.manager.install_dependencies('monitor', ['psutil==5.8.0'])
+        self.assertEqual(self.pip_commands(), ['wheel', 'install'])
+        wheel_args = self.run.call_args_list[0][0][1]
+        self.assertEqual(wheel_args[wheel_args.index('--wheel-dir') + 1], self.wheelhouse)
+
+    def test_incomplete_wheelhouse_falls_back_to_download(self):
+        self.add_wheel('psutil-5.7.0-cp39-cp39-win_amd64.whl')
+        self.run.side_effect = [subprocess.CalledProcessError(1, 'pip'), None, None]
+        with self.assertLogs(level='INFO'):
+            self.manager.install_dependencies('monitor', ['psutil==5.8.0'])
+        self.assertEqual(self.pip_commands(), ['install', 'wheel', 'install'])
+
+    def test_requirement_sets_from_widget_headers(self):
+        widget_dir = os.path.join(self.temp_dir, 'widgets')
+        os.makedirs(widget_dir)
+        for name, dependencies in (('a', 'psutil\nPyQt5==5.15.6'), ('b', 'PyQt5==5.15.6\npsutil'),
+                                   ('c', 'PyQt5==5.15.9'), ('d', '')):
+            with open(os.path.join(widget_dir, f'{name}.py'), 'w') as f:
+                f.write(f'"""\nDependencies:\n{dependencies}\n"""\nWidget = object\n')
+        self.assertEqual(widget_requirement_sets(widget_dir), [['PyQt5==5.15.6', 'psutil'], ['PyQt5==5.15.9']])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import CancelledError
+from unittest import mock
+from src.utils.venv_manager import VenvManager
+from src.utils.venv_worker import VenvWorker
+
+class TestVenvWorker(unittest.TestCase):
+    def setUp(self):
+        self.worker = VenvWorker(sys.executable, timeout=10)
+
+    def tearDown(self):
+        self.worker.stop()
+
+    def test_run_captures_output_and_exit_code(self):
+        self.assertEqual(self.worker.run('print("hallo")'), {'stdout': 'hallo\n', 'stderr': '', 'returncode': 0,
+                                                             'id': 1})
+        result = self.worker.run('import sys; sys.exit(3)')
+        self.assertEqual(result['returncode'], 3)
+        result = self.worker.run('raise ValueError("kapot")')
+        self.assertEqual(result['returncode'], 1)
+        self.assertIn('ValueError: kapot', result['stderr'])
+
+    def test_imports_stay_warm_between_commands(self):
+        self.assertEqual(self.worker.warm(['json', 'does_not_exist_module']).keys(), {'does_not_exist_module'})
+        pid = self.worker.process.pid
+        result = self.worker.run('import sys; print("json" in sys.modules)')
+        self.assertEqual(result['stdout'], 'True\n')
+        self.assertEqual(self.worker.process.pid, pid)
+
+    def test_stray_writes_do_not_corrupt_the_protocol(self):
+        result = self.worker.run('import os; os.write(1, b"garbage")')
+        self.assertEqual(result['returncode'], 0)
+        self.assertEqual(self.worker.run('print(1)')['stdout'], '1\n')
+
+    def test_timeout_kills_and_next_request_restarts(self):
+        self.worker.run('pass')
+        pid = self.worker.process.pid
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.worker.run('import time; time.sleep(30)', timeout=0.5)
+        self.assertEqual(self.worker.run('print(2)')['stdout'], '2\n')
+        self.assertNotEqual(self.worker.process.pid, pid)
+
+    def test_cancel_from_another_thread(self):
+        self.worker.run('pass')
+        threading.Timer(0.3, self.worker.cancel).start()
+        with self.assertRaises(CancelledError):
+            self.worker.run('import time; time.sleep(30)')
+        self.assertEqual(self.worker.run('print(3)')['stdout'], '3\n')
+
+    def test_crashed_worker_is_restarted(self):
+        with self.assertRaises(ChildProcessError):
+            self.worker.run('import os; os._exit(1)')
+        with self.assertLogs(level='INFO'):
+            self.assertEqual(self.worker.run('print(4)')['stdout'], '4\n')
+
+class TestRunInVenv(unittest.TestCase):
+    def test_run_in_venv_uses_one_worker(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        manager = VenvManager(temp_dir)
+        self.addCleanup(manager.shutdown_workers)
+        with mock.patch.object(manager, 'get_python_executable', return_value=sys.executable):
+            self.assertEqual(manager.run_in_venv('print(40 + 2)'), '42\n')
+            start = time.perf_counter()
+            manager.run_in_venv('print(1)')
+            self.assertLess(time.perf_counter() - start, 0.05)
+            with self.assertRaises(subprocess.CalledProcessError), self.assertLogs(level='ERROR'):
+                manager.run_in_venv('raise SystemExit("fout")')
+        self.assertEqual(len(manager.workers), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+from src.utils import widget_config
+from src.utils.widget_config import WidgetConfigStore
+
+class TestWidgetConfigStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'appdata', 'widget_configs.json')
+        self.store = WidgetConfigStore(self.path, flush_delay=60)
+
+    def tearDown(self):
+        self.store.cancel_flush()
+        shutil.rmtree(self.temp_dir)
+
+    def read_file(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_defaults_and_stored_values_are_merged(self):
+        self.store.save_widget_config('clock_widget', {'color': '#000000'})
+        config = self.store.load_widget_config('clock_widget', {'color': '#FFFFFF', 'size': (250, 100)})
+        self.assertEqual(config, {'color': '#000000', 'size': (250, 100)})
+
+    def test_dragging_does_not_write_until_flush(self):
+        config = {'position': (0, 0)}
+        with mock.patch.object(widget_config, 'write_json_atomic',
+                               wraps=widget_config.write_json_atomic) as write:
+            for x in range(300):
+                config['position'] = (x, x)
+                self.store.save_widget_config('clock_widget', config)
+            self.assertEqual(write.call_count, 0)
+            self.store.flush()
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(self.read_file(), {'clock_widget': {'position': [299, 299]}})
+
+    def test_saved_config_is_a_copy(self):
+        config = {'items': ['a']}
+        self.store.save_widget_config('todo', config)
+        config['items'].append('b')
+        self.assertEqual(self.store.get('todo'), {'items': ['a']})
+
+    def test_legacy_config_is_migrated_once(self):
+        legacy_path = os.path.join(self.temp_dir, 'clock_widget_config.json')
+        with open(legacy_path, 'w') as f:
+            json.dump({'color': '#123456'}, f)
+        with self.assertLogs(level='INFO'):
+            config = self.store.load_widget_config('clock_widget', {'color': '#FFFFFF'}, legacy_path)
+        self.assertEqual(config['color'], '#123456')
+        self.assertFalse(os.path.exists(legacy_path))
+        self.assertTrue(os.path.exists(f'{legacy_path}.migrated'))
+        self.assertEqual(WidgetConfigStore(self.path).get('clock_widget'), {'color': '#123456'})
+
+    def test_writes_from_other_processes_are_kept(self):
+        other = WidgetConfigStore(self.path, flush_delay=60)
+        self.store.save_widget_config('clock_widget', {'color': '#FFFFFF'})
+        other.save_widget_config('calculator_widget', {'size': [300, 450]})
+        other.flush()
+        self.store.flush()
+        self.assertEqual(set(self.read_file()), {'clock_widget', 'calculator_widget'})
+
+    def test_concurrent_writers_lose_no_updates(self):
+        writer = ('import sys\n'
+                  'from src.utils.widget_config import WidgetConfigStore\n'
+                  'store = WidgetConfigStore(sys.argv[1], flush_delay=60)\n'
+                  'for i in range(40):\n'
+                  '    store.save_widget_config(f"{sys.argv[2]}-{i}", {"i": i})\n'
+                  '    store.save()\n')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        processes = [subprocess.Popen([sys.executable, '-c', writer, self.path, name], cwd=root)
+                     for name in ('overlay', 'isolated')]
+        for process in processes:
+            self.assertEqual(process.wait(timeout=60), 0)
+        self.assertEqual(len(self.read_file()), 80)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import os
+import shutil
+import tempfile
+from src.utils import widget_header
+from src.utils.widget_header import parse_requirements, read_widget_header
+from src.utils.widget_index import parse_dependencies
+
+class TestWidgetHeader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_widget(self, source):
+        path = os.path.join(self.temp_dir, 'widget.py')
+        with open(path, 'wb') as f:
+            f.write(source.encode('utf-8'))
+        return path
+
+    def test_later_docstrings_are_ignored(self):
+        path = self.write_widget('"""\nWidget zonder afhankelijkheden\n"""\n\n'
+                                 'def helper():\n    """\n    Dependencies:\n    evil-package\n    """\n')
+        self.assertEqual(parse_dependencies(path), [])
+
+    def test_comments_before_docstring_and_utf8(self):
+        path = self.write_widget('# -*- coding: utf-8 -*-\n# Één widget\n'
+                                 '"""\nKlok — überwidget\n\nDependencies:\npsutil>=5.8\n"""\n')
+        self.assertIn('überwidget', read_widget_header(path))
+        self.assertEqual(parse_dependencies(path), ['psutil>=5.8'])
+
+    def test_markers_comments_and_invalid_lines(self):
+        path = self.write_widget('"""\nDependencies:\n# optioneel\n'
+                                 'pywin32; sys_platform == "win32"\nrequests[socks]>=2.26\nnot a requirement!\n"""\n')
+        with self.assertLogs(level='WARNING'):
+            dependencies = parse_dependencies(path)
+        self.assertEqual(dependencies, ['pywin32; sys_platform == "win32"', 'requests[socks]>=2.26'])
+
+        requirements = parse_requirements(dependencies)
+        self.assertEqual([r.name for r in requirements], ['pywin32', 'requests'])
+        self.assertEqual(requirements[1].extras, {'socks'})
+        self.assertIsNotNone(requirements[0].marker)
+
+    def test_only_header_is_read(self):
+        body = 'x = 1\n' * 200000 + '"""unterminated'
+        path = self.write_widget('"""\nDependencies:\npsutil\n"""\n' + body)
+        reads = []
+        real_open = open
+
+        class CountingFile:
+            def __init__(self, f):
+                self.f = f
+
+            def read(self, size=-1):
+                data = self.f.read(size)
+                reads.append(len(data))
+                return data
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                self.f.close()
+
+        widget_header.open = lambda *args, **kwargs: CountingFile(real_open(*args, **kwargs))
+        try:
+            self.assertEqual(parse_dependencies(path), ['psutil'])
+        finally:
+            del widget_header.open
+        self.assertLessEqual(sum(reads), widget_header.HEADER_CHUNK_SIZE)
+
+    def test_long_docstring_spans_chunks(self):
+        filler = 'Lange beschrijving.\n' * 1000
+        path = self.write_widget(f'"""\n{filler}\nDependencies:\npsutil\n"""\n')
+        self.assertEqual(parse_dependencies(path), ['psutil'])
+
+    def test_plain_and_escaped_docstrings_read_alike(self):
+        cases = (('"""\r\nKlok\r\nDependencies:\r\npsutil\r\n"""\r\n', '\nKlok\nDependencies:\npsutil\n'),
+                 ("\n# widget\n'''Klok'''\n", 'Klok'),
+                 ('"""Klok\\tpsutil"""\n', 'Klok\tpsutil'),
+                 ('r"""Klok\\tpsutil"""\n', 'Klok\\tpsutil'))
+        for source, expected in cases:
+            self.assertEqual(read_widget_header(self.write_widget(source)), expected)
+
+    def test_requirements_are_parsed_once(self):
+        first = parse_requirements(['psutil>=5.8'])
+        self.assertIs(parse_requirements(['psutil>=5.8'])[0], first[0])
+        self.assertIs(parse_requirements(first)[0], first[0])
+
+    def test_missing_docstring(self):
+        self.assertEqual(parse_dependencies(self.write_widget('import os\n')), [])
+        self.assertEqual(parse_dependencies(self.write_widget('')), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+from unittest import mock
+from PyQt5.QtCore import Qt
+from PyQt5.QtNetwork import QLocalServer
+from PyQt5.QtWidgets import QApplication
+from src.core.widget_host import WidgetHost
+from src.utils.widget_ipc import MessageReader
+
+WIDGET_SOURCE = '''
+from PyQt5.QtWidgets import QLineEdit, QPushButton, QWidget
+
+class Widget(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.clicks = 0
+        self.button = QPushButton('Klik', self)
+        self.button.setGeometry(10, 10, 80, 30)
+        self.button.clicked.connect(self.on_click)
+        self.edit = QLineEdit(self)
+        self.edit.setGeometry(10, 50, 80, 30)
+        self.resize(200, 100)
+
+    def on_click(self):
+        self.clicks += 1
+'''
+
+class TestWidgetHost(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        module_path = os.path.join(self.temp_dir, 'host_widget.py')
+        with open(module_path, 'w', encoding='utf-8') as f:
+            f.write(WIDGET_SOURCE)
+
+        self.server = QLocalServer()
+        self.server.listen(f"imolia-test-{uuid.uuid4().hex}")
+        self.addCleanup(self.server.close)
+        self.host = WidgetHost(self.server.fullServerName(), 'host_widget', module_path)
+        self.host.frame_timer.stop()
+        # Anders stopt het verbreken van de verbinding de testrun
+        self.host.socket.disconnected.disconnect()
+        self.server.waitForNewConnection(5000)
+        self.socket = self.server.nextPendingConnection()
+        self.reader = MessageReader()
+
+    def tearDown(self):
+        self.host.socket.abort()
+        self.host.widget.deleteLater()
+        self.host.deleteLater()
+
+    def receive(self):
+        messages = []
+        while self.socket.waitForReadyRead(200):
+            messages.extend(self.reader.feed(bytes(self.socket.readAll())))
+        return messages
+
+    def click(self, x, y):
+        for kind, buttons in (('press', int(Qt.LeftButton)), ('release', 0)):
+            self.host.on_mouse({'type': kind, 'x': x, 'y': y, 'button': int(Qt.LeftButton),
+                                'buttons': buttons, 'modifiers': 0})
+
+    def test_hello_and_frames_are_sent(self):
+        self.host.send_frame()
+        messages = self.receive()
+        self.assertEqual([kind for kind, _, _ in messages], ['hello', 'frame'])
+        self.assertEqual(messages[0][1]['size'], [200, 100])
+        frame = messages[1][1]
+        self.assertEqual(len(messages[1][2]), frame['width'] * frame['height'] * 4)
+        self.assertIn([10, 10, 80, 30], frame['interactive'])
+
+    def test_unchanged_frame_is_sent_once(self):
+        with mock.patch.object(self.host, 'send') as send:
+            self.host.send_frame()
+            self.host.send_frame()
+        self.assertEqual(send.call_count, 1)
+
+    def test_clicks_reach_the_child_under_the_cursor(self):
+        self.click(20, 20)
+        self.assertEqual(self.host.widget.clicks, 1)
+        self.click(150, 20)
+        self.assertEqual(self.host.widget.clicks, 1)
+
+    def test_keys_go_to_the_focused_child(self):
+        self.click(20, 60)
+        for kind in ('press', 'release'):
+            self.host.on_key({'type': kind, 'key': Qt.Key_A, 'modifiers': 0, 'text': 'a'})
+        self.assertEqual(self.host.widget.edit.text(), 'a')
+
+    def test_geometry_follows_the_proxy(self):
+        self.host.on_geometry({'x': 5, 'y': 6, 'width': 300, 'height': 150})
+        self.assertEqual(self.host.widget.size().width(), 300)
+        self.assertEqual(self.host.widget.size().height(), 150)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import os
+import shutil
+import tempfile
+from src.utils.widget_index import WidgetIndex, discover_widget_modules
+from src.utils.widget_loader import load_widgets
+
+WIDGET_SOURCE = '''"""
+Test Widget
+
+Display Name: Test Clock
+
+Dependencies:
+psutil==5.8.0
+"""
+
+raise RuntimeError("widget modules must not be executed during discovery")
+
+Widget = object
+'''
+
+class TestWidgetIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.widget_dir = os.path.join(self.temp_dir, 'widgets')
+        os.makedirs(self.widget_dir)
+        self.index_path = os.path.join(self.temp_dir, 'cache', 'widget_index.json')
+        self.write_widget('test_widget.py', WIDGET_SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_widget(self, filename, source):
+        with open(os.path.join(self.widget_dir, filename), 'w') as f:
+            f.write(source)
+
+    def test_discovery_does_not_execute_widgets(self):
+        widgets = load_widgets(self.widget_dir, WidgetIndex(self.index_path))
+        self.assertEqual(list(widgets), ['test_widget'])
+        self.assertIsNone(widgets['test_widget']['class'])
+        self.assertEqual(widgets['test_widget']['dependencies'], ['psutil==5.8.0'])
+        self.assertEqual(widgets['test_widget']['display_name'], 'Test Clock')
+
+    def test_module_without_widget_is_skipped(self):
+        self.write_widget('helper.py', 'VALUE = 1\n')
+        widgets = load_widgets(self.widget_dir, WidgetIndex(self.index_path))
+        self.assertNotIn('helper', widgets)
+
+    def test_index_is_persisted_and_reused(self):
+        load_widgets(self.widget_dir, WidgetIndex(self.index_path))
+        self.assertTrue(os.path.exists(self.index_path))
+
+        index = WidgetIndex(self.index_path)
+        load_widgets(self.widget_dir, index)
+        self.assertFalse(index.dirty)
+
+    def test_changed_widget_is_rescanned(self):
+        load_widgets(self.widget_dir, WidgetIndex(self.index_path))
+        self.write_widget('test_widget.py', WIDGET_SOURCE.replace('psutil==5.8.0', 'requests==2.26.0'))
+
+        widgets = load_widgets(self.widget_dir, WidgetIndex(self.index_path))
+        self.assertEqual(widgets['test_widget']['dependencies'], ['requests==2.26.0'])
+
+    def test_removed_widget_is_pruned(self):
+        index = WidgetIndex(self.index_path)
+        load_widgets(self.widget_dir, index)
+        os.remove(os.path.join(self.widget_dir, 'test_widget.py'))
+        self.assertEqual(load_widgets(self.widget_dir, index), {})
+        self.assertEqual(index.entries, {})
+
+class TestWidgetDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.widget_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.widget_dir)
+
+    def write_file(self, relative_path, content=WIDGET_SOURCE):
+        path = os.path.join(self.widget_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_shipped_widget_packages_are_found(self):
+        repo_widgets = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'widgets')
+        widgets = load_widgets(repo_widgets, WidgetIndex())
+        self.assertEqual(sorted(widgets), sorted([
+            'calculator', 'clock_widget', 'google_calendar_widget', 'LLMChat',
+            'modern_todo_widget', 'Pomodoro Productivity Timer', 'Quick Notes',
+            'system_monitor_widget']))
+        self.assertEqual(widgets['clock_widget']['path'],
+                         os.path.join(repo_widgets, 'clock_widget', 'clock_widget.py'))
+
+    def test_package_main_module_selection(self):
+        self.write_file('top.py')
+        named = self.write_file(os.path.join('named', 'named.py'))
+        self.write_file(os.path.join('named', 'helpers.py'), 'VALUE = 1\n')
+        single = self.write_file(os.path.join('single', 'SingleWidget.py'))
+        manifest = self.write_file(os.path.join('manifest', 'entry.py'))
+        self.write_file(os.path.join('manifest', 'other.py'))
+        self.write_file(os.path.join('manifest', 'widget.json'), '{"main": "entry.py"}')
+        self.write_file(os.path.join('ambiguous', 'one.py'))
+        self.write_file(os.path.join('ambiguous', 'two.py'))
+
+        module_paths, _ = discover_widget_modules(self.widget_dir, WidgetIndex())
+        self.assertEqual(module_paths, [
+            os.path.join(self.widget_dir, 'top.py'), manifest, named, single])
+
+    def test_nested_folders_are_walked(self):
+        nested = self.write_file(os.path.join('collection', 'nested', 'nested.py'))
+        module_paths, _ = discover_widget_modules(self.widget_dir, WidgetIndex())
+        self.assertEqual(module_paths, [nested])
+
+    def test_unchanged_directories_are_not_rescanned(self):
+        self.write_file(os.path.join('package', 'package.py'))
+        index = WidgetIndex()
+        discover_widget_modules(self.widget_dir, index)
+        index.dirty = False
+
+        discover_widget_modules(self.widget_dir, index)
+        self.assertFalse(index.dirty)
+
+if __name__ == '__main__':
+    unittest.main()
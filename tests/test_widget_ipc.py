@@ -0,0 +1,24 @@
+import unittest
+from src.utils.widget_ipc import MessageReader, encode_message
+
+class TestWidgetIpc(unittest.TestCase):
+    def test_messages_survive_arbitrary_chunking(self):
+        stream = (encode_message('hello', {'position': [10, 20]}) +
+                  encode_message('frame', {'width': 2, 'height': 1}, b'\x01\x02\x03\x04' * 2))
+        reader = MessageReader()
+        messages = []
+        for i in range(0, len(stream), 3):
+            messages.extend(reader.feed(stream[i:i + 3]))
+
+        self.assertEqual(messages, [
+            ('hello', {'position': [10, 20]}, b''),
+            ('frame', {'width': 2, 'height': 1}, b'\x01\x02\x03\x04' * 2),
+        ])
+        self.assertEqual(reader.buffer, bytearray())
+
+    def test_corrupt_length_is_rejected(self):
+        with self.assertRaises(ValueError):
+            MessageReader().feed(b'\xff\xff\xff\xff\x00\x00\x00\x01')
+
+if __name__ == '__main__':
+    unittest.main()
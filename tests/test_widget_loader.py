@@ -0,0 +1,150 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+from src.utils import widget_loader
+from src.utils.bytecode_cache import BytecodeCache
+from src.utils.widget_index import WidgetIndex
+from src.utils.widget_loader import ModuleCache, WidgetManager, load_widgets
+
+WIDGET_SOURCE = '''"""
+Dependencies:
+"""
+
+class Widget:
+    pass
+'''
+
+class TestModuleCache(unittest.TestCase):
+    def setUp(self):
+        self.widget_dir = tempfile.mkdtemp()
+        self.module_path = os.path.join(self.widget_dir, 'cached_widget.py')
+        self.write_widget(WIDGET_SOURCE)
+        self.cache = ModuleCache()
+        bytecode_dir = os.path.join(self.widget_dir, '.bytecode')
+        patcher = mock.patch.object(widget_loader, 'bytecode_cache', BytecodeCache(bytecode_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.widget_dir)
+
+    def write_widget(self, source):
+        with open(self.module_path, 'w') as f:
+            f.write(source)
+
+    def get_widget_module(self):
+        info = load_widgets(self.widget_dir, WidgetIndex())['cached_widget']
+        return self.cache.get_module('cached_widget', info['path'], info['hash'])
+
+    def test_unchanged_widget_is_imported_once(self):
+        first = self.get_widget_module()
+        second = self.get_widget_module()
+        self.assertIs(first, second)
+        self.assertIs(first.Widget, second.Widget)
+        self.assertEqual(self.cache.stats, {'imports': 1, 'avoided': 1})
+
+    def test_changed_widget_is_reimported(self):
+        first = self.get_widget_module()
+        self.write_widget(WIDGET_SOURCE + '\nVERSION = 2\n')
+        second = self.get_widget_module()
+        self.assertIsNot(first, second)
+        self.assertEqual(second.VERSION, 2)
+        self.assertEqual(self.cache.stats, {'imports': 2, 'avoided': 0})
+
+    def test_precompiled_code_is_executed_once(self):
+        info = load_widgets(self.widget_dir, WidgetIndex())['cached_widget']
+        self.cache.precompile([(info['path'], info['hash'])])
+        self.assertIn(info['path'], self.cache.code)
+
+        module = self.cache.get_module('cached_widget', info['path'], info['hash'])
+        self.assertTrue(hasattr(module, 'Widget'))
+        self.assertEqual(self.cache.code, {})
+        self.assertEqual(self.cache.stats, {'imports': 1, 'avoided': 0})
+
+    def test_stale_precompiled_code_is_ignored(self):
+        info = load_widgets(self.widget_dir, WidgetIndex())['cached_widget']
+        self.write_widget(WIDGET_SOURCE + '\nVERSION = 2\n')
+        self.cache.precompile([(info['path'], info['hash'])])
+        self.assertEqual(self.cache.code, {})
+
+    def test_code_compiled_after_activation_is_dropped(self):
+        info = load_widgets(self.widget_dir, WidgetIndex())['cached_widget']
+        compile_source = widget_loader.compile_widget_source
+
+        def activate_while_compiling(path):
+            # De widget wordt geactiveerd terwijl de achtergrond-precompile nog loopt
+            compile_mock.side_effect = compile_source
+            self.cache.get_module('cached_widget', info['path'], info['hash'])
+            return compile_source(path)
+
+        with mock.patch.object(widget_loader, 'compile_widget_source',
+                               side_effect=activate_while_compiling) as compile_mock:
+            self.cache.precompile([(info['path'], info['hash'])])
+        self.assertEqual(self.cache.code, {})
+        self.assertEqual(self.cache.stats, {'imports': 1, 'avoided': 0})
+
+    def test_prune_drops_removed_widgets(self):
+        self.get_widget_module()
+        self.cache.prune([])
+        self.assertEqual(self.cache.modules, {})
+
+class TestReloadChangedWidgets(unittest.TestCase):
+    def setUp(self):
+        self.widget_dir = tempfile.mkdtemp()
+        for name in ('first_widget', 'second_widget'):
+            self.write_file(f'{name}.py', WIDGET_SOURCE)
+        self.manager = WidgetManager(self.widget_dir, index_path=None)
+        self.manager.active_widgets = {'first_widget': object(), 'second_widget': object()}
+        self.refreshed = []
+        self.manager.refresh_widget = self.refreshed.append
+
+    def tearDown(self):
+        shutil.rmtree(self.widget_dir)
+
+    def write_file(self, filename, content):
+        path = os.path.join(self.widget_dir, filename)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_only_modified_widget_is_refreshed(self):
+        path = self.write_file('first_widget.py', WIDGET_SOURCE + '\nVERSION = 2\n')
+        refreshed, removed = self.manager.reload_changed_widgets([path])
+        self.assertEqual(refreshed, ['first_widget'])
+        self.assertEqual(self.refreshed, ['first_widget'])
+        self.assertEqual(removed, [])
+
+    def test_sidecar_change_refreshes_widget(self):
+        path = self.write_file('second_widget.qss', 'QLabel { color: red; }')
+        refreshed, _ = self.manager.reload_changed_widgets([path])
+        self.assertEqual(refreshed, ['second_widget'])
+
+    def test_config_file_change_is_ignored(self):
+        path = self.write_file('second_widget_config.json', '{}')
+        refreshed, _ = self.manager.reload_changed_widgets([path])
+        self.assertEqual(refreshed, [])
+
+    def test_deleted_widget_is_deactivated(self):
+        path = os.path.join(self.widget_dir, 'second_widget.py')
+        os.remove(path)
+        refreshed, removed = self.manager.reload_changed_widgets([path])
+        self.assertEqual(removed, ['second_widget'])
+        self.assertNotIn('second_widget', self.manager.active_widgets)
+
+    def test_refreshed_widget_keeps_its_venv(self):
+        with mock.patch.object(self.manager.venv_manager, 'release_widget') as release, \
+                mock.patch.object(self.manager, 'activate_widget') as activate:
+            WidgetManager.refresh_widget(self.manager, 'first_widget')
+        release.assert_not_called()
+        activate.assert_called_once_with('first_widget')
+        self.assertNotIn('first_widget', self.manager.active_widgets)
+
+    def test_deactivated_widget_releases_its_venv(self):
+        with mock.patch.object(self.manager.venv_manager, 'release_widget') as release:
+            self.manager.deactivate_widget('first_widget')
+        release.assert_called_once_with('first_widget')
+
+if __name__ == '__main__':
+    unittest.main()
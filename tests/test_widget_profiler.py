@@ -0,0 +1,84 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import tracemalloc
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QWidget
+from src.utils.widget_profiler import WidgetProfiler, format_report, load_last_report
+
+app = QApplication.instance() or QApplication([])
+
+class TestWidgetProfiler(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.profiler = WidgetProfiler(self.log_dir)
+        self.profiler.start()
+
+    def tearDown(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        shutil.rmtree(self.log_dir)
+
+    def test_phase_records_time_and_memory(self):
+        with self.profiler.phase('clock_widget', 'construction'):
+            data = [bytearray(1024) for _ in range(100)]
+        record = self.profiler.records['clock_widget']['construction']
+        self.assertGreaterEqual(record['ms'], 0)
+        self.assertGreater(record['memory_kb'], 50)
+        del data
+
+    def test_report_is_written_after_first_paint(self):
+        widget = QWidget()
+        self.profiler.watch_first_paint('clock_widget', widget)
+        with self.profiler.phase('clock_widget', 'first_show'):
+            widget.show()
+        self.profiler.shown(widget)
+        self.profiler.finish()
+        self.assertIsNone(load_last_report(self.log_dir))
+
+        QTest.qWaitForWindowExposed(widget)
+        widget.repaint()
+        report = load_last_report(self.log_dir)
+        self.assertIn('first_paint', report['widgets']['clock_widget'])
+        self.assertIn('clock_widget', format_report(report))
+        self.assertFalse(tracemalloc.is_tracing())
+        widget.close()
+
+    def test_report_without_pending_paints(self):
+        self.profiler.record('notes', 'module_import', 12.5)
+        self.profiler.finish()
+        with open(os.path.join(self.log_dir, 'widget_startup_report.json')) as f:
+            report = json.load(f)
+        self.assertEqual(report['totals_ms'], {'notes': 12.5})
+
+    def test_report_is_written_once(self):
+        self.profiler.record('notes', 'module_import', 12.5)
+        self.profiler.finish()
+        self.assertFalse(tracemalloc.is_tracing())
+        self.profiler.record('notes', 'construction', 3.0)
+        os.remove(os.path.join(self.log_dir, 'widget_startup_report.json'))
+        self.profiler.finish()
+        self.assertIsNone(load_last_report(self.log_dir))
+        self.assertNotIn('construction', self.profiler.records['notes'])
+
+class TestDisabledProfiler(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.log_dir)
+
+    def test_disabled_profiler_does_not_trace_or_report(self):
+        profiler = WidgetProfiler(self.log_dir, enabled=False)
+        profiler.start()
+        self.assertFalse(tracemalloc.is_tracing())
+        with profiler.phase('clock_widget', 'construction'):
+            pass
+        profiler.watch_first_paint('clock_widget', QWidget())
+        profiler.finish()
+        self.assertEqual(profiler.records, {})
+        self.assertEqual(profiler.pending_paints, {})
+        self.assertIsNone(load_last_report(self.log_dir))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtTest import QTest
+from src.utils import widget_watcher
+from src.utils.widget_watcher import WidgetWatcher
+
+DEBOUNCE_MS = 100
+
+class FakeFileSystemWatcher(QObject):
+    # Zoals QFileSystemWatcher, maar de test bepaalt wanneer er iets verandert
+    fileChanged = pyqtSignal(str)
+    directoryChanged = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watched_files = set()
+        self.watched_directories = set()
+
+    def files(self):
+        return sorted(self.watched_files)
+
+    def directories(self):
+        return sorted(self.watched_directories)
+
+    def addPaths(self, paths):
+        for path in paths:
+            (self.watched_directories if os.path.isdir(path) else self.watched_files).add(path)
+
+    def removePaths(self, paths):
+        self.watched_files.difference_update(paths)
+        self.watched_directories.difference_update(paths)
+
+class TestWidgetWatcher(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.widget_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.widget_dir)
+        self.clock_path = self.write_widget('clock.py')
+        mock.patch.object(widget_watcher, 'QFileSystemWatcher', FakeFileSystemWatcher).start()
+        self.addCleanup(mock.patch.stopall)
+        self.watcher = WidgetWatcher(self.widget_dir, debounce_ms=DEBOUNCE_MS)
+        self.addCleanup(self.watcher.deleteLater)
+        self.batches = []
+        self.watcher.widgetsChanged.connect(self.batches.append)
+
+    def write_widget(self, name):
+        path = os.path.join(self.widget_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('class Widget:\n    pass\n')
+        return path
+
+    def test_widget_files_and_folder_are_watched(self):
+        self.assertEqual(self.watcher.watcher.files(), [self.clock_path])
+        self.assertEqual(self.watcher.watcher.directories(), [self.widget_dir])
+
+    def test_changes_within_the_debounce_window_give_one_reload(self):
+        for _ in range(5):
+            self.watcher.watcher.fileChanged.emit(self.clock_path)
+            QTest.qWait(DEBOUNCE_MS // 5)
+        self.watcher.watcher.directoryChanged.emit(self.widget_dir)
+        self.assertEqual(self.batches, [])
+        QTest.qWait(DEBOUNCE_MS * 4)
+        self.assertEqual(self.batches, [sorted([self.clock_path, self.widget_dir])])
+
+    def test_separate_bursts_give_separate_reloads(self):
+        self.watcher.watcher.fileChanged.emit(self.clock_path)
+        QTest.qWait(DEBOUNCE_MS * 4)
+        self.watcher.watcher.fileChanged.emit(self.clock_path)
+        QTest.qWait(DEBOUNCE_MS * 4)
+        self.assertEqual(self.batches, [[self.clock_path], [self.clock_path]])
+
+    def test_recreated_file_is_watched_again(self):
+        # Opslaan via rename: het bestand verdwijnt even en Qt laat het dan los
+        os.remove(self.clock_path)
+        self.watcher.watcher.removePaths([self.clock_path])
+        self.watcher.watcher.fileChanged.emit(self.clock_path)
+        self.write_widget('clock.py')
+        self.watcher.watcher.directoryChanged.emit(self.widget_dir)
+        QTest.qWait(DEBOUNCE_MS * 4)
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(self.watcher.watcher.files(), [self.clock_path])
+
+    def test_new_widget_is_picked_up(self):
+        notes_path = self.write_widget('notes.py')
+        # De map-mtime kan grover zijn dan de tijd sinds setUp; de index kijkt daarnaar
+        mtime_ns = os.stat(self.widget_dir).st_mtime_ns + 10 ** 9
+        os.utime(self.widget_dir, ns=(mtime_ns, mtime_ns))
+        self.watcher.watcher.directoryChanged.emit(self.widget_dir)
+        QTest.qWait(DEBOUNCE_MS * 4)
+        self.assertEqual(self.batches, [[self.widget_dir]])
+        self.assertEqual(self.watcher.watcher.files(), sorted([self.clock_path, notes_path]))
+
+if __name__ == '__main__':
+    unittest.main()
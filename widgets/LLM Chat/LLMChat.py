@@ -6,13 +6,14 @@ PyQt5==5.15.6
 openai==0.27.0
 """
 
-import json
 import os
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton, QColorDialog,
                              QLabel, QLineEdit, QComboBox, QMessageBox, QApplication)
 from PyQt5.QtCore import Qt, pyqtSignal, QEvent
 from PyQt5.QtGui import QColor, QTextCursor
 from src.utils.draggable_widget import DraggableWidget, WidgetSettingsDialog
+from src.utils.theme import lighten_color, theme_engine
+from src.utils.widget_config import load_widget_config, save_widget_config
 import openai
 import logging
 import traceback
@@ -20,6 +21,25 @@ import traceback
 logging.basicConfig(level=logging.DEBUG, filename='llm_chat_widget.log', filemode='w')
 logger = logging.getLogger(__name__)
 
+STYLESHEET = """
+QWidget {{
+    background-color: {bg_color};
+    color: {text_color};
+}}
+QTextEdit {{
+    border: 1px solid {text_color};
+}}
+QPushButton {{
+    background-color: {button_color};
+    color: white;
+    border: none;
+    padding: 5px;
+}}
+QPushButton:hover {{
+    background-color: {hover_color};
+}}
+"""
+
 class LLMChatWidget(DraggableWidget):
     chat_update = pyqtSignal(str)
 
@@ -31,7 +51,6 @@ class LLMChatWidget(DraggableWidget):
         self.initialize_openai_client()
 
     def load_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'llm_chat_widget_config.json')
         default_config = {
             'api_key': '',
             'model': 'gpt-3.5-turbo',
@@ -41,24 +60,11 @@ class LLMChatWidget(DraggableWidget):
             'size': (400, 600),
             'position': (100, 100)
         }
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r') as f:
-                    loaded_config = json.load(f)
-                    default_config.update(loaded_config)
-                logger.debug(f"Loaded config: {default_config}")
-            except Exception as e:
-                logger.error(f"Error loading config: {e}")
-        return default_config
+        return load_widget_config('llm_chat_widget', default_config,
+                                  legacy_path=os.path.join(os.path.dirname(__file__), 'llm_chat_widget_config.json'))
 
     def save_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'llm_chat_widget_config.json')
-        try:
-            with open(config_path, 'w') as f:
-                json.dump(self.config, f)
-            logger.debug(f"Saved config: {self.config}")
-        except Exception as e:
-            logger.error(f"Error saving config: {e}")
+        save_widget_config('llm_chat_widget', self.config)
 
     def initUI(self):
         try:
@@ -123,37 +129,13 @@ class LLMChatWidget(DraggableWidget):
             text_color = self.config.get('text_color', '#000000')
             button_color = self.config.get('button_color', '#4CAF50')
 
-            self.setStyleSheet(f"""
-                QWidget {{
-                    background-color: {bg_color};
-                    color: {text_color};
-                }}
-                QTextEdit {{
-                    border: 1px solid {text_color};
-                }}
-                QPushButton {{
-                    background-color: {button_color};
-                    color: white;
-                    border: none;
-                    padding: 5px;
-                }}
-                QPushButton:hover {{
-                    background-color: {self.lighten_color(button_color)};
-                }}
-            """)
+            theme_engine.apply_stylesheet(
+                self, STYLESHEET, bg_color=bg_color, text_color=text_color, button_color=button_color,
+                hover_color=lighten_color(button_color))
             logger.debug(f"Updated style with colors: bg={bg_color}, text={text_color}, button={button_color}")
         except Exception as e:
             logger.error(f"Error in updateStyle: {e}")
 
-    def lighten_color(self, color):
-        try:
-            c = QColor(color)
-            h, s, l, _ = c.getHsl()
-            return QColor.fromHsl(h, s, min(l + 20, 255), 255).name()
-        except Exception as e:
-            logger.error(f"Error in lighten_color: {e}")
-            return color
-
     def initialize_openai_client(self):
         api_key = self.config.get('api_key', '')
         if api_key:
@@ -5,7 +5,6 @@ Dependencies:
 PyQt5==5.15.6
 """
 
-import json
 import os
 import logging
 import sys
@@ -14,10 +13,34 @@ from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpin
 from PyQt5.QtCore import QTimer, Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QColor
 from src.utils.draggable_widget import DraggableWidget, WidgetSettingsDialog
+from src.utils.theme import theme_engine
+from src.utils.widget_config import load_widget_config, save_widget_config
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+STYLESHEET = """
+QWidget {{
+    background-color: {color};
+    color: white;
+    border-radius: 10px;
+}}
+QPushButton {{
+    background-color: white;
+    color: {color};
+    border: none;
+    padding: 5px 10px;
+    border-radius: 5px;
+}}
+QPushButton:hover {{
+    background-color: #f0f0f0;
+}}
+QPushButton:disabled {{
+    background-color: #cccccc;
+    color: #666666;
+}}
+"""
+
 class PomodoroTimer(DraggableWidget):
     timer_update = pyqtSignal(int)
 
@@ -49,7 +72,6 @@ class PomodoroTimer(DraggableWidget):
             return False
 
     def load_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'pomodoro_timer_config.json')
         default_config = {
             'work_duration': 25,
             'break_duration': 5,
@@ -57,16 +79,11 @@ class PomodoroTimer(DraggableWidget):
             'size': (250, 150),
             'position': (100, 100)
         }
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                loaded_config = json.load(f)
-                default_config.update(loaded_config)
-        return default_config
+        return load_widget_config('pomodoro_timer', default_config,
+                                  legacy_path=os.path.join(os.path.dirname(__file__), 'pomodoro_timer_config.json'))
 
     def save_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'pomodoro_timer_config.json')
-        with open(config_path, 'w') as f:
-            json.dump(self.config, f)
+        save_widget_config('pomodoro_timer', self.config)
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -105,27 +122,7 @@ class PomodoroTimer(DraggableWidget):
 
     def updateStyle(self):
         color = self.config.get('color', '#FF6347')
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {color};
-                color: white;
-                border-radius: 10px;
-            }}
-            QPushButton {{
-                background-color: white;
-                color: {color};
-                border: none;
-                padding: 5px 10px;
-                border-radius: 5px;
-            }}
-            QPushButton:hover {{
-                background-color: #f0f0f0;
-            }}
-            QPushButton:disabled {{
-                background-color: #cccccc;
-                color: #666666;
-            }}
-        """)
+        theme_engine.apply_stylesheet(self, STYLESHEET, color=color)
 
     def start_timer(self):
         logger.debug("Starting timer")
@@ -187,7 +184,7 @@ class PomodoroTimer(DraggableWidget):
 
     def moveEvent(self, event):
         super().moveEvent(event)
-        self.config['position'] = (self.x(), self.y())
+        self.config['position'] = self.screen_position()
         self.save_config()
 
 class PomodoroSettingsDialog(WidgetSettingsDialog):
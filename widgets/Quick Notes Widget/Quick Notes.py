@@ -6,29 +6,34 @@ PyQt5==5.15.6
 
 """
 
-import json
 import os
 import logging
 from PyQt5.QtWidgets import QVBoxLayout, QApplication, QTextEdit, QPushButton, QColorDialog, QFontDialog, QFormLayout, QWidget
-from PyQt5.QtCore import Qt, QTimer, QPoint, QSize
-from PyQt5.QtGui import QFont, QPainter, QColor, QPen
+from PyQt5.QtCore import QTimer, QPoint, QSize
+from PyQt5.QtGui import QFont, QColor
 from src.utils.draggable_widget import DraggableWidget, WidgetSettingsDialog
+from src.utils.theme import theme_engine
+from src.utils.widget_config import load_widget_config, save_widget_config
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+STYLESHEET = """
+QTextEdit {{
+    color: {color};
+    background-color: {bg_color};
+    border: none;
+}}
+"""
+
 class QuickNotesWidget(DraggableWidget):
     def __init__(self):
         super().__init__()
         self.config = self.load_config()
-        self.drag_position = None
-        self.resizing = False
-        self.resize_handle_size = 10
         self.initUI()
         logger.debug("QuickNotesWidget initialized")
 
     def load_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'quick_notes_widget_config.json')
         default_config = {
             'color': '#000000',
             'bg_color': '#FFFFA5',
@@ -39,23 +44,11 @@ class QuickNotesWidget(DraggableWidget):
             'position': (100, 100),
             'content': ''
         }
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r') as f:
-                    loaded_config = json.load(f)
-                    default_config.update(loaded_config)
-            except json.JSONDecodeError:
-                logger.error("Error loading config file. Using default config.")
-        return default_config
+        return load_widget_config('quick_notes_widget', default_config,
+                                  legacy_path=os.path.join(os.path.dirname(__file__), 'quick_notes_widget_config.json'))
 
     def save_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'quick_notes_widget_config.json')
-        try:
-            with open(config_path, 'w') as f:
-                json.dump(self.config, f)
-            logger.debug("Config saved successfully")
-        except IOError:
-            logger.error("Error saving config file")
+        save_widget_config('quick_notes_widget', self.config)
 
     def initUI(self):
         layout = QVBoxLayout(self)
@@ -84,13 +77,7 @@ class QuickNotesWidget(DraggableWidget):
         try:
             color = self.config.get('color', '#000000')
             bg_color = self.config.get('bg_color', '#FFFFA5')
-            self.setStyleSheet(f"""
-                QTextEdit {{
-                    color: {color};
-                    background-color: {bg_color};
-                    border: none;
-                }}
-            """)
+            theme_engine.apply_stylesheet(self, STYLESHEET, color=color, bg_color=bg_color)
             self.adjustFont()
             logger.debug("Style updated")
         except Exception as e:
@@ -109,50 +96,15 @@ class QuickNotesWidget(DraggableWidget):
         except Exception as e:
             logger.error(f"Error saving notes: {e}")
 
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        painter = QPainter(self)
-        painter.setPen(QPen(QColor(self.config['border_color']), 1, Qt.SolidLine))
-        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
-
-        # Draw resize handle
-        painter.setBrush(QColor(200, 200, 200))
-        painter.drawRect(self.width() - self.resize_handle_size, self.height() - self.resize_handle_size,
-                         self.resize_handle_size, self.resize_handle_size)
-
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            if self.isInResizeArea(event.pos()):
-                self.resizing = True
-            else:
-                self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
-            event.accept()
-
-    def mouseMoveEvent(self, event):
-        if event.buttons() == Qt.LeftButton:
-            if self.resizing:
-                new_size = event.pos()
-                self.resize(new_size.x(), new_size.y())
-                self.config['size'] = (self.width(), self.height())
-                self.save_config()
-            elif self.drag_position:
-                self.move(event.globalPos() - self.drag_position)
-            event.accept()
-
-    def mouseReleaseEvent(self, event):
-        self.resizing = False
-        self.drag_position = None
-        self.config['position'] = (self.x(), self.y())
-        self.save_config()
-
-    def isInResizeArea(self, pos):
-        return (self.width() - self.resize_handle_size <= pos.x() <= self.width() and
-                self.height() - self.resize_handle_size <= pos.y() <= self.height())
+    def chrome_options(self):
+        return {'handle_size': self.resize_handle_size, 'handle_color': QColor(200, 200, 200),
+                'border_color': self.config['border_color']}
 
     def updateConfig(self, new_config):
         try:
             self.config.update(new_config)
             self.updateStyle()
+            self.invalidate_chrome()
             self.save_config()
             logger.debug("Config updated")
         except Exception as e:
@@ -5,17 +5,40 @@ Dependencies:
 PyQt5==5.15.6
 """
 
-import json
 import os
 from PyQt5.QtWidgets import QVBoxLayout, QGridLayout, QPushButton, QLineEdit, QColorDialog, QWidget
-from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import QColor, QPainter, QPolygon, QKeyEvent
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter, QKeyEvent
+from src.utils.chrome_renderer import chrome_renderer
 from src.utils.draggable_widget import DraggableWidget, WidgetSettingsDialog
+from src.utils.theme import lighten_color, theme_engine
+from src.utils.widget_config import load_widget_config, save_widget_config
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+STYLESHEET = """
+QWidget {{
+    background-color: {bg_color};
+    color: {text_color};
+    font-size: 18px;
+}}
+QPushButton {{
+    background-color: {button_color};
+    border: none;
+    padding: 15px;
+}}
+QPushButton:hover {{
+    background-color: {hover_color};
+}}
+QLineEdit {{
+    border: none;
+    padding: 10px;
+    font-size: 24px;
+}}
+"""
+
 class MoveHandle(QWidget):
     def __init__(self, parent):
         super().__init__(parent)
@@ -24,9 +47,7 @@ class MoveHandle(QWidget):
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setBrush(QColor(100, 100, 100))
-        painter.setPen(Qt.NoPen)
-        painter.drawPolygon(QPolygon([QPoint(0, 20), QPoint(20, 20), QPoint(0, 0)]))
+        painter.drawPixmap(0, 0, chrome_renderer.move_handle(self.width(), self.devicePixelRatioF()))
 
 class CalculatorWidget(DraggableWidget):
     def __init__(self):
@@ -39,7 +60,6 @@ class CalculatorWidget(DraggableWidget):
         self.last_number = None
 
     def load_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'calculator_widget_config.json')
         default_config = {
             'background_color': '#2C3E50',
             'text_color': '#ECF0F1',
@@ -47,16 +67,11 @@ class CalculatorWidget(DraggableWidget):
             'size': (300, 450),
             'position': (100, 100),
         }
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                loaded_config = json.load(f)
-                default_config.update(loaded_config)
-        return default_config
+        return load_widget_config('calculator_widget', default_config,
+                                  legacy_path=os.path.join(os.path.dirname(__file__), 'calculator_widget_config.json'))
 
     def save_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'calculator_widget_config.json')
-        with open(config_path, 'w') as f:
-            json.dump(self.config, f)
+        save_widget_config('calculator_widget', self.config)
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -101,31 +116,9 @@ class CalculatorWidget(DraggableWidget):
         text_color = self.config.get('text_color', '#ECF0F1')
         button_color = self.config.get('button_color', '#34495E')
         
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {bg_color};
-                color: {text_color};
-                font-size: 18px;
-            }}
-            QPushButton {{
-                background-color: {button_color};
-                border: none;
-                padding: 15px;
-            }}
-            QPushButton:hover {{
-                background-color: {self.lighten_color(button_color)};
-            }}
-            QLineEdit {{
-                border: none;
-                padding: 10px;
-                font-size: 24px;
-            }}
-        """)
-
-    def lighten_color(self, color):
-        c = QColor(color)
-        h, s, l, _ = c.getHsl()
-        return QColor.fromHsl(h, s, min(l + 20, 255), 255).name()
+        theme_engine.apply_stylesheet(
+            self, STYLESHEET, bg_color=bg_color, text_color=text_color, button_color=button_color,
+            hover_color=lighten_color(button_color))
 
     def on_button_click(self):
         button = self.sender()
@@ -197,7 +190,7 @@ class CalculatorWidget(DraggableWidget):
 
     def moveEvent(self, event):
         super().moveEvent(event)
-        self.config['position'] = (self.x(), self.y())
+        self.config['position'] = self.screen_position()
         self.save_config()
 
 class CalculatorWidgetSettingsDialog(WidgetSettingsDialog):
@@ -6,13 +6,15 @@ PyQt5==5.15.6
 
 """
 
-import json
 import os
 from PyQt5.QtWidgets import (QVBoxLayout, QLabel, QDialog, QSpinBox, QColorDialog, 
                              QPushButton, QHBoxLayout, QComboBox, QGroupBox, QFontComboBox)
 from PyQt5.QtCore import QTimer, QTime, Qt, QSize, QPoint
-from PyQt5.QtGui import QFont, QResizeEvent, QColor, QPainter, QPen
+from PyQt5.QtGui import QFont, QResizeEvent, QColor, QPen
 from src.utils.draggable_widget import DraggableWidget, WidgetSettingsDialog
+from src.utils.font_fitting import font_fitter
+from src.utils.theme import theme_engine
+from src.utils.widget_config import load_widget_config, save_widget_config
 
 class ClockWidget(DraggableWidget):
     def __init__(self):
@@ -22,11 +24,7 @@ class ClockWidget(DraggableWidget):
         self.initUI()
 
     def load_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'clock_widget_config.json')
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        return {
+        default_config = {
             'color': '#FFFFFF',  # White color by default
             'time_format': 'hh:mm:ss',
             'size': (250, 100),
@@ -34,11 +32,11 @@ class ClockWidget(DraggableWidget):
             'font_family': 'Arial',
             'font_style': 'Normal'
         }
+        return load_widget_config('clock_widget', default_config,
+                                  legacy_path=os.path.join(os.path.dirname(__file__), 'clock_widget_config.json'))
 
     def save_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'clock_widget_config.json')
-        with open(config_path, 'w') as f:
-            json.dump(self.config, f)
+        save_widget_config('clock_widget', self.config)
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -71,12 +69,11 @@ class ClockWidget(DraggableWidget):
 
     def updateStyle(self):
         color = self.config.get('color', '#FFFFFF')
-        self.time_label.setStyleSheet(f"color: {color}; background-color: transparent;")
+        theme_engine.apply_palette(self.time_label, WindowText=color)
         self.adjustFont()
 
     def adjustFont(self):
         font = QFont(self.config.get('font_family', 'Arial'))
-        font.setPixelSize(int(self.height() * 0.7))
         font_style = self.config.get('font_style', 'Normal')
         if font_style == 'Bold':
             font.setBold(True)
@@ -85,20 +82,11 @@ class ClockWidget(DraggableWidget):
         elif font_style == 'Bold Italic':
             font.setBold(True)
             font.setItalic(True)
-        self.time_label.setFont(font)
-
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Draw only the resize handle
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(QColor(200, 200, 200, 128))
-        painter.drawRect(self.width() - self.resize_handle_size, 
-                         self.height() - self.resize_handle_size,
-                         self.resize_handle_size,
-                         self.resize_handle_size)
+        # Breedste tijd in het huidige formaat, zodat de tekst niet van grootte verspringt
+        template = QTime(23, 58, 58).toString(self.config.get('time_format', 'hh:mm:ss'))
+        rect = self.contentsRect().marginsRemoved(self.layout().contentsMargins())
+        font_fitter.apply(self.time_label, font_fitter.fit(font, template, rect.width(), rect.height(),
+                                                           max_pixel_size=int(self.height() * 0.7)))
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -108,7 +96,7 @@ class ClockWidget(DraggableWidget):
 
     def moveEvent(self, event):
         super().moveEvent(event)
-        self.config['position'] = (self.x(), self.y())
+        self.config['position'] = self.screen_position()
         self.save_config()
 
     def updateConfig(self, new_config):
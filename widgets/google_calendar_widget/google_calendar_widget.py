@@ -9,7 +9,6 @@ requests==2.28.1
 
 """
 
-import json
 import os
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QCalendarWidget, 
                              QListWidget, QListWidgetItem, QPushButton, QDialog, 
@@ -20,8 +19,34 @@ import icalendar
 import recurring_ical_events
 import requests
 from src.utils.draggable_widget import DraggableWidget, WidgetSettingsDialog
+from src.utils.theme import theme_engine
+from src.utils.widget_config import load_widget_config, save_widget_config
 from datetime import datetime, timedelta, date
 
+STYLESHEET = """
+QWidget {{
+    background-color: {widget_bg_color};
+    color: {widget_text_color};
+}}
+QCalendarWidget {{
+    background-color: {calendar_bg_color};
+    color: {calendar_text_color};
+}}
+QCalendarWidget QToolButton {{
+    color: {calendar_text_color};
+}}
+QCalendarWidget QMenu {{
+    color: {calendar_text_color};
+}}
+QCalendarWidget QTableView {{
+    selection-background-color: {selected_date_color};
+}}
+QListWidget {{
+    background-color: {event_list_bg_color};
+    color: {event_list_text_color};
+}}
+"""
+
 class GoogleCalendarWidget(DraggableWidget):
     def __init__(self):
         super().__init__()
@@ -30,7 +55,6 @@ class GoogleCalendarWidget(DraggableWidget):
         self.setupUpdateTimer()
 
     def load_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'google_calendar_widget_config.json')
         default_config = {
             'ical_urls': [],
             'colors': {},
@@ -47,16 +71,11 @@ class GoogleCalendarWidget(DraggableWidget):
             'size': (400, 600),
             'position': (100, 100)
         }
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                loaded_config = json.load(f)
-                default_config.update(loaded_config)
-        return default_config
+        return load_widget_config('google_calendar_widget', default_config,
+                                  legacy_path=os.path.join(os.path.dirname(__file__), 'google_calendar_widget_config.json'))
 
     def save_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'google_calendar_widget_config.json')
-        with open(config_path, 'w') as f:
-            json.dump(self.config, f)
+        save_widget_config('google_calendar_widget', self.config)
 
     def initUI(self):
         layout = QVBoxLayout(self)
@@ -185,29 +204,14 @@ class GoogleCalendarWidget(DraggableWidget):
             return date.strftime('%Y-%m-%d %H:%M') if isinstance(date, datetime) else date.strftime('%Y-%m-%d')
 
     def updateStyle(self):
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {self.config['widget_bg_color']};
-                color: {self.config['widget_text_color']};
-            }}
-            QCalendarWidget {{
-                background-color: {self.config['calendar_bg_color']};
-                color: {self.config['calendar_text_color']};
-            }}
-            QCalendarWidget QToolButton {{
-                color: {self.config['calendar_text_color']};
-            }}
-            QCalendarWidget QMenu {{
-                color: {self.config['calendar_text_color']};
-            }}
-            QCalendarWidget QTableView {{
-                selection-background-color: {self.config['selected_date_color']};
-            }}
-            QListWidget {{
-                background-color: {self.config['event_list_bg_color']};
-                color: {self.config['event_list_text_color']};
-            }}
-        """)
+        theme_engine.apply_stylesheet(
+            self, STYLESHEET, widget_bg_color=self.config['widget_bg_color'],
+            widget_text_color=self.config['widget_text_color'],
+            calendar_bg_color=self.config['calendar_bg_color'],
+            calendar_text_color=self.config['calendar_text_color'],
+            selected_date_color=self.config['selected_date_color'],
+            event_list_bg_color=self.config['event_list_bg_color'],
+            event_list_text_color=self.config['event_list_text_color'])
 
     def updateConfig(self, new_config):
         self.config.update(new_config)
@@ -229,7 +233,7 @@ class GoogleCalendarWidget(DraggableWidget):
 
     def moveEvent(self, event):
         super().moveEvent(event)
-        self.config['position'] = (self.x(), self.y())
+        self.config['position'] = self.screen_position()
         self.save_config()
 
 class GoogleCalendarSettingsDialog(WidgetSettingsDialog):
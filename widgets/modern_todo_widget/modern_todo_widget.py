@@ -6,7 +6,6 @@ PyQt5==5.15.6
 
 """
 
-import json
 import os
 from PyQt5.QtWidgets import (QVBoxLayout, QLabel, QSizeGrip, QLineEdit, 
                              QPushButton, QListWidget, QHBoxLayout, QWidget,
@@ -14,6 +13,52 @@ from PyQt5.QtWidgets import (QVBoxLayout, QLabel, QSizeGrip, QLineEdit,
 from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QFont, QColor
 from src.utils.draggable_widget import DraggableWidget, WidgetSettingsDialog
+from src.utils.font_fitting import font_fitter
+from src.utils.theme import theme_engine
+from src.utils.widget_config import load_widget_config, save_widget_config
+
+STYLESHEET = """
+QWidget {{
+    background-color: {bg_color};
+    color: {text_color};
+    border-radius: 10px;
+}}
+QLabel {{
+    font-weight: bold;
+}}
+QLineEdit {{
+    background-color: {item_bg_color};
+    color: {item_text_color};
+    border: none;
+    padding: 5px;
+    border-radius: 5px;
+}}
+QPushButton {{
+    background-color: {button_color};
+    color: {text_color};
+    border: none;
+    padding: 5px 10px;
+    border-radius: 5px;
+}}
+QPushButton:hover {{
+    background-color: {button_hover_color};
+}}
+QListWidget {{
+    background-color: {item_bg_color};
+    border: none;
+    border-radius: 5px;
+}}
+QListWidget::item {{
+    background-color: {item_bg_color};
+    color: {item_text_color};
+    border: none;
+    padding: 5px;
+    border-radius: 3px;
+}}
+QListWidget::item:selected {{
+    background-color: {item_selected_color};
+}}
+"""
 
 class ModernToDoWidget(DraggableWidget):
     def __init__(self):
@@ -22,11 +67,7 @@ class ModernToDoWidget(DraggableWidget):
         self.initUI()
 
     def load_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'modern_todo_widget_config.json')
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        return {
+        default_config = {
             'bg_color': '#2C3E50',
             'text_color': '#ECF0F1',
             'button_color': '#3498DB',
@@ -35,11 +76,11 @@ class ModernToDoWidget(DraggableWidget):
             'size': (300, 450),
             'position': (100, 100)
         }
+        return load_widget_config('modern_todo_widget', default_config,
+                                  legacy_path=os.path.join(os.path.dirname(__file__), 'modern_todo_widget_config.json'))
 
     def save_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'modern_todo_widget_config.json')
-        with open(config_path, 'w') as f:
-            json.dump(self.config, f)
+        save_widget_config('modern_todo_widget', self.config)
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -101,48 +142,11 @@ class ModernToDoWidget(DraggableWidget):
         item_bg_color = self.config.get('item_bg_color', '#34495E')
         item_text_color = self.config.get('item_text_color', '#ECF0F1')
 
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {bg_color};
-                color: {text_color};
-                border-radius: 10px;
-            }}
-            QLabel {{
-                font-weight: bold;
-            }}
-            QLineEdit {{
-                background-color: {item_bg_color};
-                color: {item_text_color};
-                border: none;
-                padding: 5px;
-                border-radius: 5px;
-            }}
-            QPushButton {{
-                background-color: {button_color};
-                color: {text_color};
-                border: none;
-                padding: 5px 10px;
-                border-radius: 5px;
-            }}
-            QPushButton:hover {{
-                background-color: {self.lighten_color(button_color)};
-            }}
-            QListWidget {{
-                background-color: {item_bg_color};
-                border: none;
-                border-radius: 5px;
-            }}
-            QListWidget::item {{
-                background-color: {item_bg_color};
-                color: {item_text_color};
-                border: none;
-                padding: 5px;
-                border-radius: 3px;
-            }}
-            QListWidget::item:selected {{
-                background-color: {self.lighten_color(item_bg_color)};
-            }}
-        """)
+        theme_engine.apply_stylesheet(
+            self, STYLESHEET, bg_color=bg_color, text_color=text_color, button_color=button_color,
+            item_bg_color=item_bg_color, item_text_color=item_text_color,
+            button_hover_color=self.lighten_color(button_color),
+            item_selected_color=self.lighten_color(item_bg_color))
         self.adjustFontSize()
 
     def lighten_color(self, color, factor=1.3):
@@ -154,9 +158,10 @@ class ModernToDoWidget(DraggableWidget):
 
     def adjustFontSize(self):
         font = QFont()
-        font.setPixelSize(int(self.height() * 0.05))  # 5% of height
         font.setBold(True)
-        self.title.setFont(font)
+        rect = self.contentsRect().marginsRemoved(self.layout().contentsMargins())
+        font_fitter.apply(self.title, font_fitter.fit(font, self.title.text(), rect.width(), rect.height(),
+                                                      max_pixel_size=int(self.height() * 0.05)))  # 5% of height
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -166,7 +171,7 @@ class ModernToDoWidget(DraggableWidget):
 
     def moveEvent(self, event):
         super().moveEvent(event)
-        self.config['position'] = (self.x(), self.y())
+        self.config['position'] = self.screen_position()
         self.save_config()
 
     @pyqtSlot()
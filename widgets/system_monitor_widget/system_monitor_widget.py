@@ -7,13 +7,24 @@ psutil==5.8.0
 
 """
 
-import json
 import os
 import psutil
 from PyQt5.QtWidgets import QVBoxLayout, QLabel, QSizeGrip, QSpinBox, QColorDialog, QPushButton, QHBoxLayout
 from PyQt5.QtCore import QTimer, Qt, QSize, QElapsedTimer
 from PyQt5.QtGui import QFont, QResizeEvent, QColor
 from src.utils.draggable_widget import DraggableWidget, WidgetSettingsDialog
+from src.utils.font_fitting import font_fitter
+from src.utils.theme import theme_engine
+from src.utils.widget_config import load_widget_config, save_widget_config
+
+STYLESHEET = """
+QLabel {{
+    color: {color};
+    background-color: transparent;
+    border-radius: 5px;
+    padding: 2px;
+}}
+"""
 
 class SystemMonitorWidget(DraggableWidget):
     def __init__(self):
@@ -25,21 +36,17 @@ class SystemMonitorWidget(DraggableWidget):
         self.last_net_io_time.start()
 
     def load_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'system_monitor_widget_config.json')
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        return {
+        default_config = {
             'color': 'white',
             'update_interval': 1000,
             'size': (250, 150),
             'position': (100, 100)
         }
+        return load_widget_config('system_monitor_widget', default_config,
+                                  legacy_path=os.path.join(os.path.dirname(__file__), 'system_monitor_widget_config.json'))
 
     def save_config(self):
-        config_path = os.path.join(os.path.dirname(__file__), 'system_monitor_widget_config.json')
-        with open(config_path, 'w') as f:
-            json.dump(self.config, f)
+        save_widget_config('system_monitor_widget', self.config)
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -97,21 +104,19 @@ class SystemMonitorWidget(DraggableWidget):
 
     def updateStyle(self):
         color = self.config.get('color', 'white')
-        self.setStyleSheet(f"""
-            QLabel {{
-                color: {color};
-                background-color: transparent;
-                border-radius: 5px;
-                padding: 2px;
-            }}
-        """)
+        theme_engine.apply_stylesheet(self, STYLESHEET, color=color)
         self.adjustFontSize()
 
     def adjustFontSize(self):
-        font = QFont()
-        font.setPixelSize(int(self.height() * 0.15))  # 15% of height
-        for label in [self.cpu_label, self.memory_label, self.disk_label, self.network_label]:
-            label.setFont(font)
+        # Langste regel als sjabloon; elk label krijgt een kwart van de hoogte, hooguit 15%
+        labels = [self.cpu_label, self.memory_label, self.disk_label, self.network_label]
+        layout = self.layout()
+        rect = self.contentsRect().marginsRemoved(layout.contentsMargins())
+        label_height = (rect.height() - max(layout.spacing(), 0) * (len(labels) - 1)) // len(labels)
+        font = font_fitter.fit(QFont(), "Network: 000.00 Mbps", rect.width() - 4, label_height - 4,
+                               max_pixel_size=int(self.height() * 0.15))
+        for label in labels:
+            font_fitter.apply(label, font)
 
     def resizeEvent(self, event: QResizeEvent):
         super().resizeEvent(event)
@@ -121,7 +126,7 @@ class SystemMonitorWidget(DraggableWidget):
 
     def moveEvent(self, event):
         super().moveEvent(event)
-        self.config['position'] = (self.x(), self.y())
+        self.config['position'] = self.screen_position()
         self.save_config()
 
     def updateConfig(self, new_config):